@@ -0,0 +1,198 @@
+"""
+Analyse en continu un fichier JSONL de positions, réparti sur plusieurs processus.
+
+Chaque ligne d'entrée est un état de partie au format de Quoridor.état_partie, avec une clé
+facultative 'trait' (le joueur qui a le trait, 1 par défaut). Chaque ligne de sortie donne,
+dans l'ordre de l'entrée, le meilleur coup du joueur qui a le trait selon l'IA choisie, la
+longueur du plus court chemin de chaque joueur et le gagnant prédit par la course des plus
+courts chemins, ou le message d'erreur si la position est invalide. L'entrée est lue par
+paquets: la mémoire utilisée ne dépend pas de la taille du fichier.
+
+Utilisation, depuis la racine du dépôt:
+
+    python analyse.py positions.jsonl --sortie analyses.jsonl --ia alphabeta:0.05
+
+La progression et le débit sont affichés sur la sortie d'erreur.
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import json
+import os
+import sys
+import time
+
+from autojeu import stratégie_partagée
+from mcts import estimer_course
+from quoridor import (
+    NB_MURS, TAILLE, Quoridor, QuoridorError, décoder_coup, encoder_coup, other_player,
+    test_players_numbers,
+)
+
+
+def analyser_position(état, configuration='chemin', trait=1, taille=TAILLE, nb_murs=NB_MURS):
+    """
+    Analyser une position.
+
+    :param état: l'état de la partie (voir Quoridor.état_partie), avec une clé facultative
+    'trait' qui remplace le paramètre du même nom.
+    :param configuration: la configuration de l'IA (voir autojeu.créer_stratégie).
+    :param trait: le joueur qui a le trait (1 ou 2).
+    :param taille: la taille du damier.
+    :param nb_murs: le nombre total de murs des deux joueurs.
+    :returns: le dictionnaire du résultat, prêt à être écrit en JSON.
+    :raises QuoridorError: la position est invalide (voir Quoridor.__init__).
+    """
+    if not isinstance(état, dict):
+        raise QuoridorError("Position is not a JSON object")
+    trait = état.get('trait', trait)
+    test_players_numbers(trait)
+
+    partie = Quoridor(état['joueurs'], état['murs'], taille, nb_murs)
+    partie.last_player = other_player(trait)
+    distances = [partie.distance(1), partie.distance(2)]
+    if max(distances) == partie.géométrie.infini:
+        raise QuoridorError("A player has no path to goal")
+
+    résultat = {'trait': trait, 'distances': distances}
+    terminée = partie.partie_terminée()
+    if terminée:
+        résultat.update({'coup': None, 'gagnant': 1 if distances[0] == 0 else 2, 'chances': 1.0})
+        return résultat
+
+    stratégie = stratégie_partagée(configuration)
+    if stratégie is None:
+        coup = encoder_coup('D', partie.next_step(trait), taille)
+    else:
+        coup = stratégie.choisir_coup(partie, trait)
+    type_coup, position = décoder_coup(coup, taille)
+
+    # chances du joueur qui a le trait, l'adversaire venant de jouer
+    chances = 1.0 - estimer_course(distances[2 - trait], distances[trait - 1])
+    résultat.update({
+        'coup': coup,
+        'type': type_coup,
+        'position': list(position),
+        'gagnant': trait if chances >= 0.5 else other_player(trait),
+        'chances': chances,
+    })
+    return résultat
+
+
+def analyser_paquet(paquet, configuration='chemin', trait=1, taille=TAILLE, nb_murs=NB_MURS):
+    """
+    Analyser un paquet de lignes JSONL, dans un processus de analyser_flux.
+
+    :param paquet: la liste des tuples (numéro de la ligne, à partir de 1, ligne).
+    :returns: la liste des résultats, un par ligne, numérotés par la clé 'ligne'.
+    """
+    résultats = []
+    for numéro, ligne in paquet:
+        try:
+            résultat = analyser_position(json.loads(ligne), configuration, trait, taille,
+                                         nb_murs)
+        # une ligne mal formée peut échouer n'importe où dans Quoridor.__init__ (une clé ou un
+        # indice manquant, un type inattendu): elle produit une erreur sans arrêter l'analyse
+        except (QuoridorError, LookupError, TypeError, ValueError) as erreur:
+            résultat = {'erreur': f"{type(erreur).__name__}: {erreur}"}
+        résultats.append({'ligne': numéro, **résultat})
+    return résultats
+
+
+def _paquets(lignes, taille_paquet):
+    """Regroupe les lignes non vides en paquets de tuples (numéro de la ligne, ligne)."""
+    numéros = ((numéro, ligne) for numéro, ligne in enumerate(lignes, 1) if ligne.strip())
+    while True:
+        paquet = list(islice(numéros, taille_paquet))
+        if not paquet:
+            return
+        yield paquet
+
+
+def analyser_flux(lignes, configuration='chemin', trait=1, processus=None, taille_paquet=256,
+                  en_vol=None, taille=TAILLE, nb_murs=NB_MURS):
+    """
+    Analyser des lignes JSONL par paquets sur plusieurs processus et produire les résultats
+    dans l'ordre des lignes. Au plus en_vol paquets sont lus à l'avance, de sorte que la
+    mémoire utilisée ne dépend pas du nombre de lignes.
+
+    :param lignes: un itérable de lignes JSON, lu au fil de l'eau (un fichier, par exemple).
+    :param configuration: la configuration de l'IA (voir autojeu.créer_stratégie).
+    :param trait: le joueur qui a le trait, pour les lignes sans clé 'trait'.
+    :param processus: le nombre de processus; par défaut, le nombre de coeurs.
+    :param taille_paquet: le nombre de lignes par paquet.
+    :param en_vol: le nombre maximal de paquets soumis; par défaut, deux par processus.
+    :param taille: la taille du damier.
+    :param nb_murs: le nombre total de murs des deux joueurs.
+    :returns: un générateur des résultats de analyser_position, avec le numéro de 'ligne'
+    (les lignes vides sont sautées) et l''erreur' des lignes invalides.
+    """
+    processus = processus or os.cpu_count() or 1
+    en_vol = en_vol or 2 * processus
+    options = (configuration, trait, taille, nb_murs)
+
+    if processus == 1:
+        for paquet in _paquets(lignes, taille_paquet):
+            yield from analyser_paquet(paquet, *options)
+        return
+
+    # les paquets sont soumis dans l'ordre et leurs résultats attendus dans le même ordre
+    with ProcessPoolExecutor(processus) as exécuteur:
+        soumis = deque()
+        for paquet in _paquets(lignes, taille_paquet):
+            soumis.append(exécuteur.submit(analyser_paquet, paquet, *options))
+            if len(soumis) >= en_vol:
+                yield from soumis.popleft().result()
+        while soumis:
+            yield from soumis.popleft().result()
+
+
+def main():
+    """Point d'entrée de la ligne de commande."""
+    analyseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    analyseur.add_argument('entrée', help="fichier JSONL des positions, '-' pour stdin")
+    analyseur.add_argument('--sortie', default='-', help="fichier JSONL, '-' pour stdout")
+    analyseur.add_argument('--ia', default='chemin',
+                           help="'chemin', 'alphabeta[:temps]' ou 'mcts[:temps]'")
+    analyseur.add_argument('--trait', type=int, default=1)
+    analyseur.add_argument('--processus', type=int, default=None)
+    analyseur.add_argument('--paquet', type=int, default=256)
+    analyseur.add_argument('--taille', type=int, default=TAILLE)
+    analyseur.add_argument('--murs', type=int, default=NB_MURS,
+                           help="nombre total de murs des deux joueurs")
+    analyseur.add_argument('--progression', type=float, default=5.0,
+                           help="secondes entre deux rapports de progression")
+    args = analyseur.parse_args()
+
+    stratégie_partagée(args.ia)
+    entrée = sys.stdin if args.entrée == '-' else open(args.entrée, encoding='utf-8')
+    sortie = sys.stdout if args.sortie == '-' else open(args.sortie, 'w', encoding='utf-8')
+    début = rapport = time.perf_counter()
+    positions = erreurs = 0
+
+    try:
+        for résultat in analyser_flux(entrée, args.ia, args.trait, args.processus, args.paquet,
+                                      taille=args.taille, nb_murs=args.murs):
+            sortie.write(json.dumps(résultat, ensure_ascii=False) + '\n')
+            positions += 1
+            erreurs += 'erreur' in résultat
+
+            maintenant = time.perf_counter()
+            if maintenant - rapport >= args.progression:
+                rapport = maintenant
+                print(f"{positions} positions en {maintenant - début:.1f} s: "
+                      f"{positions / (maintenant - début):.1f} positions/s", file=sys.stderr)
+    finally:
+        if entrée is not sys.stdin:
+            entrée.close()
+        if sortie is not sys.stdout:
+            sortie.close()
+
+    durée = time.perf_counter() - début
+    print(f"{positions} positions, dont {erreurs} invalides, en {durée:.2f} s: "
+          f"{positions / durée if durée > 0 else 0.0:.1f} positions/s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Ce module contient le format binaire des parties de Quoridor et l'archive où elles sont
+conservées.
+
+Une partie est enregistrée par sa position de départ (voir Quoridor.sérialiser), suivie du
+nombre de coups joués et de leurs codes (voir encoder_coup), un octet par coup. Les joueurs
+jouent à tour de rôle, le premier étant l'adversaire du dernier joueur de la position de
+départ.
+
+L'archive est un fichier où les parties sont ajoutées les unes à la suite des autres,
+accompagné d'un index de la position de chaque partie dans ce fichier. Les deux fichiers
+sont lus par mmap: on accède à une partie sans lire celles qui la précèdent.
+"""
+import mmap
+import os
+import struct
+
+from quoridor import FORMAT_POSITION, TAILLE, Quoridor, QuoridorError, other_player
+
+# en-tête d'une partie: la position de départ et le nombre de coups
+FORMAT_EN_TÊTE = struct.Struct(f'<{FORMAT_POSITION.size}sH')
+# en-tête du fichier de l'archive
+SIGNATURE = b'QUORIDOR\x01'
+# entrée de l'index: la position d'une partie dans le fichier de l'archive
+FORMAT_INDEX = struct.Struct('<Q')
+
+
+def encoder_partie(départ, coups):
+    """
+    Produire l'enregistrement binaire d'une partie.
+
+    :param départ: la position de départ, produite par Quoridor.sérialiser.
+    :param coups: les codes des coups joués, à tour de rôle.
+    :returns: les octets de l'enregistrement.
+    :raises QuoridorError: la partie compte trop de coups.
+    """
+    coups = bytes(coups)
+    if len(coups) >= 1 << 16:
+        raise QuoridorError("Game has too many moves to be recorded")
+    return FORMAT_EN_TÊTE.pack(départ, len(coups)) + coups
+
+
+def décoder_partie(données, décalage=0):
+    """
+    Lire un enregistrement binaire produit par encoder_partie.
+
+    :param données: les octets (ou une vue sur les octets) qui contiennent l'enregistrement.
+    :param décalage: la position de l'enregistrement dans les données.
+    :returns: le tuple (position de départ, codes des coups).
+    """
+    départ, nombre = FORMAT_EN_TÊTE.unpack_from(données, décalage)
+    début = décalage + FORMAT_EN_TÊTE.size
+    return départ, bytes(données[début:début + nombre])
+
+
+def enregistrer_partie(partie):
+    """
+    Produire l'enregistrement binaire d'une partie de Quoridor, depuis sa création.
+
+    Les coups sont annulés pour retrouver la position de départ, puis rejoués: la partie
+    est inchangée au retour.
+
+    :param partie: la partie de Quoridor, sur le damier 9x9.
+    :returns: les octets de l'enregistrement.
+    :raises QuoridorError: la partie n'est pas sur le damier 9x9.
+    :raises QuoridorError: les joueurs n'ont pas joué à tour de rôle.
+    """
+    if partie.taille != TAILLE:
+        raise QuoridorError(f"Game records only support the {TAILLE}x{TAILLE} board")
+    joués = partie.coups_joués()
+    for _ in joués:
+        partie.annuler()
+    départ = partie.sérialiser()
+    dernier = partie.last_player
+    for coup, joueur in joués:
+        partie.jouer(coup, joueur)
+
+    for coup, joueur in joués:
+        if joueur == dernier:
+            raise QuoridorError("Players did not alternate and cannot be recorded")
+        dernier = joueur
+
+    return encoder_partie(départ, [coup for coup, _ in joués])
+
+
+def rejouer(départ, coups, noms=('1', '2')):
+    """
+    Reconstruire une partie de Quoridor à partir de sa position de départ et de ses coups.
+    Les coups peuvent être annulés sur la partie obtenue.
+
+    :param départ: la position de départ, produite par Quoridor.sérialiser.
+    :param coups: les codes des coups à jouer, à tour de rôle.
+    :param noms: le nom des deux joueurs.
+    :returns: une nouvelle partie de Quoridor.
+    """
+    partie = Quoridor.désérialiser(départ, noms)
+    for coup in coups:
+        partie.jouer(coup, other_player(partie.last_player))
+    return partie
+
+
+class Archive:
+    """
+    Une archive de parties où l'on ne fait qu'ajouter. La partie i se trouve dans le fichier
+    à la position donnée par la i-ème entrée de l'index, le fichier chemin + '.index'.
+
+    L'archive s'utilise comme une séquence d'enregistrements (voir décoder_partie), et
+    s'emploie de préférence dans un bloc with pour fermer ses fichiers.
+    """
+
+    def __init__(self, chemin):
+        """
+        Ouvrir une archive, en la créant si elle n'existe pas.
+
+        :param chemin: le chemin du fichier de l'archive.
+        :raises QuoridorError: le fichier n'est pas une archive de parties.
+        """
+        self.chemin = chemin
+        self._fichier = open(chemin, 'a+b')
+        self._index = open(chemin + '.index', 'a+b')
+        self._données = None
+        self._entrées = None
+
+        if self._fichier.tell() == 0:
+            self._fichier.write(SIGNATURE)
+            self._fichier.flush()
+        else:
+            self._fichier.seek(0)
+            signature = self._fichier.read(len(SIGNATURE))
+            self._fichier.seek(0, os.SEEK_END)
+            if signature != SIGNATURE:
+                raise QuoridorError(f"{chemin} is not a game archive")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        """Fermer les fichiers de l'archive."""
+        self._libérer()
+        self._fichier.close()
+        self._index.close()
+
+    def ajouter(self, enregistrement):
+        """
+        Ajouter une partie à la fin de l'archive.
+
+        :param enregistrement: les octets produits par encoder_partie ou enregistrer_partie.
+        :returns: le numéro de la partie dans l'archive.
+        """
+        position = self._fichier.tell()
+        self._fichier.write(enregistrement)
+        self._fichier.flush()
+        self._index.write(FORMAT_INDEX.pack(position))
+        self._index.flush()
+        self._libérer()
+        return len(self) - 1
+
+    def ajouter_partie(self, partie):
+        """
+        Ajouter une partie de Quoridor à la fin de l'archive (voir enregistrer_partie).
+
+        :returns: le numéro de la partie dans l'archive.
+        """
+        return self.ajouter(enregistrer_partie(partie))
+
+    def __len__(self):
+        return self._index.tell() // FORMAT_INDEX.size
+
+    def __getitem__(self, numéro):
+        """
+        Lire une partie de l'archive.
+
+        :param numéro: le numéro de la partie.
+        :returns: le tuple (position de départ, codes des coups).
+        :raises IndexError: la partie n'existe pas.
+        """
+        if numéro < 0:
+            numéro += len(self)
+        if not 0 <= numéro < len(self):
+            raise IndexError(f"Game {numéro} is not in the archive")
+
+        self._projeter()
+        (position,) = FORMAT_INDEX.unpack_from(self._entrées, numéro * FORMAT_INDEX.size)
+        return décoder_partie(self._données, position)
+
+    def partie(self, numéro, coups=None, noms=('1', '2')):
+        """
+        Reconstruire une partie de l'archive.
+
+        :param numéro: le numéro de la partie.
+        :param coups: le nombre de coups à rejouer; par défaut, tous.
+        :param noms: le nom des deux joueurs.
+        :returns: une nouvelle partie de Quoridor.
+        """
+        départ, joués = self[numéro]
+        return rejouer(départ, joués[:coups], noms)
+
+    def _projeter(self):
+        """Projette les fichiers en mémoire, s'ils ne le sont pas déjà."""
+        if self._données is None:
+            self._données = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+            self._entrées = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _libérer(self):
+        """Libère les projections, qui ne couvrent plus tout le fichier après un ajout."""
+        if self._données is not None:
+            self._données.close()
+            self._entrées.close()
+            self._données = self._entrées = None
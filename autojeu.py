@@ -0,0 +1,200 @@
+"""
+Joue des parties entre deux configurations d'IA, réparties sur plusieurs processus.
+
+Chaque partie terminée produit une ligne JSON (gagnant, nombre de coups, durée). Le débit
+en parties et en coups par seconde est affiché à la fin sur la sortie d'erreur.
+
+Utilisation, depuis la racine du dépôt:
+
+    python autojeu.py --parties 100 --joueur1 alphabeta:0.05 --joueur2 chemin > parties.jsonl
+    python autojeu.py --parties 10 --taille 15 --murs 40 --joueur1 mcts:0.2 --joueur2 chemin
+
+Une configuration est 'chemin' (avancer sur le plus court chemin), 'alphabeta[:temps]' ou
+'mcts[:temps]', le temps étant le budget en secondes par coup.
+"""
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import json
+import os
+import random
+import sys
+import time
+
+from quoridor import NB_MURS, TAILLE, Quoridor, QuoridorError, other_player
+
+# stratégies déjà créées dans ce processus, réutilisées d'une partie à l'autre
+_STRATÉGIES = {}
+
+
+def créer_stratégie(configuration):
+    """
+    Créer la stratégie décrite par une configuration.
+
+    :param configuration: 'chemin', 'alphabeta[:temps]' ou 'mcts[:temps]'.
+    :returns: la stratégie à passer à Quoridor.jouer_coup (None pour 'chemin').
+    :raises QuoridorError: la configuration est invalide.
+    """
+    nom, _, temps = configuration.partition(':')
+    try:
+        temps = float(temps) if temps else 0.1
+    except ValueError:
+        raise QuoridorError(f"Invalid time budget in configuration {configuration!r}") from None
+
+    if nom == 'chemin':
+        return None
+    if nom == 'alphabeta':
+        from recherche import RechercheAlphaBeta
+        return RechercheAlphaBeta(temps=temps)
+    if nom == 'mcts':
+        from mcts import RechercheMCTS
+        return RechercheMCTS(temps=temps, processus=1)
+
+    raise QuoridorError(f"Unknown AI configuration {configuration!r}")
+
+
+def stratégie_partagée(configuration):
+    """
+    Produire la stratégie d'une configuration, créée une seule fois par processus puis
+    réutilisée d'un appel à l'autre, ce qui évite par exemple de réallouer la table de
+    transposition d'alpha-bêta à chaque coup.
+
+    :param configuration: la configuration de l'IA (voir créer_stratégie).
+    :returns: la stratégie à passer à Quoridor.jouer_coup (None pour 'chemin').
+    :raises QuoridorError: la configuration est invalide.
+    """
+    if configuration not in _STRATÉGIES:
+        _STRATÉGIES[configuration] = créer_stratégie(configuration)
+    return _STRATÉGIES[configuration]
+
+
+def jouer_partie(numéro, configurations, graine, ouverture=4, max_coups=200, taille=TAILLE,
+                 nb_murs=NB_MURS):
+    """
+    Jouer une partie complète entre deux configurations.
+
+    :param numéro: le numéro de la partie, recopié dans le résultat.
+    :param configurations: les configurations des joueurs 1 et 2.
+    :param graine: la graine des coups d'ouverture.
+    :param ouverture: le nombre de demi-coups joués au hasard au début de la partie, pour
+    que les parties entre stratégies déterministes diffèrent.
+    :param max_coups: le nombre de demi-coups après lequel la partie est déclarée nulle.
+    :param taille: la taille du damier.
+    :param nb_murs: le nombre total de murs des deux joueurs.
+    :returns: le dictionnaire du résultat, prêt à être écrit en JSON.
+    """
+    début = time.perf_counter()
+    hasard = random.Random(graine)
+    stratégies = [stratégie_partagée(configuration) for configuration in configurations]
+    partie = Quoridor(['1', '2'], taille=taille, nb_murs=nb_murs)
+    joueur, coups = 1, 0
+
+    while not partie.partie_terminée() and coups < max_coups:
+        if coups < ouverture:
+            partie.jouer(hasard.choice(partie.coups_légaux(joueur)), joueur)
+        else:
+            partie.jouer_coup(joueur, stratégies[joueur - 1])
+        coups += 1
+        joueur = other_player(joueur)
+
+    gagnant = partie.partie_terminée()
+    return {
+        'partie': numéro,
+        'graine': graine,
+        'joueurs': list(configurations),
+        'gagnant': int(gagnant) if gagnant else None,
+        'coups': coups,
+        'durée': time.perf_counter() - début,
+    }
+
+
+def jouer_parties(nombre, configurations, processus=None, graine=0, ouverture=4,
+                  max_coups=200, en_vol=None, taille=TAILLE, nb_murs=NB_MURS):
+    """
+    Jouer des parties sur plusieurs processus et produire leurs résultats au fil de l'eau,
+    dans l'ordre où elles se terminent.
+
+    Les configurations alternent le premier coup d'une partie à l'autre. Au plus en_vol
+    parties sont soumises à la fois, de sorte que la mémoire utilisée ne dépend pas du
+    nombre de parties demandées.
+
+    :param nombre: le nombre de parties.
+    :param configurations: les configurations des deux IA.
+    :param processus: le nombre de processus; par défaut, le nombre de coeurs.
+    :param graine: la graine de la première partie; la partie i utilise graine + i.
+    :param en_vol: le nombre maximal de parties soumises; par défaut, deux par processus.
+    :param taille: la taille du damier.
+    :param nb_murs: le nombre total de murs des deux joueurs.
+    :returns: un générateur des résultats de jouer_partie.
+    """
+    processus = processus or os.cpu_count() or 1
+    en_vol = en_vol or 2 * processus
+
+    def paramètres(numéro):
+        ordre = configurations if numéro % 2 == 0 else configurations[::-1]
+        return numéro, tuple(ordre), graine + numéro, ouverture, max_coups, taille, nb_murs
+
+    if processus == 1:
+        for numéro in range(nombre):
+            yield jouer_partie(*paramètres(numéro))
+        return
+
+    with ProcessPoolExecutor(processus) as exécuteur:
+        suivante = 0
+        en_cours = set()
+        while suivante < nombre or en_cours:
+            while suivante < nombre and len(en_cours) < en_vol:
+                en_cours.add(exécuteur.submit(jouer_partie, *paramètres(suivante)))
+                suivante += 1
+            terminées, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+            for future in terminées:
+                yield future.result()
+
+
+def main():
+    """Point d'entrée de la ligne de commande."""
+    analyseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    analyseur.add_argument('--parties', type=int, default=10)
+    analyseur.add_argument('--joueur1', default='chemin')
+    analyseur.add_argument('--joueur2', default='chemin')
+    analyseur.add_argument('--processus', type=int, default=None)
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--ouverture', type=int, default=4)
+    analyseur.add_argument('--max-coups', type=int, default=200)
+    analyseur.add_argument('--taille', type=int, default=TAILLE)
+    analyseur.add_argument('--murs', type=int, default=NB_MURS,
+                           help="nombre total de murs des deux joueurs")
+    analyseur.add_argument('--sortie', default='-', help="fichier JSONL, '-' pour stdout")
+    args = analyseur.parse_args()
+
+    configurations = (args.joueur1, args.joueur2)
+    for configuration in configurations:
+        créer_stratégie(configuration)
+
+    sortie = sys.stdout if args.sortie == '-' else open(args.sortie, 'w', encoding='utf-8')
+    début = time.perf_counter()
+    parties = coups = 0
+    victoires = {configuration: 0 for configuration in configurations}
+
+    try:
+        for résultat in jouer_parties(args.parties, configurations, args.processus,
+                                      args.graine, args.ouverture, args.max_coups,
+                                      taille=args.taille, nb_murs=args.murs):
+            sortie.write(json.dumps(résultat, ensure_ascii=False) + '\n')
+            sortie.flush()
+            parties += 1
+            coups += résultat['coups']
+            if résultat['gagnant'] is not None:
+                victoires[résultat['joueurs'][résultat['gagnant'] - 1]] += 1
+    finally:
+        if sortie is not sys.stdout:
+            sortie.close()
+
+    durée = time.perf_counter() - début
+    print(f"{parties} parties, {coups} coups en {durée:.2f} s: "
+          f"{parties / durée:.2f} parties/s, {coups / durée:.1f} coups/s", file=sys.stderr)
+    for configuration, nombre in victoires.items():
+        print(f"{configuration}: {nombre} victoires", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
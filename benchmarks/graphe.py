@@ -0,0 +1,121 @@
+"""
+Compare la latence par coup du graphe reconstruit à chaque coup et du graphe incrémental.
+
+Utilisation, depuis la racine du dépôt:
+
+    python -m benchmarks.graphe [--parties 20] [--graine 0] [--moteur natif]
+"""
+import argparse
+import copy
+import random
+import time
+
+from quoridor import (
+    MOTEURS, Quoridor, QuoridorError, chemin_existe, choisir_moteur, construire_graphe,
+    plus_court_chemin,
+)
+
+
+def générer_partie(graine):
+    """
+    Joue une partie où chaque joueur avance sur son plus court chemin ou pose un mur au hasard.
+
+    :param graine: la graine du générateur aléatoire.
+    :returns: la liste des coups joués, sous la forme (joueur, type, position, orientation).
+    """
+    rng = random.Random(graine)
+    partie = Quoridor(['1', '2'])
+    coups = []
+    joueur = 1
+
+    while not partie.partie_terminée() and len(coups) < 200:
+        coup = None
+
+        if rng.random() < 0.3 and partie.etat['joueurs'][joueur - 1]['murs']:
+            orientation = rng.choice(['horizontal', 'vertical'])
+            position = (rng.randint(1, 9), rng.randint(1, 9))
+            essai = copy.deepcopy(partie)
+            try:
+                essai.placer_mur(joueur, position, orientation)
+                graphe = essai.graphe()
+                if all(chemin_existe(graphe, pos, f'B{i + 1}')
+                       for i, pos in enumerate(essai._positions())):
+                    coup = (joueur, 'mur', position, orientation)
+            except QuoridorError:
+                pass
+
+        if coup is None:
+            chemin = plus_court_chemin(
+                partie.graphe(), partie._positions()[joueur - 1], f'B{joueur}')
+            coup = (joueur, 'jeton', chemin[1], None)
+
+        appliquer(partie, coup)
+        coups.append(coup)
+        joueur = 3 - joueur
+
+    return coups
+
+
+def appliquer(partie, coup):
+    """Applique un coup produit par générer_partie."""
+    joueur, genre, position, orientation = coup
+    if genre == 'mur':
+        partie.placer_mur(joueur, position, orientation)
+    else:
+        partie.déplacer_jeton(joueur, position)
+
+
+def mesurer(coups, incrémental):
+    """
+    Rejoue une partie et mesure, pour chaque coup, le temps d'appliquer le coup puis de
+    calculer le plus court chemin du joueur suivant.
+
+    :returns: la liste des durées en secondes.
+    """
+    partie = Quoridor(['1', '2'])
+    durées = []
+
+    for joueur, *reste in coups:
+        suivant = 3 - joueur
+        début = time.perf_counter()
+        appliquer(partie, (joueur, *reste))
+
+        if incrémental:
+            graphe = partie.graphe()
+        else:
+            graphe = construire_graphe(
+                [j['pos'] for j in partie.etat['joueurs']],
+                partie.etat['murs']['horizontaux'],
+                partie.etat['murs']['verticaux'])
+
+        if not partie.partie_terminée():
+            plus_court_chemin(graphe, partie._positions()[suivant - 1], f'B{suivant}')
+        durées.append(time.perf_counter() - début)
+
+    return durées
+
+
+def main():
+    """Point d'entrée du banc d'essai."""
+    analyseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    analyseur.add_argument('--parties', type=int, default=20)
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--moteur', choices=MOTEURS, default='natif',
+                           help="moteur des graphes de déplacements")
+    args = analyseur.parse_args()
+    choisir_moteur(args.moteur)
+
+    parties = [générer_partie(args.graine + i) for i in range(args.parties)]
+    nb_coups = sum(len(coups) for coups in parties)
+
+    résultats = {}
+    for nom, incrémental in (('reconstruit', False), ('incrémental', True)):
+        durées = [d for coups in parties for d in mesurer(coups, incrémental)]
+        résultats[nom] = sum(durées) / len(durées)
+        print(f"{nom:>12}: {résultats[nom] * 1e6:9.1f} µs/coup ({nb_coups} coups)")
+
+    print(f"{'accélération':>12}: {résultats['reconstruit'] / résultats['incrémental']:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
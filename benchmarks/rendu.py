@@ -0,0 +1,187 @@
+"""
+Compare la latence des trois façons de produire la représentation en art ascii de Quoridor.
+
+L'implémentation d'origine recrée une grille de listes à chaque appel, Quoridor.__str__
+peint un gabarit précalculé et le rendu différentiel ne produit que les lignes modifiées
+depuis l'image précédente.
+
+Utilisation, depuis la racine du dépôt:
+
+    python -m benchmarks.rendu [--parties 20] [--graine 0]
+"""
+import argparse
+import random
+import time
+
+from quoridor import Quoridor, RenduDifférentiel
+
+
+def rendu_original(self):
+    """
+    Quoridor.__str__ tel qu'il était avant le gabarit précalculé, pour comparaison.
+
+    :returns: la chaîne de caractères de la représentation.
+    """
+    sortie = ""
+    murs_h = self.etat["murs"]["horizontaux"]
+    murs_v = self.etat["murs"]["verticaux"]
+    nom_1 = self.etat["joueurs"][0]["nom"]
+    nom_2 = self.etat["joueurs"][1]["nom"]
+    pos_1 = self.etat["joueurs"][0]["pos"]
+    pos_2 = self.etat["joueurs"][1]["pos"]
+    sortie += f"Légende: 1={nom_1}, 2={nom_2}\n"
+    sortie += "   -----------------------------------\n"
+    grille = [["9", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["8", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["7", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["6", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["5", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["4", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["3", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["2", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"],
+              [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
+               " ", " ", "|", "\n"],
+              ["1", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
+               ".", " ", "|", "\n"]]
+    for i in murs_h:
+        for e in range(7):
+            grille[19 - 2 * i[1]][4 * i[0] - 1 + e] = "-"
+    for i in murs_v:
+        for e in range(3):
+            grille[18 - (2 * i[1] + e)][4 * i[0] - 2] = "|"
+    grille[18 - 2 * pos_1[1]][4 * pos_1[0]] = "1"
+    grille[18 - 2 * pos_2[1]][4 * pos_2[0]] = "2"
+    jeu = ""
+    for i in grille:
+        jeu += "".join(i)
+    sortie += jeu
+    sortie += "--|-----------------------------------\n  | 1   2   3   4   5   6   7   8   9"
+    return sortie
+
+
+def générer_parties(parties, graine):
+    """
+    Joue des parties au hasard.
+
+    :returns: la liste des coups de chaque partie, sous la forme (code, joueur).
+    """
+    hasard = random.Random(graine)
+    coups = []
+
+    for _ in range(parties):
+        partie = Quoridor(['1', '2'])
+        joueur = 1
+        while not partie.partie_terminée() and len(partie.coups_joués()) < 100:
+            partie.jouer(hasard.choice(partie.coups_légaux(joueur)), joueur)
+            joueur = 3 - joueur
+        coups.append(partie.coups_joués())
+
+    return coups
+
+
+def mesurer(parties, rendu):
+    """
+    Rejoue les parties comme un spectateur, en produisant une image après chaque coup.
+
+    :param rendu: une fonction qui reçoit la partie et retourne l'image.
+    :returns: la durée moyenne d'une image en secondes et le nombre moyen de lignes produites.
+    """
+    durée, lignes, images = 0.0, 0, 0
+    for coups in parties:
+        partie = Quoridor(['1', '2'])
+        for coup, joueur in coups:
+            partie.jouer(coup, joueur)
+            début = time.perf_counter()
+            image = rendu(partie)
+            durée += time.perf_counter() - début
+            lignes += len(image) if isinstance(image, list) else image.count('\n') + 1
+            images += 1
+    return durée / images, lignes / images
+
+
+def main():
+    """Point d'entrée du banc d'essai."""
+    analyseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    analyseur.add_argument('--parties', type=int, default=20)
+    analyseur.add_argument('--graine', type=int, default=0)
+    args = analyseur.parse_args()
+
+    parties = générer_parties(args.parties, args.graine)
+    for coups in parties:
+        partie = Quoridor(['1', '2'])
+        for coup, joueur in coups:
+            partie.jouer(coup, joueur)
+            if str(partie) != rendu_original(partie):
+                raise AssertionError(f"Rendering differs:\n{partie}\n{rendu_original(partie)}")
+
+    résultats = {
+        'original': mesurer(parties, rendu_original),
+        'gabarit': mesurer(parties, str),
+        'différentiel': mesurer(parties, RenduDifférentiel().image),
+    }
+    nb_images = sum(len(coups) for coups in parties)
+    for nom, (durée, lignes) in résultats.items():
+        print(f"{nom:>12}: {durée * 1e6:9.1f} µs/image, {lignes:4.1f} lignes/image "
+              f"({nb_images} images)")
+
+    print(f"{'accélération':>12}: {résultats['original'][0] / résultats['gabarit'][0]:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
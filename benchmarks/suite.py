@@ -0,0 +1,217 @@
+"""
+Mesure la latence des chemins critiques de quoridor.py, comparée au besoin à une référence.
+
+Les positions mesurées sont reproductibles, du damier vide aux 20 murs posés.
+
+Utilisation, depuis la racine du dépôt:
+
+    python -m benchmarks.suite [--sortie résultats.json] [--comparer référence.json]
+                               [--seuil 0.10] [--graine 0] [--répétitions 5] [--taille 9]
+
+En mode comparaison, le code de sortie est 1 si une opération est plus lente que la
+référence de plus du seuil (10 % par défaut).
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from quoridor import TAILLE, Quoridor, QuoridorError, construire_graphe, décoder_coup
+
+# nombres de murs posés dans les positions mesurées
+NOMBRES_DE_MURS = (0, 4, 8, 12, 16, 20)
+
+
+def générer_position(nb_murs, graine, taille=TAILLE):
+    """
+    Produit une position où nb_murs murs sont posés au hasard, les joueurs se déplaçant au
+    hasard entre deux murs sans atteindre de ligne d'arrivée.
+
+    :returns: l'état de la partie (voir Quoridor.état_partie).
+    """
+    hasard = random.Random(graine * 100 + nb_murs)
+    partie = Quoridor(['1', '2'], taille=taille)
+    nb_cases = partie.géométrie.nb_cases
+    joueur = 1
+
+    while sum(len(murs) for murs in partie.etat['murs'].values()) < nb_murs:
+        coups = partie.coups_légaux(joueur)
+        murs = [coup for coup in coups if coup >= nb_cases]
+        déplacements = [coup for coup in coups
+                        if coup < nb_cases and coup // taille not in (0, taille - 1)]
+        if murs and (hasard.random() < 0.5 or not déplacements):
+            partie.jouer(hasard.choice(murs), joueur)
+        else:
+            partie.jouer(hasard.choice(déplacements), joueur)
+        joueur = 3 - joueur
+
+    return partie.état_partie()
+
+
+def opérations(état, taille=TAILLE):
+    """
+    Prépare les opérations à mesurer sur une position. Celles qui modifient la partie
+    annulent leur coup, ce qui est compté dans la mesure.
+
+    :returns: un dictionnaire {nom: fonction sans argument}.
+    """
+    joueurs = [dict(joueur) for joueur in état['joueurs']]
+    murs = {clé: [list(mur) for mur in liste] for clé, liste in état['murs'].items()}
+    partie = Quoridor(joueurs, murs, taille)
+    positions = [tuple(joueur['pos']) for joueur in joueurs]
+    coups = partie.coups_légaux(1)
+
+    def jouer_coup():
+        partie.jouer_coup(1)
+        partie.annuler()
+
+    liste = {
+        '__init__': lambda: Quoridor(joueurs, murs, taille),
+        'construire_graphe': lambda: construire_graphe(
+            positions, murs['horizontaux'], murs['verticaux'], taille),
+        'jouer_coup': jouer_coup,
+        'partie_terminée': partie.partie_terminée,
+        '__str__': partie.__str__,
+        'coups_légaux': lambda: partie.coups_légaux(1),
+    }
+
+    for coup in coups:
+        type_coup, position = décoder_coup(coup, taille)
+        try:
+            if type_coup == 'D':
+                partie.déplacer_jeton(1, position)
+            else:
+                partie.placer_mur(1, position, 'horizontal' if type_coup == 'MH' else 'vertical')
+        except QuoridorError:
+            continue
+        partie.annuler()
+
+        nom = 'déplacer_jeton' if type_coup == 'D' else 'placer_mur'
+        if nom not in liste:
+            liste[nom] = _jouer_annuler(partie, type_coup, position)
+
+    return liste
+
+
+def _jouer_annuler(partie, type_coup, position):
+    """Retourne une fonction qui joue le coup avec déplacer_jeton ou placer_mur, puis l'annule."""
+    if type_coup == 'D':
+        def jouer():
+            partie.déplacer_jeton(1, position)
+            partie.annuler()
+    else:
+        orientation = 'horizontal' if type_coup == 'MH' else 'vertical'
+
+        def jouer():
+            partie.placer_mur(1, position, orientation)
+            partie.annuler()
+
+    return jouer
+
+
+def chronométrer(fonction, répétitions, durée_minimale=0.02):
+    """
+    Mesure la durée d'un appel de la fonction: le nombre d'appels par série est doublé
+    jusqu'à ce qu'une série dure au moins durée_minimale, puis la médiane de plusieurs
+    séries est retenue.
+
+    :returns: la durée médiane d'un appel, en secondes.
+    """
+    nombre = 1
+    while True:
+        début = time.perf_counter()
+        for _ in range(nombre):
+            fonction()
+        if time.perf_counter() - début >= durée_minimale:
+            break
+        nombre *= 2
+
+    séries = []
+    for _ in range(répétitions):
+        début = time.perf_counter()
+        for _ in range(nombre):
+            fonction()
+        séries.append((time.perf_counter() - début) / nombre)
+    return statistics.median(séries)
+
+
+def mesurer(graine, répétitions, taille=TAILLE):
+    """
+    Mesure chaque opération sur chaque position.
+
+    :returns: un dictionnaire {'opération/murs=n': durée en microsecondes}.
+    """
+    résultats = {}
+    for nb_murs in NOMBRES_DE_MURS:
+        état = générer_position(nb_murs, graine, taille)
+        for nom, fonction in opérations(état, taille).items():
+            résultats[f'{nom}/murs={nb_murs}'] = chronométrer(fonction, répétitions) * 1e6
+    return résultats
+
+
+def comparer(référence, résultats, seuil):
+    """
+    Compare deux mesures et affiche le rapport de chaque opération.
+
+    :returns: la liste des opérations plus lentes que la référence de plus du seuil.
+    """
+    régressions = []
+    for clé, durée in résultats.items():
+        if clé not in référence:
+            continue
+        rapport = durée / référence[clé]
+        marque = ''
+        if rapport > 1 + seuil:
+            marque = '  RÉGRESSION'
+            régressions.append(clé)
+        elif rapport < 1 - seuil:
+            marque = '  amélioration'
+        print(f"{clé:>30}: {référence[clé]:10.1f} -> {durée:10.1f} µs ({rapport:5.2f}x){marque}")
+    return régressions
+
+
+def main():
+    """Point d'entrée de la suite de bancs d'essai."""
+    analyseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    analyseur.add_argument('--sortie', help="fichier JSON où écrire les résultats")
+    analyseur.add_argument('--comparer', help="fichier JSON d'une mesure de référence")
+    analyseur.add_argument('--seuil', type=float, default=0.10)
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--répétitions', type=int, default=5)
+    analyseur.add_argument('--taille', type=int, default=TAILLE, help="taille du damier")
+    args = analyseur.parse_args()
+
+    résultats = mesurer(args.graine, args.répétitions, args.taille)
+    document = {
+        'méta': {
+            'graine': args.graine,
+            'répétitions': args.répétitions,
+            'taille': args.taille,
+            'python': platform.python_version(),
+            'plateforme': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'résultats': résultats,
+    }
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump(document, fichier, ensure_ascii=False, indent=2)
+
+    if args.comparer:
+        with open(args.comparer, encoding='utf-8') as fichier:
+            référence = json.load(fichier)['résultats']
+        régressions = comparer(référence, résultats, args.seuil)
+        if régressions:
+            print(f"{len(régressions)} régression(s) au-delà de {args.seuil:.0%}")
+            sys.exit(1)
+    else:
+        for clé, durée in résultats.items():
+            print(f"{clé:>30}: {durée:10.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+Ce module contient le cache des positions de Quoridor: les résultats de recherche et les
+longueurs des plus courts chemins y sont conservés d'une partie à l'autre et, au besoin,
+d'un processus à l'autre dans une base sqlite.
+
+Une position et son image dans un miroir gauche-droite (x devient 10 - x) partagent la
+même entrée: la clé d'une position est la plus petite de leurs deux représentations
+binaires (voir Quoridor.sérialiser), et les coups conservés sont retournés au besoin.
+"""
+from collections import OrderedDict
+import json
+import sqlite3
+import time
+
+from quoridor import NB_CASES, NB_CENTRES, TAILLE, QuoridorError
+
+# pour chaque octet, l'octet dont les bits sont dans l'ordre inverse: une ligne de centres
+# de murs occupe un octet des masques, et son miroir est cet octet inversé
+_INVERSION = bytes(int(f'{octet:08b}'[::-1], 2) for octet in range(256))
+# pour chaque case, la case miroir
+_CASES_MIROIR = tuple(case - case % TAILLE + TAILLE - 1 - case % TAILLE
+                      for case in range(NB_CASES))
+# pour chaque centre de mur, le centre miroir
+_CENTRES_MIROIR = tuple(centre - centre % (TAILLE - 1) + TAILLE - 2 - centre % (TAILLE - 1)
+                        for centre in range(NB_CENTRES))
+
+
+def miroir(données):
+    """
+    Produire l'image d'une position dans un miroir gauche-droite.
+
+    :param données: la position, produite par Quoridor.sérialiser: cinq octets, dont les
+    cases des deux jetons, puis les masques des murs horizontaux et verticaux.
+    :returns: la position miroir, dans le même format.
+    """
+    pion_1, pion_2, *reste = données[:5]
+    return (bytes([_CASES_MIROIR[pion_1], _CASES_MIROIR[pion_2], *reste])
+            + données[5:].translate(_INVERSION))
+
+
+def miroir_coup(coup):
+    """
+    Produire l'image d'un coup dans un miroir gauche-droite.
+
+    :param coup: le code du coup (voir encoder_coup).
+    :returns: le code du coup miroir.
+    """
+    if coup < NB_CASES:
+        return _CASES_MIROIR[coup]
+    début = NB_CASES if coup < NB_CASES + NB_CENTRES else NB_CASES + NB_CENTRES
+    return début + _CENTRES_MIROIR[coup - début]
+
+
+def clé_canonique(partie):
+    """
+    Produire la clé d'une position, commune à la position et à son miroir.
+
+    :param partie: la partie de Quoridor, sur le damier 9x9.
+    :returns: le tuple (clé, True si la clé est celle de la position miroir).
+    :raises QuoridorError: la partie n'est pas sur le damier 9x9.
+    """
+    if partie.taille != TAILLE:
+        raise QuoridorError(f"The position cache only supports the {TAILLE}x{TAILLE} board")
+    données = partie.sérialiser()
+    image = miroir(données)
+    if image < données:
+        return image, True
+    return données, False
+
+
+class CachePositions:
+    """
+    Cache des positions: une couche en mémoire de taille fixe, dont on évince la position
+    utilisée le moins récemment, devant une base sqlite facultative.
+
+    Une entrée est un dictionnaire de valeurs JSON. Les coups y sont conservés sous des clés
+    qui commencent par 'coup', pour être retournés avec la position.
+    """
+
+    def __init__(self, taille=100000, chemin=None, validation=1000):
+        """
+        :param taille: le nombre maximal de positions en mémoire.
+        :param chemin: le chemin de la base sqlite, ou None pour un cache en mémoire seulement.
+        :param validation: le nombre d'écritures entre deux validations de la base.
+        """
+        self.taille = taille
+        self.validation = validation
+        self._entrées = OrderedDict()
+        self._en_attente = 0
+        self.statistiques = {'succès': 0, 'succès_disque': 0, 'échecs': 0, 'évictions': 0}
+
+        self._base = None
+        if chemin is not None:
+            self._base = sqlite3.connect(chemin)
+            self._base.execute(
+                'CREATE TABLE IF NOT EXISTS positions (clé BLOB PRIMARY KEY, valeur TEXT)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __len__(self):
+        return len(self._entrées)
+
+    def fermer(self):
+        """Valider les écritures en attente et fermer la base."""
+        if self._base is not None:
+            self._base.commit()
+            self._base.close()
+            self._base = None
+
+    def lire(self, partie):
+        """
+        Lire l'entrée d'une position.
+
+        :param partie: la partie de Quoridor.
+        :returns: une copie de l'entrée, avec ses coups pour cette position, ou None.
+        """
+        clé, miroité = clé_canonique(partie)
+        entrée = self._lire(clé)
+        if entrée is None:
+            return None
+        return _orienter(entrée, miroité)
+
+    def écrire(self, partie, **valeurs):
+        """
+        Ajouter des valeurs à l'entrée d'une position.
+
+        :param partie: la partie de Quoridor.
+        :param valeurs: les valeurs à conserver, qui doivent pouvoir être écrites en JSON.
+        """
+        clé, miroité = clé_canonique(partie)
+        entrée = dict(self._lire(clé, compter=False) or {})
+        entrée.update(_orienter(valeurs, miroité))
+        self._garder(clé, entrée)
+
+        if self._base is not None:
+            self._base.execute('INSERT OR REPLACE INTO positions VALUES (?, ?)',
+                               (clé, json.dumps(entrée)))
+            self._en_attente += 1
+            if self._en_attente >= self.validation:
+                self._base.commit()
+                self._en_attente = 0
+
+    def distances(self, partie):
+        """
+        Produire les longueurs des plus courts chemins des deux joueurs, calculées au besoin
+        par Quoridor.distance.
+
+        :param partie: la partie de Quoridor.
+        :returns: le tuple (distance du joueur 1, distance du joueur 2).
+        """
+        entrée = self.lire(partie)
+        if entrée is not None and 'distances' in entrée:
+            return tuple(entrée['distances'])
+
+        distances = (partie.distance(1), partie.distance(2))
+        self.écrire(partie, distances=distances)
+        return distances
+
+    def _lire(self, clé, compter=True):
+        """Retourne l'entrée de la clé, en mémoire ou dans la base, ou None."""
+        entrée = self._entrées.get(clé)
+        if entrée is not None:
+            self._entrées.move_to_end(clé)
+            if compter:
+                self.statistiques['succès'] += 1
+            return entrée
+
+        if self._base is not None:
+            rangée = self._base.execute(
+                'SELECT valeur FROM positions WHERE clé = ?', (clé,)).fetchone()
+            if rangée is not None:
+                entrée = json.loads(rangée[0])
+                self._garder(clé, entrée)
+                if compter:
+                    self.statistiques['succès_disque'] += 1
+                return entrée
+
+        if compter:
+            self.statistiques['échecs'] += 1
+        return None
+
+    def _garder(self, clé, entrée):
+        """Met l'entrée en mémoire, en évinçant la moins récemment utilisée au besoin."""
+        self._entrées[clé] = entrée
+        self._entrées.move_to_end(clé)
+        if len(self._entrées) > self.taille:
+            self._entrées.popitem(last=False)
+            self.statistiques['évictions'] += 1
+
+
+def _orienter(valeurs, miroité):
+    """Retourne une copie des valeurs, les coups passés au miroir si la position l'est."""
+    if not miroité:
+        return dict(valeurs)
+    return {nom: miroir_coup(valeur) if nom.startswith('coup') and valeur is not None else valeur
+            for nom, valeur in valeurs.items()}
+
+
+class StratégieEnCache:
+    """
+    Stratégie pour Quoridor.jouer_coup qui conserve les coups choisis par une autre stratégie
+    dans un CachePositions, et les rejoue sans recherche quand la position revient.
+    """
+
+    def __init__(self, stratégie, cache, nom='coup'):
+        """
+        :param stratégie: la stratégie dont les coups sont conservés.
+        :param cache: le CachePositions à utiliser.
+        :param nom: le préfixe de la valeur conservée, qui doit commencer par 'coup'; deux
+        stratégies différentes partageant un cache doivent avoir des noms différents.
+        """
+        self.stratégie = stratégie
+        self.cache = cache
+        self.nom = nom
+        self.statistiques = {
+            'appels': 0, 'succès': 0, 'durée_succès': 0.0, 'durée_échecs': 0.0,
+        }
+
+    def choisir_coup(self, partie, joueur):
+        """
+        Choisir le coup conservé pour cette position et ce joueur, sinon celui de la
+        stratégie, qui est alors conservé.
+
+        :param partie: la partie de Quoridor.
+        :param joueur: le numéro du joueur (1 ou 2).
+        :returns: le code du coup choisi (voir quoridor.encoder_coup).
+        """
+        début = time.perf_counter()
+        nom = f'{self.nom}_{joueur}'
+        self.statistiques['appels'] += 1
+
+        entrée = self.cache.lire(partie)
+        if entrée is not None and entrée.get(nom) is not None:
+            self.statistiques['succès'] += 1
+            self.statistiques['durée_succès'] += time.perf_counter() - début
+            return entrée[nom]
+
+        coup = self.stratégie.choisir_coup(partie, joueur)
+        self.cache.écrire(partie, **{nom: coup})
+        self.statistiques['durée_échecs'] += time.perf_counter() - début
+        return coup
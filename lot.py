@@ -0,0 +1,503 @@
+"""
+Ce module contient LotQuoridor, qui fait avancer un grand nombre de parties de Quoridor au
+même pas à l'aide de tableaux NumPy.
+
+Les règles sont celles de la classe Quoridor: un coup accepté ou refusé sur un plateau du
+lot l'est aussi par déplacer_jeton ou placer_mur sur la partie correspondante.
+"""
+import numpy as np
+
+from quoridor import (
+    FORMAT_POSITION, INFINI, NB_CANDIDATS, NB_CASES, NB_CENTRES, NB_MURS, TAILLE, Quoridor,
+    QuoridorError, géométrie, test_players_numbers,
+)
+
+
+def _en_tableau(masques, largeur):
+    """Convertit une suite de masques de bits en un tableau booléen d'une ligne par masque."""
+    return np.array([[masque >> i & 1 for i in range(largeur)] for masque in masques], dtype=bool)
+
+
+# les tables du damier 9x9 de quoridor.py, sous forme de tableaux booléens
+_GÉO = géométrie(TAILLE)
+_COUPE_H = _en_tableau(_GÉO.coupures_h, NB_CASES)
+_COUPE_V = _en_tableau(_GÉO.coupures_v, NB_CASES)
+_CHEVAUCHE_H = _en_tableau(_GÉO.chevauchements_h, NB_CENTRES)
+_CHEVAUCHE_V = _en_tableau(_GÉO.chevauchements_v, NB_CENTRES)
+_OUVERT_HAUT, _OUVERT_DROITE = _en_tableau([_GÉO.plein_haut, _GÉO.plein_droite], NB_CASES)
+_DÉPARTS = _en_tableau(_GÉO.arrivées, NB_CASES)
+# arêtes coupées par chaque mur candidat, dans les deux masques puis dans le masque réuni
+_CANDIDATS_HAUT = np.concatenate([_COUPE_H, np.zeros_like(_COUPE_V)])
+_CANDIDATS_DROITE = np.concatenate([np.zeros_like(_COUPE_H), _COUPE_V])
+_CANDIDATS_ARÊTES = _en_tableau(_GÉO.candidats_par_arête, NB_CANDIDATS)
+
+# les quatre directions, dans l'ordre de _VOISINS: pour chaque case, la case voisine (-1 au
+# bord du damier) et l'indice de l'arête qui y mène dans le masque réuni des arêtes bloquées
+_X = np.arange(NB_CASES) % TAILLE + 1
+_Y = np.arange(NB_CASES) // TAILLE + 1
+_CASES = np.arange(NB_CASES)
+_VOISIN = np.array([
+    np.where(_Y < TAILLE, _CASES + TAILLE, -1),
+    np.where(_Y > 1, _CASES - TAILLE, -1),
+    np.where(_X < TAILLE, _CASES + 1, -1),
+    np.where(_X > 1, _CASES - 1, -1),
+])
+_ARÊTE = np.array([
+    _CASES,
+    np.maximum(_CASES - TAILLE, 0),
+    NB_CASES + _CASES,
+    np.maximum(NB_CASES + _CASES - 1, 0),
+])
+
+# représentation d'une position dans un tableau structuré, octet pour octet FORMAT_POSITION
+_TYPE_POSITION = np.dtype([
+    ('pions', 'u1', (2,)), ('murs', 'u1', (2,)), ('dernier', 'u1'),
+    ('murs_h', '<u8'), ('murs_v', '<u8'),
+])
+assert _TYPE_POSITION.itemsize == FORMAT_POSITION.size
+
+# nombre de plateaux inondés à la fois pour vérifier les murs
+_PAQUET = 4096
+
+
+class LotQuoridor:
+    """
+    Un lot de parties de Quoridor dont les coups sont joués en même temps.
+
+    L'état des parties est conservé dans des tableaux d'une ligne par plateau:
+    pions (les indices des cases des deux jetons), murs (le nombre de murs restant à chaque
+    joueur), murs_h et murs_v (les centres des murs posés) et dernier (le dernier joueur).
+    Les cases et les centres sont numérotés comme dans quoridor.py.
+    """
+
+    def __init__(self, nombre):
+        """
+        Initialiser un lot de parties à leur position de départ.
+
+        :param nombre: le nombre de plateaux.
+        """
+        self.pions = np.tile(np.array([_GÉO.cases_départ], dtype=np.int16),
+                             (nombre, 1))
+        self.murs = np.full((nombre, 2), NB_MURS // 2, dtype=np.int8)
+        self.murs_h = np.zeros((nombre, NB_CENTRES), dtype=bool)
+        self.murs_v = np.zeros((nombre, NB_CENTRES), dtype=bool)
+        self.dernier = np.full(nombre, 2, dtype=np.int8)
+        self.bloque_haut = np.zeros((nombre, NB_CASES), dtype=bool)
+        self.bloque_droite = np.zeros((nombre, NB_CASES), dtype=bool)
+
+    def __len__(self):
+        return len(self.pions)
+
+    @classmethod
+    def depuis_parties(cls, parties):
+        """
+        Créer un lot à partir de parties existantes (voir Quoridor.sérialiser).
+
+        :param parties: une séquence de parties de Quoridor, sur le damier 9x9.
+        :returns: un nouveau lot, un plateau par partie.
+        :raises QuoridorError: une partie n'est pas sur le damier 9x9.
+        """
+        if any(partie.taille != TAILLE for partie in parties):
+            raise QuoridorError(f"Batches only support the {TAILLE}x{TAILLE} board")
+        return cls.désérialiser(b''.join(partie.sérialiser() for partie in parties))
+
+    @classmethod
+    def désérialiser(cls, données):
+        """
+        Créer un lot à partir de positions sérialisées mises bout à bout.
+
+        :param données: des octets produits par Quoridor.sérialiser ou LotQuoridor.sérialiser.
+        :returns: un nouveau lot.
+        """
+        positions = np.frombuffer(données, dtype=_TYPE_POSITION)
+        lot = cls(len(positions))
+        lot.pions[:] = positions['pions']
+        lot.murs[:] = positions['murs']
+        lot.dernier[:] = positions['dernier']
+        lot.murs_h[:] = _vers_booléens(positions['murs_h'])
+        lot.murs_v[:] = _vers_booléens(positions['murs_v'])
+        lot.bloque_haut[:] = lot.murs_h @ _COUPE_H
+        lot.bloque_droite[:] = lot.murs_v @ _COUPE_V
+        return lot
+
+    def sérialiser(self, plateaux=slice(None)):
+        """
+        Produire les positions des plateaux mises bout à bout, dans le format de
+        Quoridor.sérialiser.
+
+        :param plateaux: les plateaux à sérialiser (une tranche ou un tableau d'indices); par
+        défaut, tous.
+        :returns: une chaîne de FORMAT_POSITION.size octets par plateau.
+        """
+        pions = self.pions[plateaux]
+        positions = np.empty(len(pions), dtype=_TYPE_POSITION)
+        positions['pions'] = pions
+        positions['murs'] = self.murs[plateaux]
+        positions['dernier'] = self.dernier[plateaux]
+        positions['murs_h'] = _vers_entiers(self.murs_h[plateaux])
+        positions['murs_v'] = _vers_entiers(self.murs_v[plateaux])
+        return positions.tobytes()
+
+    def partie(self, indice, noms=('1', '2')):
+        """
+        Produire la partie de Quoridor d'un plateau du lot.
+
+        :param indice: l'indice du plateau.
+        :param noms: le nom des deux joueurs.
+        :returns: une nouvelle partie de Quoridor.
+        """
+        return Quoridor.désérialiser(self.sérialiser([indice]), noms)
+
+    def gagnants(self):
+        """
+        Déterminer, pour chaque plateau, si la partie est terminée (voir partie_terminée).
+
+        :returns: un tableau du numéro du gagnant de chaque plateau, 0 si la partie continue.
+        """
+        return np.where(_Y[self.pions[:, 0]] == TAILLE, 1,
+                        np.where(_Y[self.pions[:, 1]] == 1, 2, 0)).astype(np.int8)
+
+    def _arêtes(self):
+        """Retourne le tableau réuni des arêtes bloquées de chaque plateau (voir _VOISINS)."""
+        return np.concatenate([self.bloque_haut, self.bloque_droite], axis=1)
+
+    def distances(self, joueur):
+        """
+        Calculer, pour chaque plateau, la carte des distances du joueur jusqu'à sa ligne
+        d'arrivée (voir Quoridor.carte_distances).
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: un tableau (len(self), NB_CASES) des distances, INFINI pour une case isolée.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        départ = np.broadcast_to(_DÉPARTS[joueur - 1], self.bloque_haut.shape)
+        return calculer_distances(départ, _OUVERT_HAUT & ~self.bloque_haut,
+                                  _OUVERT_DROITE & ~self.bloque_droite)
+
+    def destinations(self, joueur):
+        """
+        Énumérer, pour chaque plateau, les cases où le jeton du joueur peut se rendre, sauts
+        compris, selon les règles du graphe de construire_graphe.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: un tableau booléen (len(self), NB_CASES) des cases d'arrivée.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        plateaux = np.arange(len(self))
+        arêtes = self._arêtes()
+        moi = self.pions[:, joueur - 1]
+        lui = self.pions[:, 2 - joueur]
+        destinations = np.zeros((len(self), NB_CASES), dtype=bool)
+
+        def ouvert(cases, direction):
+            """Les plateaux où l'on peut quitter la case dans la direction."""
+            return (_VOISIN[direction, cases] >= 0) & ~arêtes[plateaux, _ARÊTE[direction, cases]]
+
+        for direction in range(4):
+            voisin = _VOISIN[direction, moi]
+            libre = ouvert(moi, direction)
+            simple = libre & (voisin != lui)
+            destinations[plateaux[simple], voisin[simple]] = True
+
+            # sauter par-dessus l'adversaire en ligne droite si possible, sinon en diagonale
+            sauteurs = libre & (voisin == lui)
+            droit = sauteurs & ouvert(lui, direction)
+            destinations[plateaux[droit], _VOISIN[direction, lui][droit]] = True
+            diagonal = sauteurs & ~droit
+            for autre in range(4):
+                case = _VOISIN[autre, lui]
+                possible = diagonal & ouvert(lui, autre) & (case != moi)
+                destinations[plateaux[possible], case[possible]] = True
+
+        return destinations
+
+    def _chemins_libres(self, plateaux, coupe_haut, coupe_droite):
+        """
+        Vérifie que chaque joueur peut encore atteindre sa ligne d'arrivée sur les plateaux
+        spécifiés, si l'on y bloquait en plus les arêtes données.
+
+        :param plateaux: les indices des plateaux, avec répétitions possibles.
+        :param coupe_haut: les arêtes vers le haut à bloquer, une ligne par plateau.
+        :param coupe_droite: les arêtes vers la droite à bloquer, une ligne par plateau.
+        :returns: un tableau booléen, une valeur par plateau.
+        """
+        libres = np.empty(len(plateaux), dtype=bool)
+        for début in range(0, len(plateaux), _PAQUET):
+            tranche = slice(début, début + _PAQUET)
+            indices = plateaux[tranche]
+            ouvert_haut = _OUVERT_HAUT & ~(self.bloque_haut[indices] | coupe_haut[tranche])
+            ouvert_droite = _OUVERT_DROITE & ~(self.bloque_droite[indices] | coupe_droite[tranche])
+
+            # les deux joueurs sont inondés dans deux moitiés du même tableau
+            nombre = len(indices)
+            départ = np.repeat(_DÉPARTS, nombre, axis=0)
+            atteint = inonder(départ, np.concatenate([ouvert_haut, ouvert_haut]),
+                              np.concatenate([ouvert_droite, ouvert_droite]))
+            rangs = np.arange(nombre)
+            libres[tranche] = (atteint[rangs, self.pions[indices, 0]]
+                               & atteint[nombre + rangs, self.pions[indices, 1]])
+        return libres
+
+    def _coupures_chemin(self, joueur):
+        """
+        Retourne, pour chaque plateau, les murs candidats qui coupent un plus court chemin du
+        joueur, le même chemin que suit Quoridor._coupures_chemin.
+        """
+        plateaux = np.arange(len(self))
+        arêtes = self._arêtes()
+        distances = self.distances(joueur)
+        case = self.pions[:, joueur - 1].astype(np.intp)
+        chemin = np.zeros_like(arêtes)
+
+        for _ in range(int(distances[plateaux, case][distances[plateaux, case] < INFINI].max(
+                initial=0))):
+            restants = (distances[plateaux, case] > 0) & (distances[plateaux, case] < INFINI)
+            for direction in range(4):
+                voisin = _VOISIN[direction, case]
+                arête = _ARÊTE[direction, case]
+                avance = (restants & (voisin >= 0) & ~arêtes[plateaux, arête]
+                          & (distances[plateaux, voisin] < distances[plateaux, case]))
+                chemin[plateaux[avance], arête[avance]] = True
+                case = np.where(avance, voisin, case)
+                restants &= ~avance
+
+        return chemin @ _CANDIDATS_ARÊTES
+
+    def murs_libres(self, joueur):
+        """
+        Énumérer, pour chaque plateau, les murs que le joueur peut poser sans chevaucher un mur
+        existant, sans vérifier les chemins.
+
+        :returns: un tableau booléen (len(self), NB_CANDIDATS), indexé comme les codes des
+        murs moins NB_CASES (voir encoder_coup).
+        """
+        occupés = self.murs_h | self.murs_v
+        libres_h = ~(occupés | self.murs_h @ _CHEVAUCHE_H)
+        libres_v = ~(occupés | self.murs_v @ _CHEVAUCHE_V)
+        libres = np.concatenate([libres_h, libres_v], axis=1)
+        return libres & (self.murs[:, joueur - 1] > 0)[:, None]
+
+    def coups_légaux(self, joueur):
+        """
+        Énumérer, pour chaque plateau, les coups légaux du joueur (voir Quoridor.coups_légaux).
+
+        Seuls les murs qui coupent un plus court chemin de l'un des joueurs sont vérifiés par
+        inondation, par paquets de plateaux.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: un tableau booléen (len(self), NB_CASES + NB_CANDIDATS), indexé par code.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        libres = self.murs_libres(joueur)
+        critiques = libres & (self._coupures_chemin(1) | self._coupures_chemin(2))
+        légaux = libres & ~critiques
+
+        plateaux, candidats = np.nonzero(critiques)
+        légaux[plateaux, candidats] = self._chemins_libres(
+            plateaux, _CANDIDATS_HAUT[candidats], _CANDIDATS_DROITE[candidats])
+
+        return np.concatenate([self.destinations(joueur), légaux], axis=1)
+
+    def déplacements_valides(self, joueur, positions):
+        """
+        Vérifier, pour chaque plateau, le déplacement du jeton selon les règles de
+        Quoridor.déplacer_jeton.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :param positions: un tableau (len(self), 2) des positions (x, y) d'arrivée.
+        :returns: un tableau booléen, True pour un déplacement accepté.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        positions = np.asarray(positions, dtype=np.intp).reshape(len(self), 2)
+        x, y = positions[:, 0], positions[:, 1]
+        plateaux = np.arange(len(self))
+        moi = self.pions[:, joueur - 1]
+        lui = self.pions[:, 2 - joueur]
+
+        sur_damier = (x >= 1) & (x <= TAILLE) & (y >= 1) & (y <= TAILLE)
+        case = np.where(sur_damier, (y - 1) * TAILLE + x - 1, 0)
+        mouvement_x, mouvement_y = x - _X[moi], y - _Y[moi]
+
+        # l'arête par laquelle le jeton entre dans sa case d'arrivée ne doit pas être bloquée
+        bloque = ((mouvement_y > 0) & self.bloque_haut[plateaux, np.maximum(case - TAILLE, 0)]
+                  | (mouvement_y < 0) & self.bloque_haut[plateaux, case]
+                  | (mouvement_x > 0) & self.bloque_droite[plateaux, np.maximum(case - 1, 0)]
+                  | (mouvement_x < 0) & self.bloque_droite[plateaux, case])
+
+        return (sur_damier & (case != lui) & (case != moi)
+                & (np.abs(mouvement_x) + np.abs(mouvement_y) <= 2) & ~bloque)
+
+    def murs_valides(self, joueur, coups):
+        """
+        Vérifier, pour chaque plateau, la pose d'un mur selon les règles de
+        Quoridor.placer_mur.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :param coups: un tableau des codes des murs, un par plateau (voir encoder_coup).
+        :returns: un tableau booléen, True pour un mur accepté.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        coups = np.asarray(coups, dtype=np.intp).reshape(len(self))
+        plateaux = np.arange(len(self))
+        candidats = coups - NB_CASES
+        valides = (candidats >= 0) & (candidats < NB_CANDIDATS)
+        candidats = np.where(valides, candidats, 0)
+        valides &= self.murs_libres(joueur)[plateaux, candidats]
+
+        à_vérifier = plateaux[valides]
+        valides[à_vérifier] = self._chemins_libres(
+            à_vérifier, _CANDIDATS_HAUT[candidats[à_vérifier]],
+            _CANDIDATS_DROITE[candidats[à_vérifier]])
+        return valides
+
+    def déplacer(self, joueur, positions, actifs=None):
+        """
+        Déplacer le jeton du joueur sur chaque plateau actif. Aucun déplacement n'est fait si
+        l'un d'eux est refusé (voir déplacements_valides).
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :param positions: un tableau (len(self), 2) des positions (x, y) d'arrivée.
+        :param actifs: un tableau booléen des plateaux où jouer; par défaut, tous.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        :raises QuoridorError: un déplacement est invalide.
+        """
+        positions = np.asarray(positions, dtype=np.intp).reshape(len(self), 2)
+        actifs = self._actifs(actifs)
+        _vérifier(self.déplacements_valides(joueur, positions), actifs)
+        cases = (positions[:, 1] - 1) * TAILLE + positions[:, 0] - 1
+        self.pions[actifs, joueur - 1] = cases[actifs]
+        self.dernier[actifs] = joueur
+
+    def placer_murs(self, joueur, coups, actifs=None):
+        """
+        Placer un mur du joueur sur chaque plateau actif. Aucun mur n'est posé si l'un d'eux
+        est refusé (voir murs_valides).
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :param coups: un tableau des codes des murs, un par plateau (voir encoder_coup).
+        :param actifs: un tableau booléen des plateaux où jouer; par défaut, tous.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        :raises QuoridorError: un mur est invalide.
+        """
+        coups = np.asarray(coups, dtype=np.intp).reshape(len(self))
+        actifs = self._actifs(actifs)
+        _vérifier(self.murs_valides(joueur, coups), actifs)
+        self._poser_murs(joueur, np.nonzero(actifs)[0], coups[actifs] - NB_CASES)
+
+    def jouer(self, joueur, coups, actifs=None):
+        """
+        Jouer un coup du joueur sur chaque plateau actif: un déplacement ou un mur selon son
+        code (voir encoder_coup), vérifié comme par déplacer_jeton ou placer_mur. Aucun coup
+        n'est joué si l'un d'eux est refusé.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :param coups: un tableau des codes des coups, un par plateau.
+        :param actifs: un tableau booléen des plateaux où jouer; par défaut, tous.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        :raises QuoridorError: un coup est invalide.
+        """
+        coups = np.asarray(coups, dtype=np.intp).reshape(len(self))
+        actifs = self._actifs(actifs)
+        déplacements = actifs & (coups < NB_CASES)
+        murs = actifs & ~déplacements
+
+        cases = np.clip(coups, 0, NB_CASES - 1)
+        positions = np.stack([_X[cases], _Y[cases]], axis=1)
+        valides = np.where(coups < NB_CASES, self.déplacements_valides(joueur, positions),
+                           self.murs_valides(joueur, coups))
+        _vérifier(valides, actifs)
+
+        self.pions[déplacements, joueur - 1] = coups[déplacements]
+        self._poser_murs(joueur, np.nonzero(murs)[0], coups[murs] - NB_CASES)
+        self.dernier[actifs] = joueur
+
+    def _poser_murs(self, joueur, plateaux, candidats):
+        """Pose sans vérification un mur candidat sur chacun des plateaux spécifiés."""
+        horizontaux = candidats < NB_CENTRES
+        centres = candidats % NB_CENTRES
+        self.murs_h[plateaux[horizontaux], centres[horizontaux]] = True
+        self.murs_v[plateaux[~horizontaux], centres[~horizontaux]] = True
+        self.bloque_haut[plateaux] |= _CANDIDATS_HAUT[candidats]
+        self.bloque_droite[plateaux] |= _CANDIDATS_DROITE[candidats]
+        self.murs[plateaux, joueur - 1] -= 1
+        self.dernier[plateaux] = joueur
+
+    def _actifs(self, actifs):
+        """Retourne le tableau booléen des plateaux actifs."""
+        if actifs is None:
+            return np.ones(len(self), dtype=bool)
+        return np.asarray(actifs, dtype=bool).reshape(len(self))
+
+
+def _vérifier(valides, actifs):
+    """Lève une erreur si un coup d'un plateau actif est refusé."""
+    refusés = np.nonzero(actifs & ~valides)[0]
+    if len(refusés):
+        raise QuoridorError(f"Invalid move on board(s) {refusés[:10].tolist()}")
+
+
+def _vers_booléens(masques):
+    """Convertit des masques de 64 bits en un tableau booléen (len(masques), 64)."""
+    octets = np.ascontiguousarray(masques, dtype='<u8').view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(octets, axis=1, bitorder='little').astype(bool)
+
+
+def _vers_entiers(booléens):
+    """Opération inverse de _vers_booléens."""
+    return np.packbits(booléens, axis=1, bitorder='little').view('<u8').reshape(-1)
+
+
+def _étendre(atteint, ouvert_haut, ouvert_droite):
+    """Retourne les cases voisines des cases atteintes par une arête ouverte."""
+    voisines = np.zeros_like(atteint)
+    voisines[:, TAILLE:] |= atteint[:, :-TAILLE] & ouvert_haut[:, :-TAILLE]
+    voisines[:, :-TAILLE] |= atteint[:, TAILLE:] & ouvert_haut[:, :-TAILLE]
+    voisines[:, 1:] |= atteint[:, :-1] & ouvert_droite[:, :-1]
+    voisines[:, :-1] |= atteint[:, 1:] & ouvert_droite[:, :-1]
+    return voisines
+
+
+def calculer_distances(départ, ouvert_haut, ouvert_droite):
+    """
+    Calcule par un parcours en largeur simultané la distance de chaque case aux cases de
+    départ, sur chaque plateau.
+
+    :param départ: un tableau booléen (plateaux, NB_CASES) des cases de départ.
+    :param ouvert_haut: les arêtes ouvertes entre chaque case et celle du dessus.
+    :param ouvert_droite: les arêtes ouvertes entre chaque case et celle de droite.
+    :returns: un tableau (plateaux, NB_CASES) des distances, INFINI pour une case isolée.
+    """
+    distances = np.where(départ, 0, INFINI).astype(np.int16)
+    atteint = départ.copy()
+    front = atteint
+
+    for distance in range(1, NB_CASES):
+        front = _étendre(front, ouvert_haut, ouvert_droite) & ~atteint
+        if not front.any():
+            break
+        distances[front] = distance
+        atteint |= front
+
+    return distances
+
+
+def inonder(départ, ouvert_haut, ouvert_droite):
+    """
+    Étend, sur chaque plateau, l'ensemble des cases de départ à toutes les cases qu'on peut
+    en atteindre.
+
+    :returns: un tableau booléen (plateaux, NB_CASES) des cases atteintes.
+    """
+    atteint = départ.copy()
+    front = atteint
+
+    while front.any():
+        front = _étendre(front, ouvert_haut, ouvert_droite) & ~atteint
+        atteint |= front
+
+    return atteint
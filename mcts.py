@@ -0,0 +1,257 @@
+"""Ce module contient la recherche Monte Carlo parallèle utilisée par Quoridor.jouer_coup"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import random
+import time
+
+from quoridor import TAILLE, Quoridor, QuoridorError, encoder_coup, other_player
+
+
+class RechercheMCTS:
+    """
+    Stratégie pour Quoridor.jouer_coup: recherche arborescente Monte Carlo (UCT) parallélisée
+    à la racine. Chaque processus construit son propre arbre à partir de la position reçue
+    sous forme binaire (voir Quoridor.sérialiser), puis le nombre de visites de chaque coup
+    de la racine est additionné sur tous les processus.
+
+    Les processus sont créés au premier coup puis réutilisés; fermer() les arrête. Avec un
+    seul processus, la recherche se fait dans le processus courant.
+    """
+
+    def __init__(self, temps=1.0, itérations=None, processus=None, exploration=1.4,
+                 profondeur_simulation=8, graine=None):
+        """
+        :param temps: le budget de temps en secondes par coup, ou None pour aucune limite.
+        :param itérations: le nombre total d'itérations par coup, ou None pour aucune limite.
+        :param processus: le nombre de processus; par défaut, le nombre de coeurs.
+        :param exploration: la constante d'exploration de la formule UCT.
+        :param profondeur_simulation: le nombre de demi-coups aléatoires d'une simulation.
+        :param graine: la graine des générateurs aléatoires, pour des recherches reproductibles.
+        """
+        if temps is None and itérations is None:
+            raise QuoridorError("The search needs a time or iteration budget")
+
+        self.temps = temps
+        self.itérations = itérations
+        self.processus = processus or os.cpu_count() or 1
+        self.exploration = exploration
+        self.profondeur_simulation = profondeur_simulation
+        self.graine = graine
+        self.statistiques = {}
+        self._exécuteur = None
+        self._coups_joués = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        """Arrêter les processus de la recherche."""
+        if self._exécuteur is not None:
+            self._exécuteur.shutdown()
+            self._exécuteur = None
+
+    def choisir_coup(self, partie, joueur):
+        """
+        Choisir le coup de la racine le plus visité par l'ensemble des processus, puis, à
+        égalité, celui dont les simulations ont donné les meilleurs résultats.
+
+        :param partie: la partie de Quoridor; elle n'est pas modifiée.
+        :param joueur: le numéro du joueur (1 ou 2).
+        :returns: le code du coup choisi (voir quoridor.encoder_coup).
+        """
+        début = time.perf_counter()
+        données = partie.sérialiser()
+        itérations = None
+        if self.itérations is not None:
+            itérations = -(-self.itérations // self.processus)
+
+        self._coups_joués += 1
+        graines = [None if self.graine is None
+                   else hash((self.graine, self._coups_joués, i)) for i in range(self.processus)]
+        tâches = [(données, joueur, self.temps, itérations, self.exploration,
+                   self.profondeur_simulation, graine, partie.taille) for graine in graines]
+
+        if self.processus == 1:
+            résultats = [explorer(*tâches[0])]
+        else:
+            if self._exécuteur is None:
+                self._exécuteur = ProcessPoolExecutor(self.processus)
+            résultats = list(self._exécuteur.map(explorer, *zip(*tâches)))
+
+        visites, gains = Counter(), Counter()
+        total = 0
+        for statistiques_processus, itérations_processus in résultats:
+            for coup, (visites_coup, gains_coup) in statistiques_processus.items():
+                visites[coup] += visites_coup
+                gains[coup] += gains_coup
+            total += itérations_processus
+
+        durée = time.perf_counter() - début
+        self.statistiques = {
+            'itérations': total,
+            'durée': durée,
+            'itérations_par_seconde': total / durée if durée > 0 else 0.0,
+            'processus': self.processus,
+            'visites': dict(visites),
+        }
+
+        if not visites:
+            raise QuoridorError(f"Player {joueur} has no legal move")
+        return max(visites, key=lambda coup: (visites[coup], gains[coup] / visites[coup], -coup))
+
+
+class _Noeud:
+    """Noeud de l'arbre de recherche: le coup qui y mène et les statistiques de ses visites"""
+
+    __slots__ = ('coup', 'joueur', 'parent', 'enfants', 'à_essayer', 'visites', 'gains')
+
+    def __init__(self, coup, joueur, parent, à_essayer):
+        """
+        :param coup: le code du coup qui mène à ce noeud (None pour la racine).
+        :param joueur: le joueur qui a joué ce coup.
+        :param parent: le noeud parent.
+        :param à_essayer: les coups de ce noeud qui n'ont pas encore de noeud enfant.
+        """
+        self.coup = coup
+        self.joueur = joueur
+        self.parent = parent
+        self.enfants = []
+        self.à_essayer = à_essayer
+        self.visites = 0
+        self.gains = 0.0
+
+    def sélectionner(self, exploration):
+        """Retourne l'enfant qui maximise la borne UCT."""
+        logarithme = math.log(self.visites)
+        return max(self.enfants, key=lambda enfant: (
+            enfant.gains / enfant.visites
+            + exploration * math.sqrt(logarithme / enfant.visites)))
+
+
+def coups_candidats(partie, joueur):
+    """
+    Énumère les coups considérés par la recherche: tous les déplacements du jeton et les murs
+    légaux qui coupent le plus court chemin de l'adversaire.
+
+    :param partie: la partie de Quoridor.
+    :param joueur: le numéro du joueur (1 ou 2).
+    :returns: la liste des codes des coups.
+    """
+    utiles = set(partie.murs_sur_chemin(other_player(joueur)))
+    nb_cases = partie.géométrie.nb_cases
+    return [coup for coup in partie.coups_légaux(joueur) if coup < nb_cases or coup in utiles]
+
+
+def explorer(données, joueur, temps, itérations, exploration, profondeur_simulation, graine,
+             taille=TAILLE):
+    """
+    Construit un arbre UCT à partir d'une position sérialisée. Cette fonction est exécutée
+    dans les processus de RechercheMCTS.
+
+    :returns: le tuple (visites et gains de chaque coup de la racine, nombre d'itérations).
+    """
+    partie = Quoridor.désérialiser(données, taille=taille)
+    hasard = random.Random(graine)
+    échéance = None if temps is None else time.perf_counter() + temps
+    racine = _Noeud(None, other_player(joueur), None, coups_candidats(partie, joueur))
+    hasard.shuffle(racine.à_essayer)
+    nombre = 0
+
+    while (itérations is None or nombre < itérations) and (
+            échéance is None or time.perf_counter() < échéance):
+        noeud = racine
+        joués = 0
+
+        # sélection
+        while not noeud.à_essayer and noeud.enfants:
+            noeud = noeud.sélectionner(exploration)
+            partie.jouer(noeud.coup, noeud.joueur)
+            joués += 1
+
+        # expansion, sauf si la partie est terminée
+        if noeud.à_essayer and partie.distance(noeud.joueur) != 0:
+            coup = noeud.à_essayer.pop()
+            suivant = other_player(noeud.joueur)
+            partie.jouer(coup, suivant)
+            joués += 1
+            enfant = _Noeud(coup, suivant, noeud, [])
+            if partie.distance(suivant) != 0:
+                enfant.à_essayer = coups_candidats(partie, other_player(suivant))
+                hasard.shuffle(enfant.à_essayer)
+            noeud.enfants.append(enfant)
+            noeud = enfant
+
+        # simulation, puis remontée du résultat
+        résultat = simuler(partie, noeud.joueur, profondeur_simulation, hasard)
+        for _ in range(joués):
+            partie.annuler()
+
+        while noeud is not None:
+            noeud.visites += 1
+            noeud.gains += résultat
+            résultat = 1.0 - résultat
+            noeud = noeud.parent
+
+        nombre += 1
+
+    return {enfant.coup: (enfant.visites, enfant.gains) for enfant in racine.enfants}, nombre
+
+
+def simuler(partie, joueur, profondeur, hasard):
+    """
+    Joue quelques demi-coups où chaque joueur avance sur son plus court chemin ou, parfois,
+    pose au hasard un mur qui coupe celui de l'adversaire, puis estime l'issue de la course
+    où chacun suit son plus court chemin. La partie est remise dans son état initial au
+    retour.
+
+    :param partie: la partie de Quoridor.
+    :param joueur: le joueur qui vient de jouer.
+    :param profondeur: le nombre maximal de demi-coups joués au hasard.
+    :param hasard: le générateur aléatoire.
+    :returns: le résultat pour le joueur, entre 0 (défaite) et 1 (victoire).
+    """
+    joués = 0
+    try:
+        for _ in range(profondeur):
+            if partie.distance(joueur) == 0:
+                break
+
+            # au tour de l'adversaire
+            joueur = other_player(joueur)
+            murs = None
+            if partie.etat['joueurs'][joueur - 1]['murs'] and hasard.random() < 0.3:
+                utiles = set(partie.murs_sur_chemin(other_player(joueur)))
+                murs = [coup for coup in partie.coups_légaux(joueur) if coup in utiles]
+            if murs:
+                partie.jouer(hasard.choice(murs), joueur)
+            else:
+                partie.jouer(encoder_coup('D', partie.next_step(joueur), partie.taille), joueur)
+            joués += 1
+
+        résultat = estimer_course(partie.distance(joueur), partie.distance(other_player(joueur)))
+        return résultat if joués % 2 == 0 else 1.0 - résultat
+    finally:
+        for _ in range(joués):
+            partie.annuler()
+
+
+def estimer_course(distance, distance_adversaire):
+    """
+    Estimer les chances de victoire du joueur qui vient de jouer d'après les longueurs des
+    plus courts chemins, l'adversaire ayant le trait. C'est l'évaluation des feuilles des
+    simulations de RechercheMCTS.
+
+    :param distance: la longueur du plus court chemin du joueur qui vient de jouer.
+    :param distance_adversaire: la longueur du plus court chemin de l'adversaire.
+    :returns: la probabilité de victoire estimée, entre 0 et 1.
+    """
+    if distance == 0:
+        return 1.0
+    if distance_adversaire == 0:
+        return 0.0
+    return 0.5 + 0.5 * math.tanh((distance_adversaire - distance - 0.5) / 3)
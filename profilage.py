@@ -0,0 +1,175 @@
+"""
+Ce module contient l'instrumentation facultative de quoridor.py: le nombre d'appels et la
+durée cumulée de chaque opération de Quoridor et des fonctions du module, ainsi que des
+compteurs propres à certaines opérations (noeuds du graphe, arêtes retirées, cases visitées
+par les parcours).
+
+Désactivée, l'instrumentation ne coûte rien: les méthodes et les fonctions d'origine sont
+en place. activer() les remplace par des enveloppes qui mesurent chaque appel, et
+désactiver() les remet. Les durées sont inclusives: celle de jouer_coup comprend celle
+des opérations qu'il appelle.
+
+Seuls les appels qui passent par la classe Quoridor ou par les globales de quoridor.py sont
+comptés; une fonction importée ailleurs avec from quoridor import ... avant activer() garde
+sa version d'origine.
+"""
+from contextlib import contextmanager
+import functools
+import time
+
+import quoridor
+from quoridor import Quoridor
+
+MÉTHODES = (
+    '__init__', '__str__', 'graphe', 'coups_légaux', 'murs_sur_chemin', 'next_step', 'jouer',
+    'annuler', 'jouer_coup', 'déplacer_jeton', 'placer_mur', 'partie_terminée',
+    '_chemins_libres',
+)
+FONCTIONS = (
+    'construire_graphe', 'construire_damier', 'retirer_arcs_mur', 'ajouter_liens_sauteurs',
+    'retirer_liens_sauteurs', 'calculer_distances', 'mettre_à_jour_distances', 'inonder',
+)
+
+# les versions d'origine des méthodes et des fonctions enveloppées, vide si inactif
+_ORIGINAUX = {}
+# les compteurs de chaque opération
+_COMPTEURS = {}
+# le nombre total d'arcs retirés des graphes, pour l'attribuer à construire_graphe
+_ARCS_RETIRÉS = [0]
+
+
+def _compter_retrait(compteur, arguments, résultat):
+    """retirer_arcs_mur retire toujours les quatre arcs qui croisent le mur."""
+    compteur['arêtes_retirées'] = compteur.get('arêtes_retirées', 0) + 4
+    _ARCS_RETIRÉS[0] += 4
+
+
+def _compter_sauts(compteur, arguments, résultat):
+    """ajouter_liens_sauteurs retire les deux arcs entre les joueurs adjacents."""
+    if résultat is not None:
+        compteur['arêtes_retirées'] = compteur.get('arêtes_retirées', 0) + 2
+        compteur['sauts'] = compteur.get('sauts', 0) + len(résultat)
+        _ARCS_RETIRÉS[0] += 2
+
+
+def _compter_graphe(compteur, arguments, résultat):
+    compteur['noeuds'] = compteur.get('noeuds', 0) + résultat.number_of_nodes()
+
+
+def _compter_parcours(compteur, arguments, résultat):
+    """
+    Les cases atteintes par le parcours en largeur sont celles qu'il a développées; les autres
+    sont à une distance égale au nombre de cases.
+    """
+    compteur['noeuds'] = (compteur.get('noeuds', 0)
+                          + sum(1 for d in résultat if d < len(résultat)))
+
+
+def _compter_mise_à_jour(compteur, arguments, résultat):
+    compteur['noeuds'] = compteur.get('noeuds', 0) + len(résultat)
+
+
+_COMPTAGES = {
+    'retirer_arcs_mur': _compter_retrait,
+    'ajouter_liens_sauteurs': _compter_sauts,
+    'construire_graphe': _compter_graphe,
+    'construire_damier': _compter_graphe,
+    'calculer_distances': _compter_parcours,
+    'mettre_à_jour_distances': _compter_mise_à_jour,
+}
+# opérations auxquelles on attribue les arcs retirés pendant leur appel
+_RETRAITS_INCLUS = ('construire_graphe', 'construire_damier')
+
+
+def _envelopper(nom, fonction):
+    """Retourne une version de la fonction qui met à jour les compteurs de l'opération."""
+    comptage = _COMPTAGES.get(nom)
+    retraits = nom in _RETRAITS_INCLUS
+
+    @functools.wraps(fonction)
+    def enveloppe(*arguments, **options):
+        compteur = _COMPTEURS.setdefault(nom, {'appels': 0, 'durée': 0.0})
+        avant = _ARCS_RETIRÉS[0]
+        début = time.perf_counter()
+        try:
+            résultat = fonction(*arguments, **options)
+        finally:
+            compteur['durée'] += time.perf_counter() - début
+            compteur['appels'] += 1
+
+        if comptage is not None:
+            comptage(compteur, arguments, résultat)
+        if retraits:
+            compteur['arêtes_retirées'] = (compteur.get('arêtes_retirées', 0)
+                                           + _ARCS_RETIRÉS[0] - avant)
+        return résultat
+
+    return enveloppe
+
+
+def actif():
+    """
+    :returns: True si l'instrumentation est active.
+    """
+    return bool(_ORIGINAUX)
+
+
+def activer():
+    """Remplacer les méthodes et les fonctions mesurées par leurs enveloppes."""
+    if actif():
+        return
+
+    for nom in MÉTHODES:
+        _ORIGINAUX[('méthode', nom)] = Quoridor.__dict__[nom]
+        setattr(Quoridor, nom, _envelopper(f'Quoridor.{nom}', Quoridor.__dict__[nom]))
+
+    for nom in FONCTIONS:
+        _ORIGINAUX[('fonction', nom)] = getattr(quoridor, nom)
+        setattr(quoridor, nom, _envelopper(nom, getattr(quoridor, nom)))
+
+
+def désactiver():
+    """Remettre en place les méthodes et les fonctions d'origine."""
+    for (genre, nom), original in _ORIGINAUX.items():
+        setattr(Quoridor if genre == 'méthode' else quoridor, nom, original)
+    _ORIGINAUX.clear()
+
+
+def réinitialiser():
+    """Remettre tous les compteurs à zéro."""
+    _COMPTEURS.clear()
+
+
+def stats():
+    """
+    Produire un instantané des compteurs.
+
+    :returns: un dictionnaire {opération: {'appels': n, 'durée': secondes, ...}}, les
+    méthodes de Quoridor étant préfixées par 'Quoridor.'. Une opération qui n'a pas été
+    appelée n'y figure pas.
+    """
+    return {nom: dict(compteur) for nom, compteur in _COMPTEURS.items()}
+
+
+@contextmanager
+def profiler():
+    """
+    Mesurer un bloc de code: les compteurs sont remis à zéro et l'instrumentation est active
+    pendant le bloc, puis remise dans son état précédent.
+
+    Utilisation:
+
+        with profiler():
+            partie.jouer_coup(1)
+        print(stats())
+
+    :returns: la fonction stats, pour lire les compteurs pendant ou après le bloc.
+    """
+    déjà_actif = actif()
+    réinitialiser()
+    activer()
+    try:
+        yield stats
+    finally:
+        if not déjà_actif:
+            désactiver()
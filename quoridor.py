@@ -1,6 +1,8 @@
 """Ce module contient la classe et les fonctions nécéssaireau fonctionnement de Quoridor"""
 from collections.abc import Iterable
-import networkx as nx
+import heapq
+import random
+import struct
 
 
 class QuoridorError(Exception):
@@ -8,10 +10,409 @@ class QuoridorError(Exception):
     pass
 
 
+# Représentation interne du damier. Les cases sont numérotées à partir du coin inférieur
+# gauche, ligne par ligne: sur un damier de N x N cases, la case (x, y) porte l'indice
+# (y - 1) * N + x - 1. Un mur est repéré par son centre, le coin commun à quatre cases,
+# numéroté de la même façon sur la grille (N - 1) x (N - 1) des coins intérieurs. Les murs et
+# les arêtes bloquées sont conservés dans des entiers utilisés comme masques de bits, ce qui
+# rend chaque vérification constante. Les tables qui en dépendent sont calculées une fois par
+# taille de damier (voir Géométrie); les constantes du module sont celles du damier 9x9.
+TAILLE = 9
+# nombre total de murs des deux joueurs, par défaut
+NB_MURS = 20
+# clé de la liste de l'état de la partie qui reçoit les murs de chaque orientation
+ORIENTATIONS = {'horizontal': 'horizontaux', 'vertical': 'verticaux'}
+# graine des clés de Zobrist, fixe pour que les empreintes soient les mêmes d'un processus
+# à l'autre
+_GRAINE_ZOBRIST = 0x9E3779B97F4A7C15
+
+
+class Géométrie:
+    """
+    Les tables précalculées d'un damier de taille donnée, partagées par toutes les parties
+    de cette taille. S'obtient par géométrie(taille).
+    """
+
+    __slots__ = (
+        'taille', 'nb_cases', 'nb_centres', 'nb_candidats', 'infini', 'coupures_h', 'coupures_v',
+        'paires_h', 'paires_v', 'chevauchements_h', 'chevauchements_v', 'voisins', 'coordonnées',
+        'objectifs', 'cases_départ', 'tranche', 'tous_centres', 'première_colonne',
+        'dernière_colonne', 'plein_haut', 'plein_droite', 'arrivées', 'repli_joueurs',
+        'départ_joueurs', 'coupures_candidats', 'candidats_par_arête', '_replis', 'zobrist_pions',
+        'zobrist_murs', 'zobrist_restants', 'zobrist_trait', 'format_position', 'octets_masque',
+        'décalages_position', 'masques_position',
+        'largeur_ligne', 'marge', 'gabarit', 'en_tête', 'pied',
+    )
+
+    def __init__(self, taille):
+        """
+        :param taille: le nombre de cases de chaque côté du damier.
+        """
+        self.taille = taille
+        case, centre = self.case, self.centre
+
+        # pour chaque centre de mur, les arêtes coupées par un mur horizontal (dans le masque
+        # des déplacements vers le haut) ou vertical (dans le masque des déplacements vers la
+        # droite), les paires de cases que ces arêtes reliaient, et les centres voisins où un
+        # mur de même orientation chevaucherait celui-ci
+        self.coupures_h, self.coupures_v, self.paires_h, self.paires_v = [], [], [], []
+        self.chevauchements_h, self.chevauchements_v = [], []
+        for cy in range(1, taille):
+            for cx in range(1, taille):
+                self.coupures_h.append(1 << case(cx, cy) | 1 << case(cx + 1, cy))
+                self.coupures_v.append(1 << case(cx, cy) | 1 << case(cx, cy + 1))
+                self.paires_h.append(((case(cx, cy), case(cx, cy + 1)),
+                                      (case(cx + 1, cy), case(cx + 1, cy + 1))))
+                self.paires_v.append(((case(cx, cy), case(cx + 1, cy)),
+                                      (case(cx, cy + 1), case(cx + 1, cy + 1))))
+                self.chevauchements_h.append(
+                    (1 << centre(cx - 1, cy) if cx > 1 else 0)
+                    | (1 << centre(cx + 1, cy) if cx < taille - 1 else 0))
+                self.chevauchements_v.append(
+                    (1 << centre(cx, cy - 1) if cy > 1 else 0)
+                    | (1 << centre(cx, cy + 1) if cy < taille - 1 else 0))
+
+        # Pour les parcours, les deux masques d'arêtes bloquées sont réunis en un seul entier:
+        # le bit c pour l'arête entre c et la case du dessus, le bit nb_cases + c pour l'arête
+        # entre c et la case de droite. voisins donne, pour chaque case, ses voisines et
+        # l'arête qui les relie.
+        nb_cases = self.nb_cases = taille * taille
+        self.infini = nb_cases
+        self.voisins = tuple(
+            tuple(
+                (voisin, arête) for condition, voisin, arête in (
+                    (y < taille, c + taille, c),
+                    (y > 1, c - taille, c - taille),
+                    (x < taille, c + 1, nb_cases + c),
+                    (x > 1, c - 1, nb_cases + c - 1),
+                ) if condition
+            )
+            for y in range(1, taille + 1) for x in range(1, taille + 1) for c in [case(x, y)]
+        )
+        self.coordonnées = tuple((x, y) for y in range(1, taille + 1)
+                                 for x in range(1, taille + 1))
+        # les cases de la ligne d'arrivée de chaque joueur
+        self.objectifs = (
+            tuple(case(x, taille) for x in range(1, taille + 1)),
+            tuple(case(x, 1) for x in range(1, taille + 1)),
+        )
+        # les cases de départ des jetons, au milieu de la première et de la dernière ligne
+        self.cases_départ = (case((taille + 1) // 2, 1), case((taille + 1) // 2, taille))
+
+        # Vérification groupée des chemins: les murs candidats sont numérotés de 0 à
+        # nb_candidats - 1, les centres horizontaux puis les centres verticaux. Chaque candidat
+        # à vérifier reçoit une tranche de bits d'un grand entier, où l'on inonde le plateau
+        # comme si ce mur était posé. Les tranches ne débordent pas les unes sur les autres,
+        # car les arêtes de la dernière ligne et de la dernière colonne sont toujours fermées,
+        # et elles occupent un nombre entier d'octets pour être lues dans to_bytes().
+        self.nb_centres = (taille - 1) ** 2
+        self.nb_candidats = 2 * self.nb_centres
+        self.tranche = -(-nb_cases // 8) * 8
+        self.tous_centres = (1 << self.nb_centres) - 1
+        self.première_colonne = sum(1 << centre(1, y) for y in range(1, taille))
+        self.dernière_colonne = sum(1 << centre(taille - 1, y) for y in range(1, taille))
+        self.plein_haut = sum(1 << case(x, y) for x in range(1, taille + 1)
+                              for y in range(1, taille))
+        self.plein_droite = sum(1 << case(x, y) for x in range(1, taille)
+                                for y in range(1, taille + 1))
+        self.arrivées = tuple(sum(1 << c for c in objectifs) for objectifs in self.objectifs)
+        # une tranche par joueur pour vérifier un seul plateau, celle du joueur 2 en second
+        self.repli_joueurs = 1 | 1 << nb_cases
+        self.départ_joueurs = self.arrivées[0] | self.arrivées[1] << nb_cases
+        # pour chaque candidat, les arêtes qu'il coupe, et pour chaque arête, les candidats
+        # qui la coupent
+        self.coupures_candidats = ([(m, 0) for m in self.coupures_h]
+                                   + [(0, m) for m in self.coupures_v])
+        self.candidats_par_arête = [0] * (2 * nb_cases)
+        for i, (haut, droite) in enumerate(self.coupures_candidats):
+            arêtes = haut | droite << nb_cases
+            while arêtes:
+                bit = arêtes & -arêtes
+                self.candidats_par_arête[bit.bit_length() - 1] |= 1 << i
+                arêtes ^= bit
+        self._replis = {}
+
+        # Clés de Zobrist: l'empreinte d'une position est le ou exclusif des clés de la case de
+        # chaque jeton, de chaque mur posé, du nombre de murs restant à chaque joueur et, si
+        # c'est au joueur 2 de jouer, de la clé du trait.
+        hasard = random.Random(_GRAINE_ZOBRIST * taille)
+        self.zobrist_pions = tuple(tuple(hasard.getrandbits(64) for _ in range(nb_cases))
+                                   for _ in range(2))
+        self.zobrist_murs = tuple(hasard.getrandbits(64) for _ in range(self.nb_candidats))
+        self.zobrist_restants = tuple(
+            tuple(hasard.getrandbits(64) for _ in range(self.nb_centres + 1)) for _ in range(2))
+        self.zobrist_trait = hasard.getrandbits(64)
+
+        # représentation binaire d'une position (voir Quoridor.sérialiser): les masques des
+        # murs sont des entiers de 64 bits s'ils y tiennent, des octets sinon
+        pion = 'B' if nb_cases <= 256 else 'H'
+        restants = 'B' if self.nb_centres < 256 else 'H'
+        self.octets_masque = 0 if self.nb_centres <= 64 else -(-self.nb_centres // 8)
+        masques = '2Q' if not self.octets_masque else f'{self.octets_masque}s' * 2
+        self.format_position = struct.Struct(f'<{pion}{pion}{restants}{restants}B{masques}')
+
+        # champs d'une Position, tous dans un même entier: les masques des murs horizontaux
+        # et verticaux, soit un bit par candidat, puis la case de chaque jeton, le nombre de
+        # murs restant à chaque joueur et le dernier joueur moins 1
+        largeurs = (2 * [(nb_cases - 1).bit_length()] + 2 * [self.nb_centres.bit_length()]
+                    + [1])
+        décalages = [self.nb_candidats]
+        for largeur in largeurs[:-1]:
+            décalages.append(décalages[-1] + largeur)
+        self.décalages_position = tuple(décalages)
+        self.masques_position = tuple((1 << largeur) - 1 for largeur in largeurs)
+
+        # Représentation en art ascii (voir Quoridor.__str__): le damier est peint dans une
+        # copie du gabarit, 2 * taille - 1 lignes de largeur_ligne caractères, fin de ligne
+        # comprise, de la ligne du haut à la ligne 1 en bas, séparées par les lignes où
+        # passent les murs horizontaux. La marge est la largeur des numéros de ligne.
+        self.marge = marge = len(str(taille))
+        self.largeur_ligne = marge + 4 * taille + 3
+        self.gabarit = (" " * (marge + 1) + "|" + " " * (4 * taille - 1) + "|\n").join(
+            f"{y:>{marge}} |" + " .  " * (taille - 1) + " . |\n"
+            for y in range(taille, 0, -1)).encode('ascii')
+        self.en_tête = ("Légende: 1={}, 2={}\n"
+                        + " " * (marge + 2) + "-" * (4 * taille - 1) + "\n")
+        self.pied = ("-" * (marge + 1) + "|" + "-" * (4 * taille - 1) + "\n"
+                     + " " * (marge + 1) + "|"
+                     + "".join(f" {x:<3}" for x in range(1, taille + 1)).rstrip())
+
+    def case(self, x, y):
+        """Retourne l'indice de la case (x, y) dans les masques de bits."""
+        return (y - 1) * self.taille + x - 1
+
+    def centre(self, x, y):
+        """Retourne l'indice du coin supérieur droit de la case (x, y)."""
+        return (y - 1) * (self.taille - 1) + x - 1
+
+    def repli(self, nombre):
+        """Retourne le masque qui recopie un plateau dans chacune de nombre tranches."""
+        repli = self._replis.get(nombre)
+        if repli is None:
+            repli = self._replis[nombre] = (((1 << self.tranche * nombre) - 1)
+                                            // ((1 << self.tranche) - 1))
+        return repli
+
+    # les tables sont partagées par toutes les parties de la même taille: une copie ou un
+    # dépicklage reprend la géométrie en cache plutôt que de la dupliquer
+    def __reduce__(self):
+        return géométrie, (self.taille,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, mémo):
+        return self
+
+
+# les géométries déjà calculées, par taille
+_GÉOMÉTRIES = {}
+
+
+def géométrie(taille=TAILLE):
+    """
+    Produire les tables d'un damier, calculées une seule fois par taille.
+
+    :param taille: le nombre de cases de chaque côté du damier, au moins 3.
+    :returns: la Géométrie du damier.
+    :raises QuoridorError: la taille est invalide.
+    """
+    # le type est vérifié avant le cache, où 9.0 retrouverait la géométrie de 9
+    if not isinstance(taille, int) or taille < 3:
+        raise QuoridorError(f"Board size {taille!r} is invalid")
+    try:
+        return _GÉOMÉTRIES[taille]
+    except KeyError:
+        return _GÉOMÉTRIES.setdefault(taille, Géométrie(taille))
+
+
+_G = géométrie(TAILLE)
+NB_CASES = _G.nb_cases
+INFINI = _G.infini
+NB_CENTRES = _G.nb_centres
+NB_CANDIDATS = _G.nb_candidats
+FORMAT_POSITION = _G.format_position
+
+
+class Position:
+    """
+    Une position de Quoridor immuable et compacte, sans le nom des joueurs.
+
+    Tous ses champs tiennent dans un seul entier (voir Géométrie.décalages_position) et son
+    empreinte de Zobrist, la même que celle de Quoridor.empreinte, est calculée à la
+    création: le hachage et la comparaison se font en temps constant, et des millions de
+    positions peuvent être gardées dans un ensemble ou un dictionnaire. Quoridor.position et
+    Quoridor.depuis_position passent d'une partie à sa position et inversement.
+    """
+
+    __slots__ = ('géométrie', '_code', '_empreinte')
+
+    def __init__(self, pions, restants, murs_h=0, murs_v=0, dernier=2, taille=TAILLE):
+        """
+        :param pions: les indices des cases des deux jetons (voir Géométrie.case).
+        :param restants: le nombre de murs restant à chaque joueur.
+        :param murs_h: le masque des centres des murs horizontaux (voir Géométrie.centre).
+        :param murs_v: le masque des centres des murs verticaux.
+        :param dernier: le dernier joueur à avoir joué (1 ou 2).
+        :param taille: la taille du damier.
+        :raises QuoridorError: un champ sort des limites du damier. Les règles du jeu ne sont
+        pas vérifiées: Quoridor.depuis_position s'en charge.
+        """
+        géo = géométrie(taille)
+        test_players_numbers(dernier)
+        if len(pions) != 2 or not all(0 <= pion < géo.nb_cases for pion in pions):
+            raise QuoridorError("Player out of bounds")
+        if len(restants) != 2 or not all(0 <= murs <= géo.nb_centres for murs in restants):
+            raise QuoridorError("Number of walls invalid")
+        if (murs_h | murs_v) & ~géo.tous_centres:
+            raise QuoridorError("Wall out of bounds")
+
+        murs = murs_v << géo.nb_centres | murs_h
+        empreinte = (géo.zobrist_pions[0][pions[0]] ^ géo.zobrist_pions[1][pions[1]]
+                     ^ géo.zobrist_restants[0][restants[0]]
+                     ^ géo.zobrist_restants[1][restants[1]])
+        for candidat in _énumérer_bits(murs):
+            empreinte ^= géo.zobrist_murs[candidat]
+        if dernier == 1:
+            empreinte ^= géo.zobrist_trait
+        _initialiser_position(self, géo, _empaqueter(géo, pions, restants, dernier, murs),
+                              empreinte)
+
+    @property
+    def taille(self):
+        """La taille du damier."""
+        return self.géométrie.taille
+
+    @property
+    def pions(self):
+        """Les indices des cases des deux jetons."""
+        géo, code = self.géométrie, self._code
+        return (code >> géo.décalages_position[0] & géo.masques_position[0],
+                code >> géo.décalages_position[1] & géo.masques_position[1])
+
+    @property
+    def restants(self):
+        """Le nombre de murs restant à chaque joueur."""
+        géo, code = self.géométrie, self._code
+        return (code >> géo.décalages_position[2] & géo.masques_position[2],
+                code >> géo.décalages_position[3] & géo.masques_position[3])
+
+    @property
+    def dernier(self):
+        """Le dernier joueur à avoir joué (1 ou 2)."""
+        return (self._code >> self.géométrie.décalages_position[4] & 1) + 1
+
+    @property
+    def murs_h(self):
+        """Le masque des centres des murs horizontaux."""
+        return self._code & self.géométrie.tous_centres
+
+    @property
+    def murs_v(self):
+        """Le masque des centres des murs verticaux."""
+        return self._code >> self.géométrie.nb_centres & self.géométrie.tous_centres
+
+    def empreinte(self):
+        """
+        :returns: l'empreinte de Zobrist de la position, trait compris (voir
+        Quoridor.empreinte).
+        """
+        return self._empreinte
+
+    def with_move(self, coup, joueur=None):
+        """
+        Produire la position qui suit un coup, sans vérifier sa légalité: comme pour
+        Quoridor.jouer, le coup doit provenir de coups_légaux pour cette position. Seuls
+        les champs touchés par le coup et l'empreinte sont mis à jour.
+
+        :param coup: le code du coup (voir encoder_coup).
+        :param joueur: le numéro du joueur (1 ou 2). Par défaut, l'adversaire du dernier joueur.
+        :returns: une nouvelle Position.
+        """
+        géo = self.géométrie
+        décalages, masques = géo.décalages_position, géo.masques_position
+        code, empreinte = self._code, self._empreinte
+        if joueur is None:
+            joueur = 2 - (code >> décalages[4] & 1)
+
+        if coup < géo.nb_cases:
+            décalage = décalages[joueur - 1]
+            ancienne = code >> décalage & masques[joueur - 1]
+            code ^= (ancienne ^ coup) << décalage
+            zobrist = géo.zobrist_pions[joueur - 1]
+            empreinte ^= zobrist[ancienne] ^ zobrist[coup]
+        else:
+            candidat = coup - géo.nb_cases
+            décalage = décalages[joueur + 1]
+            restants = code >> décalage & masques[joueur + 1]
+            code = (code | 1 << candidat) - (1 << décalage)
+            zobrist = géo.zobrist_restants[joueur - 1]
+            empreinte ^= géo.zobrist_murs[candidat] ^ zobrist[restants] ^ zobrist[restants - 1]
+
+        if (code >> décalages[4] & 1) != joueur - 1:
+            code ^= 1 << décalages[4]
+            empreinte ^= géo.zobrist_trait
+
+        position = object.__new__(Position)
+        _initialiser_position(position, géo, code, empreinte)
+        return position
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, nom):
+        raise AttributeError("Position is immutable")
+
+    def __eq__(self, autre):
+        if not isinstance(autre, Position):
+            return NotImplemented
+        return (self._empreinte == autre._empreinte and self._code == autre._code
+                and self.géométrie is autre.géométrie)
+
+    def __hash__(self):
+        return self._empreinte
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, mémo):
+        return self
+
+    def __reduce__(self):
+        return _rétablir_position, (self.géométrie.taille, self._code, self._empreinte)
+
+    def __repr__(self):
+        return (f"Position(pions={self.pions}, restants={self.restants}, "
+                f"murs_h={self.murs_h:#x}, murs_v={self.murs_v:#x}, dernier={self.dernier}, "
+                f"taille={self.taille})")
+
+
+def _initialiser_position(position, géo, code, empreinte):
+    """Remplit les attributs d'une Position, que Position.__setattr__ interdit d'écrire."""
+    object.__setattr__(position, 'géométrie', géo)
+    object.__setattr__(position, '_code', code)
+    object.__setattr__(position, '_empreinte', empreinte)
+
+
+def _empaqueter(géo, pions, restants, dernier, murs):
+    """Retourne l'entier des champs d'une Position (voir Géométrie.décalages_position)."""
+    décalages = géo.décalages_position
+    return (murs | pions[0] << décalages[0] | pions[1] << décalages[1]
+            | restants[0] << décalages[2] | restants[1] << décalages[3]
+            | (dernier - 1) << décalages[4])
+
+
+def _rétablir_position(taille, code, empreinte):
+    """Recrée une Position dépicklée, sans recalculer son empreinte."""
+    position = object.__new__(Position)
+    _initialiser_position(position, géométrie(taille), code, empreinte)
+    return position
+
+
 class Quoridor:
     """Cette classe implémente la plus grande partie du jeu"""
 
-    def __init__(self, joueurs, murs=None):
+    def __init__(self, joueurs, murs=None, taille=TAILLE, nb_murs=NB_MURS):
         """
         Initialiser une partie de Quoridor avec les joueurs et les murs spécifiés,
         en s'assurant de faire une copie profonde de tout ce qui a besoin d'être copié.
@@ -27,6 +428,10 @@ class Quoridor:
         :param murs: un dictionnaire contenant une clé 'horizontaux' associée à la liste des
         positions (x, y) des murs horizontaux, et une clé 'verticaux' associée à la liste des
         positions (x, y) des murs verticaux. Par défaut, il n'y a aucun mur placé sur le jeu.
+        :param taille: le nombre de cases de chaque côté du damier (9 par défaut). Les jetons
+        partent alors du milieu de la première et de la dernière ligne.
+        :param nb_murs: le nombre total de murs des deux joueurs, pair (20 par défaut), dont
+        chacun peut initialement placer la moitié.
 
         """
         if not isinstance(joueurs, Iterable):
@@ -38,18 +443,33 @@ class Quoridor:
         if murs and not isinstance(murs, dict):
             raise QuoridorError("Walls given are not in a dictionary")
 
+        self.géométrie = géo = géométrie(taille)
+        self.taille = taille
+
+        if (not isinstance(nb_murs, int) or nb_murs < 0 or nb_murs % 2
+                or nb_murs // 2 > géo.nb_centres):
+            raise QuoridorError(f"Wall budget {nb_murs!r} is invalid")
+        self.nb_murs = nb_murs
+        départs = [géo.coordonnées[case] for case in géo.cases_départ]
+
         if isinstance(joueurs[0], str):
             self.players = [
-                                {'nom': f"{joueurs[0]}", 'murs': 10, 'pos': (5, 1)},
-                                {'nom': f"{joueurs[1]}", 'murs': 10, 'pos': (5, 9)},
+                                {'nom': f"{joueurs[0]}", 'murs': nb_murs // 2,
+                                 'pos': départs[0]},
+                                {'nom': f"{joueurs[1]}", 'murs': nb_murs // 2,
+                                 'pos': départs[1]},
                             ]
         else:
-            self.players = joueurs
-            self.players[0]["pos"] = [self.players[0]["pos"][0], self.players[0]["pos"][1]]
-            self.players[1]["pos"] = [self.players[1]["pos"][0], self.players[1]["pos"][1]]
+            self.players = [
+                {'nom': joueur['nom'], 'murs': joueur['murs'], 'pos': list(joueur['pos'])}
+                for joueur in joueurs
+            ]
 
         if isinstance(murs, dict):
-            self.murs = murs
+            self.murs = {
+                            'horizontaux': [list(mur) for mur in murs['horizontaux']],
+                            'verticaux': [list(mur) for mur in murs['verticaux']]
+                        }
 
         else:
             self.murs = {
@@ -62,31 +482,28 @@ class Quoridor:
         for i, val in enumerate(joueurs):
             if isinstance(val, str):
                 self.players[i]['nom'] = val
-                if i == 0:
-                    self.players[i]['pos'] = (5, 1)
-                elif i == 1:
-                    self.players[i]['pos'] = (5, 9)
+                self.players[i]['pos'] = départs[i]
             elif isinstance(val, dict):
                 self.players[i]['nom'] = val['nom']
                 self.players[i]['murs'] = val['murs']
-                self.players[i]['pos'] = val['pos']
+                self.players[i]['pos'] = list(val['pos'])
 
         for i in range(2):
             x, y = self.players[i]['pos']
-            if x < 1 or x > 9 or y < 1 or y > 9:
+            if x < 1 or x > taille or y < 1 or y > taille:
                 raise QuoridorError(f"Player {i} out of bounds")
             qtt_murs = self.players[i]['murs']
-            if qtt_murs > 10 or qtt_murs < 0:
+            if qtt_murs > nb_murs // 2 or qtt_murs < 0:
                 raise QuoridorError(f"Player {i} number of walls invalid")
 
         for i in self.murs['horizontaux']:
             x, y = i[0], i[1]
-            if x < 1 or x > 8 or y < 2 or y > 9:
+            if x < 1 or x > taille - 1 or y < 2 or y > taille:
                 raise QuoridorError("Horizontal wall out of bounds")
 
         for i in self.murs['verticaux']:
             x, y = i[0], i[1]
-            if x < 2 or x > 9 or y < 1 or y > 8:
+            if x < 2 or x > taille or y < 1 or y > taille - 1:
                 raise QuoridorError("Vertical wall out of bounds")
 
         placed_walls = 0
@@ -94,172 +511,644 @@ class Quoridor:
         placable_walls = 0
         placable_walls += self.players[0]['murs'] + self.players[1]['murs']
 
-        if placed_walls + placable_walls != 20:
-            raise QuoridorError("Number of walls not equal to 20")
+        if placed_walls + placable_walls != nb_murs:
+            raise QuoridorError(f"Number of walls not equal to {nb_murs}")
+
+        # indices des cases occupées par les jetons
+        self._pions = [géo.case(*joueur['pos']) for joueur in self.players]
+
+        # masques de bits des centres de murs et des arêtes bloquées
+        self._murs_h = 0
+        self._murs_v = 0
+        self._bloque_haut = 0
+        self._bloque_droite = 0
+        self._distances = None
+        for x, y in self.murs['horizontaux']:
+            self._poser_mur(géo.centre(x, y - 1), True)
+        for x, y in self.murs['verticaux']:
+            self._poser_mur(géo.centre(x - 1, y), False)
+
+        # empreinte de Zobrist de la position, sans le trait
+        self._empreinte = (
+            géo.zobrist_pions[0][self._pions[0]] ^ géo.zobrist_pions[1][self._pions[1]]
+            ^ géo.zobrist_restants[0][self.players[0]['murs']]
+            ^ géo.zobrist_restants[1][self.players[1]['murs']]
+        )
+        for candidat in _énumérer_bits(self._murs_v << géo.nb_centres | self._murs_h):
+            self._empreinte ^= géo.zobrist_murs[candidat]
+
+        # graphe des déplacements, construit au premier besoin puis tenu à jour
+        self._graphe = None
+        self._sauts = None
+
+        # coups joués, pour pouvoir les annuler
+        self._historique = []
+
+        # murs peints pour la représentation en art ascii, avec leurs masques (voir _damier)
+        self._rendu_murs = None
 
         self.last_player = 2
 
+    def graphe(self):
+        """
+        Produire le graphe des déplacements admissibles pour l'état actuel de la partie.
+
+        Le graphe est construit au premier appel, puis mis à jour sur place à chaque mur
+        placé et à chaque jeton déplacé. Il ne doit pas être modifié par l'appelant.
+
+        :returns: le graphe décrit dans construire_graphe.
+        """
+        if self._graphe is None:
+            self._graphe = construire_damier(
+                self.etat['murs']['horizontaux'],
+                self.etat['murs']['verticaux'],
+                self.taille
+                )
+            ajouter_objectifs(self._graphe, self.taille)
+            self._sauts = ajouter_liens_sauteurs(self._graphe, *self._positions())
+
+        return self._graphe
+
+    def _positions(self):
+        """Retourne les positions des deux joueurs sous forme de tuples."""
+        j1, j2 = self.etat['joueurs']
+        return tuple(j1['pos']), tuple(j2['pos'])
+
+    def _poser_mur(self, centre, horizontal):
+        """
+        Met à jour les masques de bits pour un mur posé au centre spécifié.
+
+        :param centre: l'indice du centre du mur.
+        :param horizontal: True pour un mur horizontal, False pour un mur vertical.
+        :returns: les distances modifiées de chaque joueur (voir mettre_à_jour_distances),
+        ou None si les cartes de distances n'ont pas encore été calculées.
+        """
+        géo = self.géométrie
+        if horizontal:
+            self._murs_h |= 1 << centre
+            self._bloque_haut |= géo.coupures_h[centre]
+            paires = géo.paires_h[centre]
+        else:
+            self._murs_v |= 1 << centre
+            self._bloque_droite |= géo.coupures_v[centre]
+            paires = géo.paires_v[centre]
+
+        if self._distances is None:
+            return None
+
+        arêtes = self._arêtes()
+        return [mettre_à_jour_distances(distances, arêtes, paires, self.taille)
+                for distances in self._distances]
+
+    def _enlever_mur(self, centre, horizontal, changements):
+        """
+        Annule sur les masques de bits et les cartes de distances l'effet de _poser_mur.
+
+        :param centre: l'indice du centre du mur.
+        :param horizontal: True pour un mur horizontal, False pour un mur vertical.
+        :param changements: la valeur retournée par _poser_mur pour ce mur.
+        """
+        if horizontal:
+            self._murs_h &= ~(1 << centre)
+            self._bloque_haut &= ~self.géométrie.coupures_h[centre]
+        else:
+            self._murs_v &= ~(1 << centre)
+            self._bloque_droite &= ~self.géométrie.coupures_v[centre]
+
+        if changements is None:
+            # les cartes, calculées après le mur, seront recalculées au besoin
+            self._distances = None
+        elif self._distances is not None:
+            for distances, modifiées in zip(self._distances, changements):
+                for case, ancienne in modifiées:
+                    distances[case] = ancienne
+
+    def _déplacer(self, joueur, case):
+        """
+        Déplace le jeton du joueur sans vérification, en inscrivant le coup à l'historique.
+
+        :param joueur: le numéro du joueur (1 ou 2).
+        :param case: l'indice de la case d'arrivée.
+        """
+        ancienne = (self._pions[joueur - 1], self.etat["joueurs"][joueur - 1]["pos"])
+        self._historique.append((case, joueur, self.last_player, ancienne))
+        self._changer_case(joueur, case, list(self.géométrie.coordonnées[case]))
+        self.last_player = joueur
+
+    def _changer_case(self, joueur, case, pos):
+        """
+        Met le jeton du joueur sur la case, en tenant le graphe et l'empreinte à jour.
+
+        :param pos: la position (x, y) de la case à inscrire dans l'état de la partie.
+        """
+        zobrist = self.géométrie.zobrist_pions[joueur - 1]
+        self._empreinte ^= zobrist[self._pions[joueur - 1]] ^ zobrist[case]
+        self._pions[joueur - 1] = case
+
+        if self._graphe is None:
+            self.etat["joueurs"][joueur - 1]["pos"] = pos
+        else:
+            retirer_liens_sauteurs(self._graphe, *self._positions(), self._sauts)
+            self.etat["joueurs"][joueur - 1]["pos"] = pos
+            self._sauts = ajouter_liens_sauteurs(self._graphe, *self._positions())
+
+    def _placer(self, joueur, coup):
+        """
+        Place un mur sans vérification, en inscrivant le coup à l'historique.
+
+        :param joueur: le numéro du joueur (1 ou 2).
+        :param coup: le code du mur (voir encoder_coup).
+        """
+        géo = self.géométrie
+        type_coup, position = décoder_coup(coup, self.taille)
+        horizontal = type_coup == 'MH'
+        orientation = 'horizontal' if horizontal else 'vertical'
+        self.etat['murs'][ORIENTATIONS[orientation]].append(list(position))
+        changements = self._poser_mur((coup - géo.nb_cases) % géo.nb_centres, horizontal)
+
+        if self._graphe is not None:
+            j1, j2 = self._positions()
+            retirer_liens_sauteurs(self._graphe, j1, j2, self._sauts)
+            retirer_arcs_mur(self._graphe, position, orientation)
+            self._sauts = ajouter_liens_sauteurs(self._graphe, j1, j2)
+
+        restants = self.etat['joueurs'][joueur - 1]["murs"]
+        self.etat['joueurs'][joueur - 1]["murs"] = restants - 1
+        self._empreinte ^= (géo.zobrist_murs[coup - géo.nb_cases]
+                            ^ géo.zobrist_restants[joueur - 1][restants]
+                            ^ géo.zobrist_restants[joueur - 1][restants - 1])
+        self._historique.append((coup, joueur, self.last_player, changements))
+        self.last_player = joueur
+
+    def jouer(self, coup, joueur=None):
+        """
+        Jouer un coup sur place, sans vérifier sa légalité, pour pouvoir l'annuler ensuite.
+
+        Cette méthode sert à l'exploration d'un arbre de jeu: le coup doit provenir de
+        coups_légaux pour l'état actuel de la partie.
+
+        :param coup: le code du coup (voir encoder_coup).
+        :param joueur: le numéro du joueur (1 ou 2). Par défaut, l'adversaire du dernier joueur.
+        """
+        if joueur is None:
+            joueur = other_player(self.last_player)
+
+        if coup < self.géométrie.nb_cases:
+            self._déplacer(joueur, coup)
+        else:
+            self._placer(joueur, coup)
+
+    def annuler(self):
+        """
+        Annuler le dernier coup joué, qu'il l'ait été par jouer, déplacer_jeton, placer_mur ou
+        jouer_coup. Les murs, les positions, le nombre de murs restants, last_player ainsi que
+        le graphe et les cartes de distances reviennent exactement à leur état précédent.
+
+        :raises QuoridorError: aucun coup n'a été joué.
+        """
+        if not self._historique:
+            raise QuoridorError("There is no move to undo")
+
+        coup, joueur, dernier, détail = self._historique.pop()
+        géo = self.géométrie
+
+        if coup < géo.nb_cases:
+            self._changer_case(joueur, *détail)
+        else:
+            type_coup, position = décoder_coup(coup, self.taille)
+            horizontal = type_coup == 'MH'
+            orientation = 'horizontal' if horizontal else 'vertical'
+            self.etat['murs'][ORIENTATIONS[orientation]].pop()
+
+            if self._graphe is not None:
+                j1, j2 = self._positions()
+                retirer_liens_sauteurs(self._graphe, j1, j2, self._sauts)
+                self._graphe.add_edges_from(arcs_mur(position, orientation))
+                self._sauts = ajouter_liens_sauteurs(self._graphe, j1, j2)
+
+            self._enlever_mur((coup - géo.nb_cases) % géo.nb_centres, horizontal, détail)
+            restants = self.etat['joueurs'][joueur - 1]["murs"]
+            self.etat['joueurs'][joueur - 1]["murs"] = restants + 1
+            self._empreinte ^= (géo.zobrist_murs[coup - géo.nb_cases]
+                                ^ géo.zobrist_restants[joueur - 1][restants]
+                                ^ géo.zobrist_restants[joueur - 1][restants + 1])
+
+        self.last_player = dernier
+
+    def coups_joués(self):
+        """
+        Énumérer les coups joués depuis la création de la partie, dans l'ordre, soit ceux
+        qu'annuler peut défaire.
+
+        :returns: la liste des tuples (code du coup, numéro du joueur).
+        """
+        return [(coup, joueur) for coup, joueur, *_ in self._historique]
+
+    def sérialiser(self):
+        """
+        Produire une représentation binaire compacte de la position, sans le nom des joueurs
+        ni la taille du damier: la case de chaque jeton, le nombre de murs restant à chaque
+        joueur, le dernier joueur et les masques des centres des murs horizontaux et
+        verticaux.
+
+        :returns: une chaîne de self.géométrie.format_position.size octets, soit
+        FORMAT_POSITION.size pour le damier 9x9.
+        """
+        géo = self.géométrie
+        murs_h, murs_v = self._murs_h, self._murs_v
+        if géo.octets_masque:
+            murs_h = murs_h.to_bytes(géo.octets_masque, 'little')
+            murs_v = murs_v.to_bytes(géo.octets_masque, 'little')
+        return géo.format_position.pack(
+            self._pions[0], self._pions[1],
+            self.etat['joueurs'][0]['murs'], self.etat['joueurs'][1]['murs'],
+            self.last_player, murs_h, murs_v,
+        )
+
+    @classmethod
+    def désérialiser(cls, données, noms=('1', '2'), taille=TAILLE):
+        """
+        Reconstruire une partie à partir de sa représentation binaire (voir sérialiser).
+
+        :param données: les octets produits par sérialiser.
+        :param noms: le nom des deux joueurs.
+        :param taille: la taille du damier de la partie sérialisée.
+        :returns: une nouvelle partie de Quoridor, dont le nombre total de murs est celui des
+        murs posés et restants.
+        :raises QuoridorError: la position décrite est invalide.
+        """
+        géo = géométrie(taille)
+        pion_1, pion_2, murs_1, murs_2, dernier, murs_h, murs_v = géo.format_position.unpack(
+            données)
+        if géo.octets_masque:
+            murs_h = int.from_bytes(murs_h, 'little')
+            murs_v = int.from_bytes(murs_v, 'little')
+        # un octet de jeton hors du damier ferait échouer la lecture de ses coordonnées
+        for pion in (pion_1, pion_2):
+            if pion >= géo.nb_cases:
+                raise QuoridorError(f"Pawn cell {pion} is invalid")
+        if (murs_h | murs_v) & ~géo.tous_centres:
+            raise QuoridorError("Wall mask is invalid")
+        return cls._construire(géo, noms, (pion_1, pion_2), (murs_1, murs_2), dernier, murs_h,
+                               murs_v)
+
+    @classmethod
+    def _construire(cls, géo, noms, pions, restants, dernier, murs_h, murs_v):
+        """
+        Crée une partie à partir des champs d'une position, en appliquant les règles de
+        __init__. Le nombre total de murs est celui des murs posés et restants.
+        """
+        taille = géo.taille
+        début_v = géo.nb_cases + géo.nb_centres
+        partie = cls(
+            [
+                {'nom': noms[0], 'murs': restants[0], 'pos': géo.coordonnées[pions[0]]},
+                {'nom': noms[1], 'murs': restants[1], 'pos': géo.coordonnées[pions[1]]},
+            ],
+            {
+                'horizontaux': [list(décoder_coup(coup, taille)[1])
+                                for coup in _énumérer_bits(murs_h, géo.nb_cases)],
+                'verticaux': [list(décoder_coup(coup, taille)[1])
+                              for coup in _énumérer_bits(murs_v, début_v)],
+            },
+            taille,
+            sum(restants) + bin(murs_h).count('1') + bin(murs_v).count('1'),
+        )
+        test_players_numbers(dernier)
+        partie.last_player = dernier
+        return partie
+
+    def position(self):
+        """
+        Produire la position actuelle sous forme immuable, sans le nom des joueurs ni
+        l'historique des coups.
+
+        :returns: une Position de même empreinte que la partie.
+        """
+        géo = self.géométrie
+        position = object.__new__(Position)
+        _initialiser_position(position, géo, _empaqueter(
+            géo, self._pions,
+            (self.etat['joueurs'][0]['murs'], self.etat['joueurs'][1]['murs']),
+            self.last_player, self._murs_v << géo.nb_centres | self._murs_h,
+        ), self.empreinte())
+        return position
+
+    @classmethod
+    def depuis_position(cls, position, noms=('1', '2')):
+        """
+        Créer une partie à partir d'une position (voir Quoridor.position).
+
+        :param position: la Position de départ.
+        :param noms: le nom des deux joueurs.
+        :returns: une nouvelle partie de Quoridor de la taille de la position, dont le nombre
+        total de murs est celui des murs posés et restants.
+        :raises QuoridorError: la position est invalide.
+        """
+        return cls._construire(position.géométrie, noms, position.pions, position.restants,
+                               position.dernier, position.murs_h, position.murs_v)
+
+    def empreinte(self):
+        """
+        Produire l'empreinte de Zobrist de la position actuelle, trait compris.
+
+        L'empreinte est tenue à jour à chaque coup; deux positions identiques ont toujours la
+        même empreinte, y compris dans des processus différents.
+
+        :returns: un entier de 64 bits.
+        """
+        if self.last_player == 1:
+            return self._empreinte ^ self.géométrie.zobrist_trait
+        return self._empreinte
+
+    def _arêtes(self):
+        """Retourne le masque réuni des arêtes bloquées (voir Géométrie.voisins)."""
+        return self._bloque_haut | self._bloque_droite << self.géométrie.nb_cases
+
+    def _cartes(self):
+        """Retourne les cartes de distances des deux joueurs, en les calculant au besoin."""
+        if self._distances is None:
+            arêtes = self._arêtes()
+            self._distances = [calculer_distances(arêtes, objectifs, self.taille)
+                               for objectifs in self.géométrie.objectifs]
+        return self._distances
+
+    def _destinations(self, joueur):
+        """
+        Énumère les cases où le jeton du joueur peut se rendre, sauts compris, selon les
+        mêmes règles que le graphe de construire_graphe.
+
+        :param joueur: le numéro du joueur (1 ou 2).
+        :returns: la liste des indices des cases d'arrivée.
+        """
+        arêtes = self._arêtes()
+        voisins = self.géométrie.voisins
+        moi = self._pions[joueur - 1]
+        lui = self._pions[2 - joueur]
+        destinations = []
+
+        for voisin, arête in voisins[moi]:
+            if arêtes >> arête & 1:
+                continue
+            if voisin != lui:
+                destinations.append(voisin)
+                continue
+
+            # sauter par-dessus l'adversaire en ligne droite si possible, sinon en diagonale
+            saut = 2 * lui - moi
+            sauts = [v for v, a in voisins[lui] if v != moi and not arêtes >> a & 1]
+            destinations.extend([saut] if saut in sauts else sauts)
+
+        return destinations
+
+    def _chemins_libres(self, bloque_haut, bloque_droite):
+        """
+        Vérifie que chaque joueur peut encore atteindre sa ligne d'arrivée.
+
+        :param bloque_haut: le masque des arêtes bloquées vers le haut à vérifier.
+        :param bloque_droite: le masque des arêtes bloquées vers la droite à vérifier.
+        :returns: True si les deux joueurs ont un chemin, False autrement.
+        """
+        géo = self.géométrie
+        atteint = inonder(
+            géo.départ_joueurs,
+            (géo.plein_haut & ~bloque_haut) * géo.repli_joueurs,
+            (géo.plein_droite & ~bloque_droite) * géo.repli_joueurs,
+            self.taille,
+        )
+        return bool(atteint >> self._pions[0] & atteint >> (géo.nb_cases + self._pions[1]) & 1)
+
+    def _coupures_chemin(self, joueur):
+        """
+        Retourne le masque des murs candidats qui coupent un plus court chemin du joueur.
+
+        :param joueur: le numéro du joueur (1 ou 2).
+        """
+        géo = self.géométrie
+        arêtes = self._arêtes()
+        distances = self._cartes()[joueur - 1]
+        case = self._pions[joueur - 1]
+        coupures = 0
+
+        for _ in range(distances[case] if distances[case] < géo.infini else 0):
+            for voisin, arête in géo.voisins[case]:
+                if distances[voisin] < distances[case] and not arêtes >> arête & 1:
+                    coupures |= géo.candidats_par_arête[arête]
+                    case = voisin
+                    break
+
+        return coupures
+
+    def murs_sur_chemin(self, joueur):
+        """
+        Énumérer les murs qui couperaient le plus court chemin actuel du joueur, qu'ils
+        soient légaux ou non. Ce sont les seuls murs qui peuvent allonger ce chemin.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: la liste des codes de ces murs (voir encoder_coup).
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        return _énumérer_bits(self._coupures_chemin(joueur), self.géométrie.nb_cases)
+
+    def coups_légaux(self, joueur):
+        """
+        Énumérer tous les coups légaux du joueur pour l'état actuel de la partie.
+
+        Les coups sont représentés par des codes entiers (voir encoder_coup): d'abord les
+        déplacements du jeton, sauts compris, puis les murs qui laissent un chemin aux deux
+        joueurs. Seuls les murs qui coupent un plus court chemin actuel peuvent isoler un
+        joueur; ils sont tous vérifiés en un seul parcours, chacun occupant sa propre tranche
+        d'un grand masque de bits.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: la liste des codes des coups légaux.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        coups = self._destinations(joueur)
+
+        if self.etat['joueurs'][joueur - 1]['murs'] == 0:
+            return coups
+
+        # murs qui ne touchent aucun mur existant
+        géo = self.géométrie
+        tranche = géo.tranche
+        occupés = self._murs_h | self._murs_v
+        libres_h = ~(occupés | (self._murs_h << 1 & ~géo.première_colonne)
+                     | (self._murs_h >> 1 & ~géo.dernière_colonne))
+        libres_v = ~(occupés | self._murs_v << (self.taille - 1)
+                     | self._murs_v >> (self.taille - 1))
+        libres = (libres_v & géo.tous_centres) << géo.nb_centres | libres_h & géo.tous_centres
+
+        # un mur qui ne coupe aucune arête d'un plus court chemin ne peut isoler personne
+        chemins = self._coupures_chemin(1) | self._coupures_chemin(2)
+        légaux = libres & ~chemins
+        critiques = _énumérer_bits(libres & chemins)
+
+        if critiques:
+            # inonder les plateaux des murs critiques, une tranche par mur et par joueur
+            moitié = tranche * len(critiques)
+            coupe_haut = coupe_droite = 0
+            for i, candidat in enumerate(critiques):
+                haut, droite = géo.coupures_candidats[candidat]
+                coupe_haut |= haut << (tranche * i)
+                coupe_droite |= droite << (tranche * i)
+
+            repli = géo.repli(len(critiques))
+            ouvert_haut = (géo.plein_haut & ~self._bloque_haut) * repli & ~coupe_haut
+            ouvert_droite = (géo.plein_droite & ~self._bloque_droite) * repli & ~coupe_droite
+            atteint = inonder(
+                géo.arrivées[0] * repli | géo.arrivées[1] * repli << moitié,
+                ouvert_haut | ouvert_haut << moitié,
+                ouvert_droite | ouvert_droite << moitié,
+                self.taille,
+            )
+
+            octets = atteint.to_bytes(2 * moitié // 8, 'little')
+            octet_1, bit_1 = divmod(self._pions[0], 8)
+            octet_2, bit_2 = divmod(moitié + self._pions[1], 8)
+            for i, candidat in enumerate(critiques):
+                décalage = tranche // 8 * i
+                if octets[décalage + octet_1] >> bit_1 & octets[décalage + octet_2] >> bit_2 & 1:
+                    légaux |= 1 << candidat
+
+        coups.extend(_énumérer_bits(légaux, géo.nb_cases))
+
+        return coups
+
+    def distance(self, joueur):
+        """
+        Produire la longueur du plus court chemin du joueur jusqu'à sa ligne d'arrivée,
+        en tenant compte des murs mais pas du jeton adverse.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: le nombre de déplacements, ou self.géométrie.infini (INFINI sur le damier
+        9x9) si aucun chemin n'existe.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        return self._cartes()[joueur - 1][self._pions[joueur - 1]]
+
+    def carte_distances(self, joueur):
+        """
+        Produire la carte des distances du joueur: pour chaque case, la longueur du plus
+        court chemin jusqu'à sa ligne d'arrivée (voir distance). La carte est tenue à jour
+        sur place et ne doit pas être modifiée par l'appelant.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: la liste des distances, indexée par case (voir encoder_coup).
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        """
+        test_players_numbers(joueur)
+        return self._cartes()[joueur - 1]
+
+    def next_step(self, joueur):
+        """
+        Produire la prochaine case du joueur sur son plus court chemin, sauts compris.
+
+        :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :returns: le tuple (x, y) de la case.
+        :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
+        :raises QuoridorError: le joueur n'a aucun chemin jusqu'à sa ligne d'arrivée.
+        """
+        test_players_numbers(joueur)
+        distances = self._cartes()[joueur - 1]
+        meilleure = min(self._destinations(joueur), key=distances.__getitem__, default=None)
+
+        if meilleure is None or distances[meilleure] == self.géométrie.infini:
+            raise QuoridorError(f"Player {joueur} has no path to goal")
+
+        return self.géométrie.coordonnées[meilleure]
+
     def __str__(self):
         """
         Produire la représentation en art ascii correspondant à l'état actuel de la partie.
-        Cette représentation est la même que celle du TP précédent.
+        Cette représentation est la même que celle du TP précédent; sur un autre damier que
+        9x9, elle est agrandie en conséquence.
 
         :returns: la chaîne de caractères de la représentation.
         """
-        sortie = ""
-        murs_h = self.etat["murs"]["horizontaux"]
-        murs_v = self.etat["murs"]["verticaux"]
-        nom_1 = self.etat["joueurs"][0]["nom"]
-        nom_2 = self.etat["joueurs"][1]["nom"]
-        pos_1 = self.etat["joueurs"][0]["pos"]
-        pos_2 = self.etat["joueurs"][1]["pos"]
-        sortie += f"Légende: 1={nom_1}, 2={nom_2}\n"
-        sortie += "   -----------------------------------\n"
-        grille = [["9", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["8", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["7", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["6", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["5", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["4", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["3", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["2", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"],
-                  [" ", " ", "|", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ",
-                   " ", " ", "|", "\n"],
-                  ["1", " ", "|", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", " ", " ", ".", " ", " ", " ", ".", " ", " ", " ",
-                   ".", " ", "|", "\n"]]
-        for i in murs_h:
-            for e in range(7):
-                grille[19 - 2 * i[1]][4 * i[0] - 1 + e] = "-"
-        for i in murs_v:
-            for e in range(3):
-                grille[18 - (2 * i[1] + e)][4 * i[0] - 2] = "|"
-        grille[18 - 2 * pos_1[1]][4 * pos_1[0]] = "1"
-        grille[18 - 2 * pos_2[1]][4 * pos_2[0]] = "2"
-        jeu = ""
-        for i in grille:
-            jeu += "".join(i)
-        sortie += jeu
-        sortie += "--|-----------------------------------\n  | 1   2   3   4   5   6   7   8   9"
-        return sortie
+        joueur_1, joueur_2 = self.etat["joueurs"]
+        return (self.géométrie.en_tête.format(joueur_1["nom"], joueur_2["nom"])
+                + self._damier().decode('ascii') + self.géométrie.pied)
+
+    def _damier(self):
+        """
+        Retourne les lignes du damier de la représentation en art ascii, en octets. Les murs
+        sont peints une seule fois par disposition des murs; seuls les jetons le sont à
+        chaque appel.
+        """
+        grille = bytearray(self._murs_dessinés())
+        (x_1, y_1), (x_2, y_2) = self.etat["joueurs"][0]["pos"], self.etat["joueurs"][1]["pos"]
+        largeur, colonne = self.géométrie.largeur_ligne, self.géométrie.marge - 1
+        grille[2 * (self.taille - y_1) * largeur + 4 * x_1 + colonne] = 49  # "1"
+        grille[2 * (self.taille - y_2) * largeur + 4 * x_2 + colonne] = 50  # "2"
+        return grille
+
+    def _murs_dessinés(self):
+        """
+        Retourne les lignes du damier sans les jetons (voir dessiner_murs), peintes une seule
+        fois par disposition des murs.
+        """
+        murs = (self._murs_h, self._murs_v)
+        if self._rendu_murs is None or self._rendu_murs[0] != murs:
+            self._rendu_murs = (murs, dessiner_murs(
+                self.etat["murs"]["horizontaux"], self.etat["murs"]["verticaux"], self.taille))
+        return self._rendu_murs[1]
 
     def déplacer_jeton(self, joueur, position):
         """
         Pour le joueur spécifié, déplacer son jeton à la position spécifiée.
 
         :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
-        :param position: le tuple (x, y) de la position du jeton (1<=x<=9 et 1<=y<=9).
+        :param position: le tuple (x, y) de la position du jeton (1<=x<=9 et 1<=y<=9 sur le
+        damier 9x9).
         :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
         :raises QuoridorError: la position est invalide (en dehors du damier).
         :raises QuoridorError: la position est invalide pour l'état actuel du jeu.
         """
-        position = [position[0], position[1]]
+        x, y = position
         test_players_numbers(joueur)
+        taille = self.taille
 
-        if position[0] not in range(1, 10) or position[1] not in range(1, 10):
+        # range refuse les coordonnées non entières mais accepte 5.0, ramené à l'entier 5
+        if x not in range(1, taille + 1) or y not in range(1, taille + 1):
             raise QuoridorError("Position given is outside of board")
+        x, y = int(x), int(y)
 
-        if self.etat["joueurs"][other_player(joueur) - 1]["pos"] == position:
+        autre_x, autre_y = self.etat["joueurs"][other_player(joueur) - 1]["pos"]
+        if autre_x == x and autre_y == y:
             raise QuoridorError("Position given is invalid (occupied)")
 
-        if self.etat["joueurs"][joueur - 1]["pos"] == position:
+        pos_x, pos_y = self.etat["joueurs"][joueur - 1]["pos"]
+        if pos_x == x and pos_y == y:
             raise QuoridorError("Player cannot stay immobile")
 
-        pos_joueur = self.etat["joueurs"][joueur - 1]["pos"]
-        mouvement_x = position[0] - pos_joueur[0]
-        mouvement_y = position[1] - pos_joueur[1]
+        mouvement_x = x - pos_x
+        mouvement_y = y - pos_y
 
         if abs(mouvement_x) + abs(mouvement_y) > 2:
             raise QuoridorError("Player tried to move more than 2 tiles")
 
-        murs_hor = self.etat['murs']['horizontaux']
-        murs_ver = self.etat['murs']['verticaux']
-
+        # l'arête par laquelle le jeton entre dans sa case d'arrivée ne doit pas être bloquée
+        case = self.géométrie.case(x, y)
         if mouvement_y > 0:
-            pos_hor = [position[0], position[1]]
-            pos_avant_hor = [(position[0] - 1), position[1]]
-
-            if pos_hor in murs_hor or pos_avant_hor in murs_hor:
-                raise QuoridorError("Position given is invalid (occupied)")
-
+            bloque = self._bloque_haut >> (case - taille) & 1
         elif mouvement_y < 0:
-            pos_hor = [position[0], (position[1] + 1)]
-            pos_avant_hor = [(position[0] - 1), (position[1] + 1)]
-
-            if pos_hor in murs_hor or pos_avant_hor in murs_hor:
-                raise QuoridorError("Position given is invalid (occupied)")
+            bloque = self._bloque_haut >> case & 1
+        else:
+            bloque = 0
 
         if mouvement_x > 0:
-            pos_ver = [position[0], position[1]]
-            pos_avant_ver = [position[0], position[1] - 1]
-
-            if pos_ver in murs_ver or pos_avant_ver in murs_ver:
-                raise QuoridorError("Position given is invalid (occupied)")
-
+            bloque |= self._bloque_droite >> (case - 1) & 1
         elif mouvement_x < 0:
-            pos_ver = [(position[0] + 1), position[1]]
-            pos_avant_ver = [(position[0] + 1), position[1] - 1]
+            bloque |= self._bloque_droite >> case & 1
 
-            if pos_ver in murs_ver or pos_avant_ver in murs_ver:
-                raise QuoridorError("Position given is invalid (occupied)")
+        if bloque:
+            raise QuoridorError("Position given is invalid (occupied)")
 
-        self.etat["joueurs"][joueur - 1]["pos"] = position
-        self.last_player = joueur
+        self._déplacer(joueur, case)
 
     def état_partie(self):
         """
@@ -290,13 +1179,16 @@ class Quoridor:
         """
         return self.etat
 
-    def jouer_coup(self, joueur):
+    def jouer_coup(self, joueur, stratégie=None):
         """
         Pour le joueur spécifié, jouer automatiquement son meilleur coup pour l'état actuel
         de la partie. Ce coup est soit le déplacement de son jeton, soit le placement d'un
         mur horizontal ou vertical.
 
         :param joueur: un entier spécifiant le numéro du joueur (1 ou 2).
+        :param stratégie: un objet dont la méthode choisir_coup(partie, joueur) retourne le
+        code d'un coup légal (voir recherche.RechercheAlphaBeta). Par défaut, le joueur avance
+        d'une case sur son plus court chemin.
         :raises QuoridorError: le numéro du joueur est autre que 1 ou 2.
         :raises QuoridorError: la partie est déjà terminée.
         """
@@ -305,19 +1197,10 @@ class Quoridor:
         if isinstance(self.partie_terminée(), str):
             raise QuoridorError(f"Player {joueur} tried to run a finished game")
 
-        graphe = construire_graphe(
-            [joueur['pos'] for joueur in self.etat['joueurs']],
-            self.etat['murs']['horizontaux'],
-            self.etat['murs']['verticaux']
-                )
-
-        new_pos = nx.shortest_path(
-            graphe,
-            self.etat['joueurs'][joueur - 1]['pos'],
-            'B' + str(joueur)
-                )
-
-        self.déplacer_jeton(joueur, new_pos[1])
+        if stratégie is None:
+            self.déplacer_jeton(joueur, self.next_step(joueur))
+        else:
+            self.jouer(stratégie.choisir_coup(self, joueur), joueur)
 
     def partie_terminée(self):
         """
@@ -326,7 +1209,7 @@ class Quoridor:
         :returns: le nom du gagnant si la partie est terminée; False autrement.
         """
 
-        if self.etat["joueurs"][0]["pos"][1] == 9:
+        if self.etat["joueurs"][0]["pos"][1] == self.taille:
             return self.etat["joueurs"][0]["nom"]
 
         if self.etat["joueurs"][1]["pos"][1] == 1:
@@ -347,126 +1230,711 @@ class Quoridor:
         :raises QuoridorError: la position est invalide pour cette orientation.
         :raises QuoridorError: le joueur a déjà placé tous ses murs.
         """
-        position = [position[0], position[1]]
+        x, y = position
         test_players_numbers(joueur)
 
         if self.etat["joueurs"][joueur - 1]["murs"] == 0:
             raise QuoridorError(f"Player {joueur} has no more walls")
 
-        murs_hor = self.etat['murs']['horizontaux']
-        murs_ver = self.etat['murs']['verticaux']
+        horizontal = orientation == "horizontal"
+        géo = self.géométrie
 
-        if orientation == "horizontal":
-            pos_hor_avant = [position[0] - 1, position[1]]
-            pos_hor_apres = [position[0] + 1, position[1]]
-            pos_ver_corresp = [position[0] + 1, position[1] - 1]
+        if horizontal:
+            if x not in range(1, self.taille) or y not in range(2, self.taille + 1):
+                raise QuoridorError(f"Position {(x, y)} is invalid")
+            x, y = int(x), int(y)
 
-            if position in murs_hor or pos_ver_corresp in murs_ver:
-                raise QuoridorError(f"There is already a wall here")
+            centre = géo.centre(x, y - 1)
 
-            if pos_hor_avant in murs_hor or pos_hor_apres in murs_hor:
-                raise QuoridorError(f"There is already a wall left/right")
+            if (self._murs_h | self._murs_v) >> centre & 1:
+                raise QuoridorError("There is already a wall here")
 
-            if position[0] not in range(1, 9) or position[1] not in range(2, 10):
-                raise QuoridorError(f"Position {position} is invalid")
+            if self._murs_h & géo.chevauchements_h[centre]:
+                raise QuoridorError("There is already a wall left/right")
 
-            self.etat['murs']['horizontaux'].append([position[0], position[1]])
+            chemins = self._chemins_libres(
+                self._bloque_haut | géo.coupures_h[centre], self._bloque_droite)
 
         else:
-            pos_ver_avant = [position[0] - 1, position[1] - 1]
-            pos_ver_apres = [position[0], position[1] + 1]
-            pos_hor_corresp = [position[0] - 1, position[1] + 1]
+            if x not in range(2, self.taille + 1) or y not in range(1, self.taille):
+                raise QuoridorError(f"Position {(x, y)} is invalid")
+            x, y = int(x), int(y)
 
-            if position in murs_ver or pos_hor_corresp in murs_hor:
-                raise QuoridorError(f"There is already a wall here")
+            centre = géo.centre(x - 1, y)
 
-            if pos_ver_avant in murs_ver or pos_ver_apres in murs_ver:
-                raise QuoridorError(f"There is already a wall above/below")
+            if (self._murs_h | self._murs_v) >> centre & 1:
+                raise QuoridorError("There is already a wall here")
 
-            if position[0] not in range(1, 9) or position[1] not in range(1, 9):
-                raise QuoridorError(f"Position {position} is invalid")
+            if self._murs_v & géo.chevauchements_v[centre]:
+                raise QuoridorError("There is already a wall above/below")
 
-            self.etat['murs']['verticaux'].append([position[0], position[1]])
+            chemins = self._chemins_libres(
+                self._bloque_haut, self._bloque_droite | géo.coupures_v[centre])
+
+        if not chemins:
+            raise QuoridorError("Wall would block a player from reaching the goal")
+
+        self._placer(joueur, géo.nb_cases + centre if horizontal
+                     else géo.nb_cases + géo.nb_centres + centre)
 
-        self.etat['joueurs'][joueur - 1]["murs"] -= 1
-        self.last_player = joueur
 
+class RenduDifférentiel:
+    """
+    Produit les images successives d'une partie pour un affichage en continu, en ne gardant
+    que les lignes de la représentation (voir Quoridor.__str__) qui ont changé depuis
+    l'image précédente. Le rendu garde ses propres lignes du damier sans les jetons: les murs
+    posés depuis l'image précédente y sont peints un à un, et seules les lignes de ces murs et
+    des jetons déplacés sont produites.
+    """
+
+    def __init__(self):
+        self._géométrie = None
+        self._noms = None
+        self._murs = None
+        self._pions = None
+        self._fond = None
+        self._lignes = None
+
+    def image(self, partie):
+        """
+        Produire les lignes de la représentation de la partie qui diffèrent de l'image
+        précédente; toutes les lignes pour la première image.
 
-def construire_graphe(joueurs, murs_horizontaux, murs_verticaux):
+        :param partie: la partie de Quoridor.
+        :returns: la liste des tuples (numéro de la ligne, texte de la ligne sans fin de ligne),
+        les lignes étant numérotées comme dans str(partie).split('\\n').
+        """
+        géo = partie.géométrie
+        joueur_1, joueur_2 = partie.etat["joueurs"]
+        pion_1, pion_2 = partie._pions
+        murs = (partie._murs_h, partie._murs_v)
+
+        if self._géométrie is not géo:
+            # première image: le damier n'est peint qu'une fois, pour l'image et les lignes
+            noms = (joueur_1["nom"], joueur_2["nom"])
+            lignes = (géo.en_tête.format(*noms) + partie._damier().decode('ascii')
+                      + géo.pied).split("\n")
+            self._géométrie, self._noms, self._murs, self._pions = (
+                géo, noms, murs, (pion_1, pion_2))
+            self._fond = partie._murs_dessinés().decode('ascii').split("\n")
+            self._lignes = lignes[2:-2]
+            return list(enumerate(lignes))
+
+        changements = []
+        if (joueur_1["nom"], joueur_2["nom"]) != self._noms:
+            self._noms = (joueur_1["nom"], joueur_2["nom"])
+            changements.append((0, géo.en_tête.format(*self._noms).split("\n")[0]))
+
+        # un jeton sur la rangée y occupe la ligne 2 * (taille - y) du damier
+        taille = géo.taille
+        ligne_1, ligne_2 = 2 * (taille - 1 - pion_1 // taille), 2 * (taille - 1 - pion_2 // taille)
+        avant_1, avant_2 = self._pions
+        touchées = []
+        if avant_1 != pion_1:
+            touchées += (2 * (taille - 1 - avant_1 // taille), ligne_1)
+        if avant_2 != pion_2:
+            touchées += (2 * (taille - 1 - avant_2 // taille), ligne_2)
+        self._pions = (pion_1, pion_2)
+        if murs != self._murs:
+            touchées += self._peindre_murs(partie, murs)
+        if not touchées:
+            return changements
+
+        colonne = géo.marge + 3
+        colonne_1, colonne_2 = 4 * (pion_1 % taille) + colonne, 4 * (pion_2 % taille) + colonne
+        fond, lignes = self._fond, self._lignes
+        for i in sorted(set(touchées)):
+            texte = fond[i]
+            if i == ligne_1:
+                texte = texte[:colonne_1] + "1" + texte[colonne_1 + 1:]
+            if i == ligne_2:
+                texte = texte[:colonne_2] + "2" + texte[colonne_2 + 1:]
+            if texte != lignes[i]:
+                lignes[i] = texte
+                changements.append((2 + i, texte))
+        return changements
+
+    def _peindre_murs(self, partie, murs):
+        """
+        Met les lignes du damier sans les jetons à jour avec les murs de la partie.
+
+        :returns: la liste des indices des lignes du damier où un mur a été posé ou retiré.
+        """
+        géo = partie.géométrie
+        taille, colonne = géo.taille, géo.marge + 2
+        (avant_h, avant_v), (murs_h, murs_v) = self._murs, murs
+        self._murs = murs
+        fond = self._fond
+        # un mur retiré (annuler ou nouvelle partie): les murs sont repeints au complet
+        retrait = avant_h & ~murs_h or avant_v & ~murs_v
+        if retrait:
+            fond[:] = partie._murs_dessinés().decode('ascii').split("\n")
+
+        # les murs changés sont peu nombreux: leurs bits sont extraits un à un
+        touchées = []
+        changés = murs_h ^ avant_h
+        while changés:
+            bit = changés & -changés
+            changés ^= bit
+            centre = bit.bit_length() - 1
+            # un mur horizontal occupe la ligne entre ses deux rangées
+            i = 2 * (taille - centre // (taille - 1) - 2) + 1
+            touchées.append(i)
+            if not retrait:
+                début = 4 * (centre % (taille - 1)) + colonne
+                # comme dans dessiner_murs, un mur vertical croisé garde son milieu
+                milieu = "|" if fond[i][début + 3] == "|" else "-"
+                fond[i] = fond[i][:début] + "---" + milieu + "---" + fond[i][début + 7:]
+        changés = murs_v ^ avant_v
+        while changés:
+            bit = changés & -changés
+            changés ^= bit
+            centre = bit.bit_length() - 1
+            # un mur vertical occupe les lignes de ses deux cases et l'espace entre elles
+            haut = 2 * (taille - centre // (taille - 1) - 2)
+            touchées += (haut, haut + 1, haut + 2)
+            if not retrait:
+                début = 4 * (centre % (taille - 1)) + colonne + 3
+                for i in (haut, haut + 1, haut + 2):
+                    fond[i] = fond[i][:début] + "|" + fond[i][début + 1:]
+        return touchées
+
+
+def dessiner_murs(murs_horizontaux, murs_verticaux, taille=TAILLE):
+    """
+    Peint les murs dans une copie du gabarit du damier de Quoridor.__str__.
+
+    :param murs_horizontaux: une liste des positions (x,y) des murs horizontaux.
+    :param murs_verticaux: une liste des positions (x,y) des murs verticaux.
+    :param taille: la taille du damier.
+    :returns: les lignes du damier, sans les jetons, en octets ascii.
+    """
+    géo = géométrie(taille)
+    largeur, colonne = géo.largeur_ligne, géo.marge - 1
+    grille = bytearray(géo.gabarit)
+    for x, y in murs_horizontaux:
+        début = (2 * (taille - y) + 1) * largeur + 4 * x + colonne - 1
+        grille[début:début + 7] = b"-------"
+    # un mur vertical occupe la même colonne sur trois lignes consécutives
+    for x, y in murs_verticaux:
+        début = 2 * (taille - y - 1) * largeur + 4 * x + colonne - 2
+        grille[début:début + 2 * largeur + 1:largeur] = b"|||"
+    return bytes(grille)
+
+
+class Graphe:
+    """
+    Graphe orienté sans dépendance externe, qui offre la partie de l'interface de
+    networkx.DiGraph dont se sert ce module. Les noeuds et leurs successeurs sont énumérés
+    dans leur ordre d'ajout, comme dans networkx.
+    """
+
+    def __init__(self):
+        self._successeurs = {}
+        self._prédécesseurs = {}
+
+    def __contains__(self, noeud):
+        return noeud in self._successeurs
+
+    def __iter__(self):
+        return iter(self._successeurs)
+
+    def __len__(self):
+        return len(self._successeurs)
+
+    @property
+    def nodes(self):
+        """La liste des noeuds."""
+        return list(self._successeurs)
+
+    @property
+    def edges(self):
+        """La liste des arcs (départ, arrivée)."""
+        return [(départ, arrivée) for départ, successeurs in self._successeurs.items()
+                for arrivée in successeurs]
+
+    def add_node(self, noeud):
+        """Ajoute un noeud, s'il n'y est pas déjà."""
+        if noeud not in self._successeurs:
+            self._successeurs[noeud] = {}
+            self._prédécesseurs[noeud] = {}
+
+    def add_edge(self, départ, arrivée):
+        """Ajoute un arc, et ses extrémités au besoin."""
+        self.add_node(départ)
+        self.add_node(arrivée)
+        self._successeurs[départ][arrivée] = None
+        self._prédécesseurs[arrivée][départ] = None
+
+    def add_edges_from(self, arcs):
+        """Ajoute chacun des arcs (départ, arrivée)."""
+        for départ, arrivée in arcs:
+            self.add_edge(départ, arrivée)
+
+    def remove_edge(self, départ, arrivée):
+        """
+        Retire un arc.
+
+        :raises QuoridorError: l'arc n'est pas dans le graphe.
+        """
+        try:
+            del self._successeurs[départ][arrivée]
+            del self._prédécesseurs[arrivée][départ]
+        except KeyError:
+            raise QuoridorError(f"Edge {départ}-{arrivée} is not in the graph") from None
+
+    def remove_edges_from(self, arcs):
+        """Retire chacun des arcs (départ, arrivée), en ignorant ceux qui n'y sont pas."""
+        for départ, arrivée in arcs:
+            if self.has_edge(départ, arrivée):
+                self.remove_edge(départ, arrivée)
+
+    def has_node(self, noeud):
+        """:returns: True si le noeud est dans le graphe."""
+        return noeud in self._successeurs
+
+    def has_edge(self, départ, arrivée):
+        """:returns: True si l'arc est dans le graphe."""
+        return arrivée in self._successeurs.get(départ, ())
+
+    def successors(self, noeud):
+        """
+        :returns: un itérateur sur les successeurs du noeud.
+        :raises QuoridorError: le noeud n'est pas dans le graphe.
+        """
+        try:
+            return iter(self._successeurs[noeud])
+        except KeyError:
+            raise QuoridorError(f"Node {noeud} is not in the graph") from None
+
+    def predecessors(self, noeud):
+        """
+        :returns: un itérateur sur les prédécesseurs du noeud.
+        :raises QuoridorError: le noeud n'est pas dans le graphe.
+        """
+        try:
+            return iter(self._prédécesseurs[noeud])
+        except KeyError:
+            raise QuoridorError(f"Node {noeud} is not in the graph") from None
+
+    def number_of_nodes(self):
+        """:returns: le nombre de noeuds."""
+        return len(self._successeurs)
+
+    def number_of_edges(self):
+        """:returns: le nombre d'arcs."""
+        return sum(len(successeurs) for successeurs in self._successeurs.values())
+
+    def plus_court_chemin(self, départ, arrivée):
+        """
+        Produire un plus court chemin, par un parcours en largeur.
+
+        :param départ: le noeud de départ.
+        :param arrivée: le noeud d'arrivée.
+        :returns: la liste des noeuds du chemin, départ et arrivée compris.
+        :raises QuoridorError: aucun chemin ne relie les deux noeuds.
+        """
+        if départ not in self._successeurs or arrivée not in self._successeurs:
+            raise QuoridorError(f"No path between {départ} and {arrivée}")
+
+        parents = {départ: None}
+        file = [départ]
+        # la file grandit pendant qu'on la parcourt
+        for noeud in file:
+            if noeud == arrivée:
+                chemin = []
+                while noeud is not None:
+                    chemin.append(noeud)
+                    noeud = parents[noeud]
+                return chemin[::-1]
+            for successeur in self._successeurs[noeud]:
+                if successeur not in parents:
+                    parents[successeur] = noeud
+                    file.append(successeur)
+
+        raise QuoridorError(f"No path between {départ} and {arrivée}")
+
+
+# Moteur des graphes de déplacements: Graphe par défaut, ou networkx.DiGraph pour comparer.
+# networkx n'est importé que lorsqu'il est choisi.
+MOTEURS = ('natif', 'networkx')
+_CLASSE_GRAPHE = Graphe
+
+
+def choisir_moteur(nom):
+    """
+    Choisir la classe des graphes créés par construire_graphe et Quoridor.graphe. Les
+    graphes déjà créés ne changent pas.
+
+    :param nom: 'natif' pour Graphe, ou 'networkx' pour networkx.DiGraph.
+    :raises QuoridorError: le moteur est inconnu.
+    """
+    global _CLASSE_GRAPHE
+
+    if nom == 'natif':
+        _CLASSE_GRAPHE = Graphe
+    elif nom == 'networkx':
+        import networkx
+        _CLASSE_GRAPHE = networkx.DiGraph
+    else:
+        raise QuoridorError(f"Unknown pathfinding backend {nom!r}, expected one of {MOTEURS}")
+
+
+def plus_court_chemin(graphe, départ, arrivée):
+    """
+    Produire un plus court chemin dans un graphe de l'un ou l'autre moteur.
+
+    :param graphe: un Graphe ou un networkx.DiGraph.
+    :param départ: le noeud de départ.
+    :param arrivée: le noeud d'arrivée.
+    :returns: la liste des noeuds du chemin, départ et arrivée compris.
+    :raises QuoridorError: aucun chemin ne relie les deux noeuds.
+    """
+    if isinstance(graphe, Graphe):
+        return graphe.plus_court_chemin(départ, arrivée)
+
+    import networkx
+    try:
+        return networkx.shortest_path(graphe, départ, arrivée)
+    except (networkx.NetworkXNoPath, networkx.NodeNotFound):
+        raise QuoridorError(f"No path between {départ} and {arrivée}") from None
+
+
+def chemin_existe(graphe, départ, arrivée):
+    """
+    :param graphe: un Graphe ou un networkx.DiGraph.
+    :returns: True si un chemin relie le noeud de départ au noeud d'arrivée.
+    """
+    try:
+        plus_court_chemin(graphe, départ, arrivée)
+    except QuoridorError:
+        return False
+    return True
+
+
+def construire_graphe(joueurs, murs_horizontaux, murs_verticaux, taille=TAILLE):
     """
     Crée le graphe des déplacements admissibles pour les joueurs.
 
     :param joueurs: une liste des positions (x,y) des joueurs.
     :param murs_horizontaux: une liste des positions (x,y) des murs horizontaux.
     :param murs_verticaux: une liste des positions (x,y) des murs verticaux.
-    :returns: le graphe bidirectionnel (en networkX) des déplacements admissibles.
+    :param taille: la taille du damier.
+    :returns: le graphe orienté des déplacements admissibles, un Graphe ou un
+    networkx.DiGraph selon le moteur choisi (voir choisir_moteur).
+    """
+
+    graphe = construire_damier(murs_horizontaux, murs_verticaux, taille)
+
+    # s'assurer que les positions des joueurs sont bien des tuples (et non des listes)
+    j1, j2 = tuple(joueurs[0]), tuple(joueurs[1])
+
+    # traiter le cas des joueurs adjacents
+    ajouter_liens_sauteurs(graphe, j1, j2)
+
+    # ajouter les noeuds objectifs des deux joueurs
+    ajouter_objectifs(graphe, taille)
+
+    return graphe
+
+
+def construire_damier(murs_horizontaux, murs_verticaux, taille=TAILLE):
+    """
+    Crée le graphe des déplacements d'une case à l'autre, sans tenir compte des joueurs.
+
+    :param murs_horizontaux: une liste des positions (x,y) des murs horizontaux.
+    :param murs_verticaux: une liste des positions (x,y) des murs verticaux.
+    :param taille: la taille du damier.
+    :returns: le graphe orienté des déplacements entre cases voisines.
     """
 
-    graphe = nx.DiGraph()
+    graphe = _CLASSE_GRAPHE()
 
     # pour chaque colonne du damier
-    for x in range(1, 10):
+    for x in range(1, taille + 1):
         # pour chaque ligne du damier
-        for y in range(1, 10):
+        for y in range(1, taille + 1):
             # ajouter les arcs de tous les déplacements possibles pour cette tuile
             if x > 1:
                 graphe.add_edge((x, y), (x - 1, y))
-            if x < 9:
+            if x < taille:
                 graphe.add_edge((x, y), (x + 1, y))
             if y > 1:
                 graphe.add_edge((x, y), (x, y - 1))
-            if y < 9:
+            if y < taille:
                 graphe.add_edge((x, y), (x, y + 1))
 
-    # retirer tous les arcs qui croisent les murs horizontaux
+    # retirer tous les arcs qui croisent les murs
     for x, y in murs_horizontaux:
-        graphe.remove_edge((x, y - 1), (x, y))
-        graphe.remove_edge((x, y), (x, y - 1))
-        graphe.remove_edge((x + 1, y - 1), (x + 1, y))
-        graphe.remove_edge((x + 1, y), (x + 1, y - 1))
+        retirer_arcs_mur(graphe, (x, y), 'horizontal')
 
-    # retirer tous les arcs qui croisent les murs verticaux
     for x, y in murs_verticaux:
-        graphe.remove_edge((x - 1, y), (x, y))
-        graphe.remove_edge((x, y), (x - 1, y))
-        graphe.remove_edge((x - 1, y + 1), (x, y + 1))
-        graphe.remove_edge((x, y + 1), (x - 1, y + 1))
+        retirer_arcs_mur(graphe, (x, y), 'vertical')
 
-    # s'assurer que les positions des joueurs sont bien des tuples (et non des listes)
-    j1, j2 = tuple(joueurs[0]), tuple(joueurs[1])
+    return graphe
 
-    # traiter le cas des joueurs adjacents
-    if j2 in graphe.successors(j1) or j1 in graphe.successors(j2):
 
-        # retirer les liens entre les joueurs
-        graphe.remove_edge(j1, j2)
-        graphe.remove_edge(j2, j1)
+def arcs_mur(position, orientation):
+    """
+    Énumère les quatre arcs qui croisent un mur.
 
-        def ajouter_lien_sauteur(noeud, voisin):
-            """
-            :param noeud: noeud de départ du lien.
-            :param voisin: voisin par dessus lequel il faut sauter.
-            """
-            saut = 2*voisin[0]-noeud[0], 2*voisin[1]-noeud[1]
+    :param position: le tuple (x, y) de la position du mur.
+    :param orientation: l'orientation du mur ('horizontal' ou 'vertical').
+    :returns: la liste des arcs (départ, arrivée).
+    """
+    x, y = position
 
-            if saut in graphe.successors(voisin):
-                # ajouter le saut en ligne droite
-                graphe.add_edge(noeud, saut)
+    if orientation == 'horizontal':
+        return [((x, y - 1), (x, y)), ((x, y), (x, y - 1)),
+                ((x + 1, y - 1), (x + 1, y)), ((x + 1, y), (x + 1, y - 1))]
 
-            else:
-                # ajouter les sauts en diagonale
-                for saut in graphe.successors(voisin):
-                    graphe.add_edge(noeud, saut)
+    return [((x - 1, y), (x, y)), ((x, y), (x - 1, y)),
+            ((x - 1, y + 1), (x, y + 1)), ((x, y + 1), (x - 1, y + 1))]
 
-        ajouter_lien_sauteur(j1, j2)
-        ajouter_lien_sauteur(j2, j1)
 
-    # ajouter les noeuds objectifs des deux joueurs
-    for x in range(1, 10):
-        graphe.add_edge((x, 9), 'B1')
+def retirer_arcs_mur(graphe, position, orientation):
+    """
+    Retire du graphe les quatre arcs qui croisent un mur.
+
+    :param graphe: le graphe des déplacements.
+    :param position: le tuple (x, y) de la position du mur.
+    :param orientation: l'orientation du mur ('horizontal' ou 'vertical').
+    """
+    for départ, arrivée in arcs_mur(position, orientation):
+        graphe.remove_edge(départ, arrivée)
+
+
+def ajouter_liens_sauteurs(graphe, j1, j2):
+    """
+    Remplace les arcs entre deux joueurs adjacents par les sauts admissibles.
+
+    :param graphe: le graphe des déplacements.
+    :param j1: le tuple (x, y) de la position du premier joueur.
+    :param j2: le tuple (x, y) de la position du second joueur.
+    :returns: la liste des arcs de saut ajoutés, ou None si les joueurs ne sont pas adjacents.
+    """
+    if j2 not in graphe.successors(j1) and j1 not in graphe.successors(j2):
+        return None
+
+    # retirer les liens entre les joueurs
+    graphe.remove_edge(j1, j2)
+    graphe.remove_edge(j2, j1)
+
+    sauts = []
+
+    def ajouter_lien_sauteur(noeud, voisin):
+        """
+        :param noeud: noeud de départ du lien.
+        :param voisin: voisin par dessus lequel il faut sauter.
+        """
+        saut = 2*voisin[0]-noeud[0], 2*voisin[1]-noeud[1]
+
+        if saut in graphe.successors(voisin):
+            # ajouter le saut en ligne droite
+            sauts.append((noeud, saut))
+
+        else:
+            # ajouter les sauts en diagonale (jamais vers un noeud objectif)
+            for saut in graphe.successors(voisin):
+                if isinstance(saut, tuple):
+                    sauts.append((noeud, saut))
+
+    ajouter_lien_sauteur(j1, j2)
+    ajouter_lien_sauteur(j2, j1)
+    graphe.add_edges_from(sauts)
+
+    return sauts
+
+
+def retirer_liens_sauteurs(graphe, j1, j2, sauts):
+    """
+    Annule les modifications faites au graphe par ajouter_liens_sauteurs.
+
+    :param graphe: le graphe des déplacements.
+    :param j1: le tuple (x, y) de la position du premier joueur.
+    :param j2: le tuple (x, y) de la position du second joueur.
+    :param sauts: la liste des arcs de saut retournée par ajouter_liens_sauteurs.
+    """
+    if sauts is None:
+        return
+
+    graphe.remove_edges_from(sauts)
+    graphe.add_edge(j1, j2)
+    graphe.add_edge(j2, j1)
+
+
+def ajouter_objectifs(graphe, taille=TAILLE):
+    """
+    Ajoute au graphe les noeuds objectifs 'B1' et 'B2' des deux joueurs.
+
+    :param graphe: le graphe des déplacements.
+    :param taille: la taille du damier.
+    """
+    for x in range(1, taille + 1):
+        graphe.add_edge((x, taille), 'B1')
         graphe.add_edge((x, 1), 'B2')
 
-    return graphe
+
+def calculer_distances(arêtes, objectifs, taille=TAILLE):
+    """
+    Calcule par un parcours en largeur la distance de chaque case à une ligne d'arrivée.
+
+    :param arêtes: le masque réuni des arêtes bloquées.
+    :param objectifs: les indices des cases de la ligne d'arrivée.
+    :param taille: la taille du damier.
+    :returns: la liste des distances indexée par case (le nombre de cases du damier, soit
+    INFINI sur le damier 9x9, pour une case isolée).
+    """
+    géo = géométrie(taille)
+    voisins = géo.voisins
+    distances = [géo.infini] * géo.nb_cases
+    file = list(objectifs)
+    for case in file:
+        distances[case] = 0
+
+    # la file grandit pendant qu'on la parcourt
+    for case in file:
+        suivante = distances[case] + 1
+        for voisin, arête in voisins[case]:
+            if distances[voisin] > suivante and not arêtes >> arête & 1:
+                distances[voisin] = suivante
+                file.append(voisin)
+
+    return distances
+
+
+def inonder(départ, ouvert_haut, ouvert_droite, taille=TAILLE):
+    """
+    Étend un ensemble de cases à toutes les cases qu'on peut en atteindre.
+
+    Les masques peuvent contenir plusieurs plateaux côte à côte, inondés simultanément.
+
+    :param départ: le masque des cases de départ.
+    :param ouvert_haut: le masque des cases dont l'arête vers le haut est ouverte.
+    :param ouvert_droite: le masque des cases dont l'arête vers la droite est ouverte.
+    :param taille: la taille du damier.
+    :returns: le masque des cases atteintes.
+    """
+    atteint = départ
+    while True:
+        suivant = (atteint
+                   | (atteint & ouvert_haut) << taille | (atteint >> taille) & ouvert_haut
+                   | (atteint & ouvert_droite) << 1 | (atteint >> 1) & ouvert_droite)
+        if suivant == atteint:
+            return atteint
+        atteint = suivant
+
+
+def mettre_à_jour_distances(distances, arêtes, paires, taille=TAILLE):
+    """
+    Met à jour sur place une carte de distances après la coupure de quelques arêtes.
+
+    Seules les cases qui ont perdu tous leurs plus courts chemins sont recalculées: elles
+    sont d'abord repérées par ordre de distance croissante, puis reçoivent leur nouvelle
+    distance à partir de leurs voisines restées valides.
+
+    :param distances: la carte de distances, à jour avant la coupure.
+    :param arêtes: le masque réuni des arêtes bloquées, après la coupure.
+    :param paires: les paires de cases dont l'arête vient d'être coupée.
+    :param taille: la taille du damier.
+    :returns: la liste des (case, ancienne distance) des cases modifiées.
+    """
+    géo = géométrie(taille)
+    voisins, infini = géo.voisins, géo.infini
+    tas = []
+    for case_a, case_b in paires:
+        if distances[case_a] == distances[case_b] + 1:
+            tas.append((distances[case_a], case_a))
+        elif distances[case_b] == distances[case_a] + 1:
+            tas.append((distances[case_b], case_b))
+    heapq.heapify(tas)
+
+    # repérer les cases qui n'ont plus de voisine ouverte plus proche de l'arrivée
+    invalides = {}
+    while tas:
+        distance, case = heapq.heappop(tas)
+        if case in invalides:
+            continue
+        if any(distances[voisin] == distance - 1 and voisin not in invalides
+               and not arêtes >> arête & 1 for voisin, arête in voisins[case]):
+            continue
+        invalides[case] = distance
+        for voisin, arête in voisins[case]:
+            if distances[voisin] == distance + 1 and not arêtes >> arête & 1:
+                heapq.heappush(tas, (distance + 1, voisin))
+
+    if not invalides:
+        return []
+
+    # recalculer les cases invalides à partir de leurs voisines valides
+    for case in invalides:
+        distances[case] = infini
+    for case in invalides:
+        for voisin, arête in voisins[case]:
+            if distances[voisin] + 1 < distances[case] and not arêtes >> arête & 1:
+                distances[case] = distances[voisin] + 1
+        if distances[case] < infini:
+            tas.append((distances[case], case))
+    heapq.heapify(tas)
+
+    while tas:
+        distance, case = heapq.heappop(tas)
+        if distance > distances[case]:
+            continue
+        for voisin, arête in voisins[case]:
+            if distances[voisin] > distance + 1 and not arêtes >> arête & 1:
+                distances[voisin] = distance + 1
+                heapq.heappush(tas, (distance + 1, voisin))
+
+    return list(invalides.items())
+
+
+def encoder_coup(type_coup, position, taille=TAILLE):
+    """
+    Produit le code entier d'un coup, tel qu'utilisé par coups_légaux.
+
+    Un déplacement est codé par l'indice de sa case d'arrivée, un mur horizontal par
+    NB_CASES plus l'indice de son centre, et un mur vertical par NB_CASES + NB_CENTRES
+    plus l'indice de son centre, ces nombres étant ceux du damier de la partie.
+
+    :param type_coup: 'D' pour un déplacement, 'MH' ou 'MV' pour un mur horizontal ou vertical.
+    :param position: le tuple (x, y) de la case d'arrivée ou de la position du mur.
+    :param taille: la taille du damier.
+    :returns: le code du coup.
+    :raises QuoridorError: le type de coup est invalide.
+    """
+    géo = géométrie(taille)
+    x, y = position
+    if type_coup == 'D':
+        return géo.case(x, y)
+    if type_coup == 'MH':
+        return géo.nb_cases + géo.centre(x, y - 1)
+    if type_coup == 'MV':
+        return géo.nb_cases + géo.nb_centres + géo.centre(x - 1, y)
+    raise QuoridorError(f"Move type {type_coup} is invalid")
+
+
+def décoder_coup(code, taille=TAILLE):
+    """
+    Retrouve le type et la position d'un coup à partir de son code.
+
+    :param code: le code du coup (voir encoder_coup).
+    :param taille: la taille du damier.
+    :returns: le tuple (type, (x, y)), où type vaut 'D', 'MH' ou 'MV'.
+    """
+    géo = géométrie(taille)
+    if code < géo.nb_cases:
+        return 'D', géo.coordonnées[code]
+    centre = (code - géo.nb_cases) % géo.nb_centres
+    x, y = centre % (taille - 1) + 1, centre // (taille - 1) + 1
+    if code < géo.nb_cases + géo.nb_centres:
+        return 'MH', (x, y + 1)
+    return 'MV', (x + 1, y)
+
+
+def _énumérer_bits(masque, décalage=0):
+    """Retourne la liste croissante des indices des bits à 1 du masque, plus le décalage."""
+    return [décalage + i for i, chiffre in enumerate(bin(masque)[:1:-1]) if chiffre == '1']
 
 
 def test_players_numbers(joueur):
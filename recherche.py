@@ -0,0 +1,272 @@
+"""Ce module contient la recherche alpha-bêta qui permet à Quoridor.jouer_coup de bien jouer"""
+import time
+
+from quoridor import QuoridorError, other_player
+
+# score d'une partie gagnée, diminué du nombre de demi-coups nécessaires pour y arriver
+GAGNÉ = 100000
+_SEUIL_GAGNÉ = GAGNÉ - 1000
+
+# nature de la borne conservée dans la table de transposition
+EXACT, MINORANT, MAJORANT = 0, 1, 2
+
+
+class _BudgetÉpuisé(Exception):
+    """Interrompt la recherche lorsque le budget de temps ou de noeuds est épuisé"""
+
+
+class TableDeTransposition:
+    """
+    Table de taille fixe des positions déjà évaluées, indexée par empreinte de Zobrist.
+
+    Chaque case garde une seule entrée. Une nouvelle entrée remplace l'ancienne si celle-ci
+    vient d'une recherche précédente ou si elle a été obtenue à une profondeur moindre.
+    """
+
+    def __init__(self, taille=1 << 18):
+        """
+        :param taille: le nombre d'entrées, arrondi à la puissance de deux inférieure.
+        """
+        taille = 1 << (max(taille, 1).bit_length() - 1)
+        self.masque = taille - 1
+        self.empreintes = [None] * taille
+        self.entrées = [None] * taille
+        self.génération = 0
+
+    def nouvelle_recherche(self):
+        """Marque les entrées existantes comme venant d'une recherche précédente."""
+        self.génération += 1
+
+    def lire(self, empreinte):
+        """
+        :returns: l'entrée (profondeur, score, borne, coup, génération) de la position, ou None.
+        """
+        indice = empreinte & self.masque
+        if self.empreintes[indice] == empreinte:
+            return self.entrées[indice]
+        return None
+
+    def écrire(self, empreinte, profondeur, score, borne, coup):
+        """Conserve le résultat d'une recherche selon la politique de remplacement."""
+        indice = empreinte & self.masque
+        ancienne = self.entrées[indice]
+        if (ancienne is None or ancienne[4] != self.génération or ancienne[0] <= profondeur
+                or self.empreintes[indice] == empreinte):
+            self.empreintes[indice] = empreinte
+            self.entrées[indice] = (profondeur, score, borne, coup, self.génération)
+
+
+class RechercheAlphaBeta:
+    """
+    Stratégie pour Quoridor.jouer_coup: recherche alpha-bêta en approfondissement itératif.
+
+    Les coups sont ordonnés par le coup de la table de transposition, puis les déplacements
+    qui rapprochent le plus le jeton de son arrivée, puis les murs qui ont le plus souvent
+    provoqué une coupure. Seuls les murs qui coupent le plus court chemin de l'adversaire
+    sont considérés, les autres ne pouvant pas l'allonger.
+    """
+
+    def __init__(self, temps=1.0, noeuds=None, profondeur_max=64, table=None):
+        """
+        :param temps: le budget de temps en secondes par coup, ou None pour aucune limite.
+        :param noeuds: le budget en nombre de noeuds visités par coup, ou None.
+        :param profondeur_max: la profondeur maximale de l'approfondissement itératif.
+        :param table: la TableDeTransposition à utiliser; une nouvelle table par défaut.
+        """
+        if temps is None and noeuds is None and profondeur_max >= 64:
+            raise QuoridorError("The search needs a time, node or depth budget")
+
+        self.temps = temps
+        self.noeuds = noeuds
+        self.profondeur_max = profondeur_max
+        self.table = TableDeTransposition() if table is None else table
+        self.historique = {}
+        self.statistiques = {}
+        self._compteur = 0
+        self._limite_noeuds = None
+        self._échéance = None
+
+    def choisir_coup(self, partie, joueur):
+        """
+        Choisir le meilleur coup du joueur dans le budget alloué. La partie est explorée sur
+        place avec jouer et annuler, et se retrouve inchangée au retour.
+
+        :param partie: la partie de Quoridor.
+        :param joueur: le numéro du joueur (1 ou 2).
+        :returns: le code du coup choisi (voir quoridor.encoder_coup).
+        :raises QuoridorError: le joueur n'a aucun coup légal.
+        """
+        début = time.perf_counter()
+        self._échéance = None if self.temps is None else début + self.temps
+        self._limite_noeuds = self.noeuds
+        self._compteur = 0
+        self.table.nouvelle_recherche()
+
+        coups = self._ordonner(partie, joueur, partie.coups_légaux(joueur), None)
+        if not coups:
+            raise QuoridorError(f"Player {joueur} has no legal move")
+
+        meilleur, score, complétée = coups[0], None, 0
+        try:
+            for profondeur in range(1, self.profondeur_max + 1):
+                meilleur, score = self._racine(partie, joueur, profondeur, meilleur)
+                complétée = profondeur
+                if abs(score) >= _SEUIL_GAGNÉ:
+                    break
+        except _BudgetÉpuisé:
+            pass
+
+        durée = time.perf_counter() - début
+        self.statistiques = {
+            'noeuds': self._compteur,
+            'durée': durée,
+            'noeuds_par_seconde': self._compteur / durée if durée > 0 else 0.0,
+            'profondeur': complétée,
+            'score': score,
+        }
+        return meilleur
+
+    def _racine(self, partie, joueur, profondeur, précédent):
+        """Recherche complète à la racine; retourne le meilleur coup et son score."""
+        alpha, beta = -GAGNÉ - 1, GAGNÉ + 1
+        coups = self._ordonner(partie, joueur, partie.coups_légaux(joueur), précédent)
+        meilleur = coups[0]
+
+        for coup in coups:
+            empreinte = self._jouer(partie, coup, joueur)
+            try:
+                score = -self._négamax(partie, other_player(joueur), profondeur - 1, 1,
+                                       -beta, -alpha, empreinte)
+            finally:
+                partie.annuler()
+
+            if score > alpha:
+                alpha, meilleur = score, coup
+
+        self.table.écrire(partie.empreinte(), profondeur, alpha, EXACT, meilleur)
+        return meilleur, alpha
+
+    def _négamax(self, partie, joueur, profondeur, ply, alpha, beta, empreinte):
+        """
+        Évalue la position du point de vue du joueur au trait.
+
+        :param ply: le nombre de demi-coups joués depuis la racine.
+        :param empreinte: l'empreinte de Zobrist de la position.
+        """
+        self._compteur += 1
+        if self._limite_noeuds is not None and self._compteur >= self._limite_noeuds:
+            raise _BudgetÉpuisé
+        if self._échéance is not None and time.perf_counter() >= self._échéance:
+            raise _BudgetÉpuisé
+
+        # l'adversaire vient d'atteindre sa ligne d'arrivée
+        if partie.distance(other_player(joueur)) == 0:
+            return ply - GAGNÉ
+
+        if profondeur == 0:
+            return self.évaluer(partie, joueur)
+
+        alpha_initial = alpha
+        coup_table = None
+        entrée = self.table.lire(empreinte)
+        if entrée is not None:
+            profondeur_table, score, borne, coup_table = entrée[:4]
+            if profondeur_table >= profondeur:
+                score = _depuis_table(score, ply)
+                if borne == EXACT:
+                    return score
+                if borne == MINORANT:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        meilleur_score, meilleur = -GAGNÉ - 1, None
+        for coup in self._ordonner(partie, joueur, partie.coups_légaux(joueur), coup_table):
+            suivante = self._jouer(partie, coup, joueur)
+            try:
+                score = -self._négamax(partie, other_player(joueur), profondeur - 1, ply + 1,
+                                       -beta, -alpha, suivante)
+            finally:
+                partie.annuler()
+
+            if score > meilleur_score:
+                meilleur_score, meilleur = score, coup
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if coup >= partie.géométrie.nb_cases:
+                            self.historique[coup] = self.historique.get(coup, 0) + profondeur ** 2
+                        break
+
+        if meilleur_score <= alpha_initial:
+            borne = MAJORANT
+        elif meilleur_score >= beta:
+            borne = MINORANT
+        else:
+            borne = EXACT
+        self.table.écrire(empreinte, profondeur, _vers_table(meilleur_score, ply), borne, meilleur)
+
+        return meilleur_score
+
+    @staticmethod
+    def _jouer(partie, coup, joueur):
+        """Joue le coup et retourne l'empreinte de la position obtenue."""
+        partie.jouer(coup, joueur)
+        return partie.empreinte()
+
+    def _ordonner(self, partie, joueur, coups, premier):
+        """
+        Trie les coups du plus prometteur au moins prometteur, en ne gardant que les murs qui
+        coupent le plus court chemin de l'adversaire.
+        """
+        cartes = partie.carte_distances(joueur)
+        utiles = set(partie.murs_sur_chemin(other_player(joueur)))
+        nb_cases = partie.géométrie.nb_cases
+        déplacements = sorted((coup for coup in coups if coup < nb_cases), key=cartes.__getitem__)
+        murs = sorted((coup for coup in coups if coup in utiles),
+                      key=lambda coup: -self.historique.get(coup, 0))
+        ordonnés = déplacements + murs
+
+        if not ordonnés:
+            ordonnés = list(coups)
+
+        if premier is not None and premier in ordonnés:
+            ordonnés.remove(premier)
+            ordonnés.insert(0, premier)
+
+        return ordonnés
+
+    @staticmethod
+    def évaluer(partie, joueur):
+        """
+        Évalue une position du point de vue du joueur: l'écart entre les longueurs des plus
+        courts chemins des deux joueurs, puis, à égalité, les murs restants.
+
+        :param partie: la partie de Quoridor.
+        :param joueur: le numéro du joueur (1 ou 2).
+        :returns: un score entier, positif si la position favorise le joueur.
+        """
+        adversaire = other_player(joueur)
+        murs = partie.etat['joueurs']
+        return (100 * (partie.distance(adversaire) - partie.distance(joueur))
+                + 10 * (murs[joueur - 1]['murs'] - murs[adversaire - 1]['murs']))
+
+
+def _vers_table(score, ply):
+    """Exprime un score de victoire par rapport à la position plutôt qu'à la racine."""
+    if score >= _SEUIL_GAGNÉ:
+        return score + ply
+    if score <= -_SEUIL_GAGNÉ:
+        return score - ply
+    return score
+
+
+def _depuis_table(score, ply):
+    """Opération inverse de _vers_table."""
+    if score >= _SEUIL_GAGNÉ:
+        return score - ply
+    if score <= -_SEUIL_GAGNÉ:
+        return score + ply
+    return score
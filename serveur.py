@@ -0,0 +1,530 @@
+"""
+Serveur de sessions: héberge de nombreuses parties simultanées entre un humain et une IA.
+
+Les parties sont créées, retrouvées et expirées par leur identifiant. Les clients envoient
+leurs commandes sur un socket local, une ligne JSON par commande, et reçoivent une ligne
+JSON par réponse. Les coups humains sont joués directement dans la boucle d'événements;
+les coups de l'IA sont calculés dans un exécuteur (des processus, par défaut) à partir de
+la position sous forme binaire, de sorte qu'une recherche lente ne retarde jamais la
+réponse à un coup humain.
+
+Utilisation, depuis la racine du dépôt:
+
+    python serveur.py [--hôte 127.0.0.1] [--port 8765] [--unix chemin] [--durée-vie 600]
+                      [--processus N] [--max-sessions N]
+
+Commandes, avec la clé facultative 'id' recopiée dans la réponse:
+
+    {"commande": "créer", "ia": "alphabeta:0.1", "humain": 1, "noms": ["moi", "IA"]}
+    {"commande": "déplacer", "partie": "...", "position": [5, 2]}
+    {"commande": "mur", "partie": "...", "position": [4, 5], "orientation": "horizontal"}
+    {"commande": "état", "partie": "..."}
+    {"commande": "attendre", "partie": "..."}
+    {"commande": "mémoire", "partie": "..."}
+    {"commande": "supprimer", "partie": "..."}
+    {"commande": "statistiques"}
+
+Une réponse contient 'ok', puis les données de la commande ou le message d''erreur'.
+
+Si le calcul d'un coup de l'IA échoue (après un nouvel essai dans un exécuteur neuf si les
+processus ont été perdus), la session est abandonnée: son état le signale avec 'abandonnée'
+et 'erreur_ia', et les coups suivants sont refusés.
+"""
+import argparse
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+import secrets
+import sys
+import time
+
+from autojeu import stratégie_partagée
+from quoridor import (
+    ORIENTATIONS, Géométrie, Quoridor, QuoridorError, encoder_coup, other_player,
+    test_players_numbers,
+)
+
+# nombre de latences conservées pour les statistiques
+_LATENCES = 10000
+# nombre d'essais du calcul d'un coup de l'IA avant d'abandonner la session
+_ESSAIS_IA = 2
+# nombre de parties mesurées entre deux passages de la main à la boucle d'événements
+_TRANCHE_MÉMOIRE = 8
+
+
+def calculer_coup(données, configuration, joueur):
+    """
+    Calculer le coup de l'IA, dans un processus de l'exécuteur.
+
+    :param données: la position, produite par Quoridor.sérialiser.
+    :param configuration: la configuration de l'IA (voir autojeu.créer_stratégie).
+    :param joueur: le numéro du joueur de l'IA (1 ou 2).
+    :returns: le code du coup choisi (voir encoder_coup).
+    """
+    partie = Quoridor.désérialiser(données)
+    stratégie = stratégie_partagée(configuration)
+    if stratégie is None:
+        return encoder_coup('D', partie.next_step(joueur))
+    return stratégie.choisir_coup(partie, joueur)
+
+
+def taille_mémoire(objet, vus=None):
+    """
+    Estimer la mémoire occupée par un objet et tout ce qu'il référence, chaque objet n'étant
+    compté qu'une fois. Les classes, les fonctions et les modules ne sont pas comptés, ni les
+    tables d'une Géométrie atteinte depuis l'objet, partagées par toutes les parties de même
+    taille.
+
+    :param objet: l'objet à mesurer.
+    :param vus: les identifiants des objets déjà comptés.
+    :returns: la taille en octets.
+    """
+    vus = set() if vus is None else vus
+    racine = objet
+    taille = 0
+    à_visiter = [objet]
+
+    while à_visiter:
+        objet = à_visiter.pop()
+        if id(objet) in vus or isinstance(objet, type) or callable(objet):
+            continue
+        if isinstance(objet, Géométrie) and objet is not racine:
+            continue
+        vus.add(id(objet))
+        taille += sys.getsizeof(objet)
+
+        if isinstance(objet, dict):
+            à_visiter.extend(objet.keys())
+            à_visiter.extend(objet.values())
+        elif isinstance(objet, (list, tuple, set, frozenset, deque)):
+            à_visiter.extend(objet)
+        elif not isinstance(objet, (str, bytes, int, float)):
+            if hasattr(objet, '__dict__'):
+                à_visiter.append(vars(objet))
+            for nom in getattr(type(objet), '__slots__', ()):
+                if hasattr(objet, nom):
+                    à_visiter.append(getattr(objet, nom))
+
+    return taille
+
+
+class Session:
+    """Une partie hébergée par le serveur, entre un joueur humain et une IA."""
+
+    __slots__ = ('identifiant', 'partie', 'ia', 'humain', 'trait', 'dernier_accès',
+                 'dernier_coup_ia', 'tâche', 'erreur_ia', 'octets')
+
+    def __init__(self, identifiant, partie, ia, humain):
+        """
+        :param identifiant: l'identifiant de la session.
+        :param partie: la partie de Quoridor.
+        :param ia: la configuration de l'IA (voir autojeu.créer_stratégie).
+        :param humain: le numéro du joueur humain (1 ou 2); le joueur 1 commence.
+        """
+        self.identifiant = identifiant
+        self.partie = partie
+        self.ia = ia
+        self.humain = humain
+        # le joueur qui doit jouer, None si la session est abandonnée
+        self.trait = 1
+        self.dernier_accès = time.monotonic()
+        self.dernier_coup_ia = None
+        self.tâche = None
+        self.erreur_ia = None
+        # la dernière mesure de mémoire(), comptée dans le total du gestionnaire
+        self.octets = 0
+
+    def état(self):
+        """
+        :returns: le dictionnaire JSON de l'état de la session.
+        """
+        gagnant = self.partie.partie_terminée()
+        return {
+            'partie': self.identifiant,
+            'état': self.partie.état_partie(),
+            'trait': None if gagnant else self.trait,
+            'gagnant': gagnant or None,
+            'abandonnée': self.abandonnée(),
+            'ia_en_cours': self.tâche is not None,
+            'dernier_coup_ia': self.dernier_coup_ia,
+            'erreur_ia': self.erreur_ia,
+        }
+
+    def abandonnée(self):
+        """
+        :returns: True si la session a été abandonnée parce que le coup de l'IA n'a pas pu
+        être calculé (voir erreur_ia).
+        """
+        return self.trait is None
+
+    def mémoire(self):
+        """
+        :returns: l'estimation en octets de la mémoire occupée par la partie de la session.
+        """
+        return taille_mémoire(self.partie)
+
+
+class GestionnaireSessions:
+    """
+    Les sessions hébergées, indexées par leur identifiant, avec l'exécuteur où sont
+    calculés les coups de l'IA. Toutes les méthodes s'appellent depuis la boucle
+    d'événements.
+    """
+
+    def __init__(self, durée_vie=600.0, processus=None, max_sessions=None, exécuteur=None):
+        """
+        :param durée_vie: la durée en secondes sans commande après laquelle une session expire.
+        :param processus: le nombre de processus de l'exécuteur; par défaut, le nombre de coeurs.
+        :param max_sessions: le nombre maximal de sessions simultanées, ou None.
+        :param exécuteur: un exécuteur à utiliser au lieu d'en créer un; il n'est pas arrêté
+        par fermer().
+        """
+        self.durée_vie = durée_vie
+        self.processus = processus
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._exécuteur = exécuteur
+        self._propre_exécuteur = exécuteur is None
+        self._latences = deque(maxlen=_LATENCES)
+        # somme des dernières mesures de mémoire des sessions, les identifiants des sessions
+        # modifiées depuis leur mesure et la mémoire des tables partagées de chaque taille
+        self._mémoire = 0
+        self._à_mesurer = set()
+        self._mémoire_géométries = {}
+        self.statistiques = {'créées': 0, 'expirées': 0, 'coups_humains': 0, 'coups_ia': 0,
+                             'échecs_ia': 0}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def fermer(self):
+        """Annuler les coups de l'IA en cours et arrêter l'exécuteur."""
+        for session in self._sessions.values():
+            if session.tâche is not None:
+                session.tâche.cancel()
+        self._sessions.clear()
+        if self._propre_exécuteur and self._exécuteur is not None:
+            self._exécuteur.shutdown(wait=False, cancel_futures=True)
+            self._exécuteur = None
+
+    def créer(self, ia='chemin', humain=1, noms=None):
+        """
+        Créer une session. Si l'IA joue en premier, son coup est aussitôt lancé.
+
+        :param ia: la configuration de l'IA (voir autojeu.créer_stratégie).
+        :param humain: le numéro du joueur humain (1 ou 2).
+        :param noms: le nom des joueurs 1 et 2.
+        :returns: la nouvelle session.
+        :raises QuoridorError: la configuration, le joueur ou les noms sont invalides.
+        :raises QuoridorError: le nombre maximal de sessions est atteint.
+        """
+        test_players_numbers(humain)
+        stratégie_partagée(ia)
+        if noms is not None and (not isinstance(noms, (list, tuple)) or len(noms) != 2
+                                 or not all(isinstance(nom, str) for nom in noms)):
+            raise QuoridorError("Names must be a list of two strings")
+        if self.max_sessions is not None and len(self._sessions) >= self.max_sessions:
+            raise QuoridorError("Too many sessions")
+
+        noms = noms or (['humain', 'IA'] if humain == 1 else ['IA', 'humain'])
+        identifiant = secrets.token_hex(8)
+        session = Session(identifiant, Quoridor(list(noms)), ia, humain)
+        self._sessions[identifiant] = session
+        self._à_mesurer.add(identifiant)
+        self.statistiques['créées'] += 1
+
+        if humain != session.trait:
+            self._lancer_ia(session)
+        return session
+
+    def session(self, identifiant):
+        """
+        Retrouver une session et repousser son expiration.
+
+        :param identifiant: l'identifiant de la session.
+        :returns: la session.
+        :raises QuoridorError: la session n'existe pas ou a expiré.
+        """
+        session = self._sessions.get(identifiant)
+        if session is None:
+            raise QuoridorError(f"Game {identifiant} does not exist")
+        session.dernier_accès = time.monotonic()
+        return session
+
+    def supprimer(self, identifiant):
+        """
+        Supprimer une session, en annulant le coup de l'IA en cours.
+
+        :raises QuoridorError: la session n'existe pas.
+        """
+        session = self.session(identifiant)
+        del self._sessions[identifiant]
+        self._à_mesurer.discard(identifiant)
+        self._mémoire -= session.octets
+        if session.tâche is not None:
+            session.tâche.cancel()
+
+    def expirer(self, maintenant=None):
+        """
+        Supprimer les sessions sans commande depuis plus de durée_vie secondes.
+
+        :returns: le nombre de sessions supprimées.
+        """
+        limite = (time.monotonic() if maintenant is None else maintenant) - self.durée_vie
+        expirées = [identifiant for identifiant, session in self._sessions.items()
+                    if session.dernier_accès < limite]
+        for identifiant in expirées:
+            self.supprimer(identifiant)
+        self.statistiques['expirées'] += len(expirées)
+        return len(expirées)
+
+    async def expirer_périodiquement(self, période=None):
+        """Expirer les sessions à intervalle régulier, jusqu'à l'annulation de la tâche."""
+        période = période or max(self.durée_vie / 10, 1.0)
+        while True:
+            await asyncio.sleep(période)
+            self.expirer()
+
+    def jouer(self, identifiant, position, orientation=None):
+        """
+        Jouer le coup du joueur humain, puis lancer le coup de l'IA en arrière-plan.
+
+        :param identifiant: l'identifiant de la session.
+        :param position: le tuple (x, y) de la case d'arrivée ou de la position du mur.
+        :param orientation: None pour un déplacement, sinon 'horizontal' ou 'vertical'.
+        :returns: la session.
+        :raises QuoridorError: ce n'est pas au tour de l'humain, ou le coup est invalide.
+        """
+        début = time.perf_counter()
+        session = self.session(identifiant)
+        if orientation is not None and orientation not in ORIENTATIONS:
+            raise QuoridorError(f"Orientation {orientation} is invalid")
+
+        if session.partie.partie_terminée():
+            raise QuoridorError(f"Game {identifiant} is finished")
+        if session.abandonnée():
+            raise QuoridorError(f"Game {identifiant} was abandoned: {session.erreur_ia}")
+        if session.trait != session.humain:
+            raise QuoridorError("It is not the human player's turn")
+
+        x, y = position
+        if orientation is None:
+            session.partie.déplacer_jeton(session.humain, (x, y))
+        else:
+            session.partie.placer_mur(session.humain, (x, y), orientation)
+
+        session.trait = other_player(session.humain)
+        self._à_mesurer.add(identifiant)
+        self.statistiques['coups_humains'] += 1
+        if not session.partie.partie_terminée():
+            self._lancer_ia(session)
+
+        self._latences.append(time.perf_counter() - début)
+        return session
+
+    async def attendre(self, identifiant):
+        """
+        Attendre la fin du coup de l'IA en cours, s'il y en a un.
+
+        :returns: la session.
+        """
+        session = self.session(identifiant)
+        if session.tâche is not None:
+            await asyncio.wait([session.tâche])
+        return session
+
+    def _lancer_ia(self, session):
+        """Soumet le calcul du coup de l'IA à l'exécuteur, dans une tâche de la boucle."""
+        if self._exécuteur is None:
+            self._exécuteur = ProcessPoolExecutor(self.processus)
+        session.tâche = asyncio.get_running_loop().create_task(self._coup_ia(session))
+
+    async def _coup_ia(self, session):
+        """
+        Attend le coup de l'IA puis le joue, à moins que la session ait disparu. Si les
+        processus de l'exécuteur ont été perdus, un exécuteur neuf est créé et le calcul
+        recommencé; si le calcul échoue encore, la session est abandonnée.
+        """
+        joueur = other_player(session.humain)
+        données = session.partie.sérialiser()
+        for _ in range(_ESSAIS_IA):
+            exécuteur = self._exécuteur
+            try:
+                coup = await asyncio.get_running_loop().run_in_executor(
+                    exécuteur, calculer_coup, données, session.ia, joueur)
+                break
+            except Exception as erreur:
+                échec = erreur
+                # une seule session remplace l'exécuteur perdu, les autres réessaient dans
+                # celui qu'elle a créé
+                if (isinstance(erreur, BrokenProcessPool) and self._propre_exécuteur
+                        and self._exécuteur is exécuteur):
+                    exécuteur.shutdown(wait=False)
+                    self._exécuteur = ProcessPoolExecutor(self.processus)
+        else:
+            session.erreur_ia = str(échec) or type(échec).__name__
+            session.trait = None
+            session.tâche = None
+            self.statistiques['échecs_ia'] += 1
+            return
+
+        session.tâche = None
+        if self._sessions.get(session.identifiant) is not session:
+            return
+        session.partie.jouer(coup, joueur)
+        session.dernier_coup_ia = coup
+        session.trait = session.humain
+        self._à_mesurer.add(session.identifiant)
+        self.statistiques['coups_ia'] += 1
+
+    async def mesurer_mémoire(self):
+        """
+        Mesurer à nouveau les sessions créées ou modifiées depuis leur dernière mesure, et
+        tenir à jour le total. Les mesures sont faites par tranches de _TRANCHE_MÉMOIRE
+        parties, en rendant la main à la boucle entre deux tranches pour ne pas retarder
+        les coups humains.
+        """
+        while self._à_mesurer:
+            for _ in range(min(_TRANCHE_MÉMOIRE, len(self._à_mesurer))):
+                session = self._sessions.get(self._à_mesurer.pop())
+                if session is None:
+                    continue
+                octets = session.mémoire()
+                self._mémoire += octets - session.octets
+                session.octets = octets
+
+                taille = session.partie.taille
+                if taille not in self._mémoire_géométries:
+                    self._mémoire_géométries[taille] = taille_mémoire(session.partie.géométrie)
+            await asyncio.sleep(0)
+
+    def rapport(self):
+        """
+        :returns: le dictionnaire JSON des statistiques du serveur, dont la mémoire totale des
+        parties selon leur dernière mesure (voir mesurer_mémoire), celle des tables partagées
+        de chaque taille de damier mesurée et les latences des coups humains en
+        microsecondes.
+        """
+        latences = sorted(self._latences)
+        rapport = dict(self.statistiques)
+        rapport.update({
+            'sessions': len(self._sessions),
+            'ia_en_cours': sum(session.tâche is not None for session in self._sessions.values()),
+            'mémoire': self._mémoire,
+            'mémoire_géométries': sum(self._mémoire_géométries.values()),
+        })
+        if latences:
+            rapport['latence_p50'] = latences[len(latences) // 2] * 1e6
+            rapport['latence_p99'] = latences[min(len(latences) - 1,
+                                                  len(latences) * 99 // 100)] * 1e6
+        return rapport
+
+    async def traiter(self, requête):
+        """
+        Exécuter une commande du protocole.
+
+        :param requête: le dictionnaire de la commande (voir la documentation du module).
+        :returns: le dictionnaire JSON de la réponse.
+        """
+        try:
+            commande = requête['commande']
+            if commande == 'créer':
+                session = self.créer(requête.get('ia', 'chemin'), requête.get('humain', 1),
+                                     requête.get('noms'))
+                réponse = session.état()
+            elif commande == 'déplacer':
+                réponse = self.jouer(requête['partie'], requête['position']).état()
+            elif commande == 'mur':
+                réponse = self.jouer(requête['partie'], requête['position'],
+                                     requête['orientation']).état()
+            elif commande == 'état':
+                réponse = self.session(requête['partie']).état()
+            elif commande == 'attendre':
+                réponse = (await self.attendre(requête['partie'])).état()
+            elif commande == 'mémoire':
+                réponse = {'mémoire': self.session(requête['partie']).mémoire()}
+            elif commande == 'supprimer':
+                self.supprimer(requête['partie'])
+                réponse = {}
+            elif commande == 'statistiques':
+                await self.mesurer_mémoire()
+                réponse = self.rapport()
+            else:
+                raise QuoridorError(f"Unknown command {commande!r}")
+        except (QuoridorError, LookupError, TypeError, ValueError) as erreur:
+            réponse = {'ok': False, 'erreur': f"{type(erreur).__name__}: {erreur}"}
+        else:
+            réponse = {'ok': True, **réponse}
+
+        if 'id' in requête:
+            réponse['id'] = requête['id']
+        return réponse
+
+    async def servir_client(self, lecteur, écrivain):
+        """Traite les commandes d'une connexion, une ligne JSON à la fois."""
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                try:
+                    requête = json.loads(ligne)
+                    if not isinstance(requête, dict):
+                        raise ValueError("Command is not a JSON object")
+                except ValueError as erreur:
+                    réponse = {'ok': False, 'erreur': f"Invalid JSON command: {erreur}"}
+                else:
+                    réponse = await self.traiter(requête)
+                écrivain.write(json.dumps(réponse, ensure_ascii=False).encode() + b'\n')
+                await écrivain.drain()
+        except ConnectionError:
+            pass
+        finally:
+            écrivain.close()
+
+
+async def servir(gestionnaire, hôte='127.0.0.1', port=8765, unix=None):
+    """
+    Servir les commandes des clients jusqu'à l'annulation de la tâche.
+
+    :param gestionnaire: le GestionnaireSessions.
+    :param hôte: l'adresse d'écoute TCP.
+    :param port: le port d'écoute TCP.
+    :param unix: le chemin d'un socket Unix, à utiliser au lieu de TCP.
+    """
+    if unix is not None:
+        serveur = await asyncio.start_unix_server(gestionnaire.servir_client, unix)
+    else:
+        serveur = await asyncio.start_server(gestionnaire.servir_client, hôte, port)
+
+    nettoyage = asyncio.create_task(gestionnaire.expirer_périodiquement())
+    try:
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        nettoyage.cancel()
+        gestionnaire.fermer()
+
+
+def main():
+    """Point d'entrée du serveur."""
+    analyseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    analyseur.add_argument('--hôte', default='127.0.0.1')
+    analyseur.add_argument('--port', type=int, default=8765)
+    analyseur.add_argument('--unix', help="chemin d'un socket Unix, au lieu de TCP")
+    analyseur.add_argument('--durée-vie', type=float, default=600.0)
+    analyseur.add_argument('--processus', type=int, default=None)
+    analyseur.add_argument('--max-sessions', type=int, default=None)
+    args = analyseur.parse_args()
+
+    gestionnaire = GestionnaireSessions(args.durée_vie, args.processus, args.max_sessions)
+    try:
+        asyncio.run(servir(gestionnaire, args.hôte, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
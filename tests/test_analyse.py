@@ -0,0 +1,66 @@
+"""
+Vérifie que l'analyse en continu produit un résultat par ligne, dans l'ordre, et un
+enregistrement d''erreur' pour chaque ligne invalide sans interrompre l'analyse.
+
+Utilisation, depuis la racine du dépôt:
+
+    python -m unittest discover tests
+"""
+import json
+import unittest
+
+from analyse import analyser_flux
+from quoridor import Quoridor
+
+# des lignes mal formées de différentes façons, chacune attendue en erreur
+LIGNES_INVALIDES = [
+    'pas du json',
+    'null',
+    '[]',
+    '{"joueurs": [1, 2]}',
+    '{"joueurs": [{"nom": "a", "murs": 10, "pos": [5, 1]}],'
+    ' "murs": {"horizontaux": [], "verticaux": []}}',
+    '{"joueurs": ["a", "b"], "murs": {"horizontaux": [[3]], "verticaux": []}}',
+    '{"joueurs": [5, 6], "murs": {"horizontaux": [], "verticaux": []}}',
+    '{"joueurs": ["a", "b"], "murs": {"horizontaux": [[3, 2, 1]], "verticaux": []}}',
+    '{"joueurs": [{"nom": "a", "murs": 10, "pos": [5.5, 1]},'
+    ' {"nom": "b", "murs": 10, "pos": [5, 9]}], "murs": {"horizontaux": [], "verticaux": []}}',
+    '{"joueurs": ["a", "b"], "murs": {"horizontaux": [], "verticaux": []}, "trait": 3}',
+]
+
+
+def lignes_mêlées():
+    """Alterne des positions valides, des lignes invalides et des lignes vides."""
+    partie = Quoridor(['a', 'b'])
+    lignes = []
+    for numéro, invalide in enumerate(LIGNES_INVALIDES):
+        lignes.append(json.dumps({**partie.état_partie(), 'trait': numéro % 2 + 1}) + '\n')
+        lignes.append(invalide + '\n')
+        lignes.append('\n')
+        partie.jouer_coup(numéro % 2 + 1)
+    return lignes
+
+
+class TestAnalyse(unittest.TestCase):
+
+    def vérifier(self, résultats, lignes):
+        numéros = [numéro for numéro, ligne in enumerate(lignes, 1) if ligne.strip()]
+        self.assertEqual([résultat['ligne'] for résultat in résultats], numéros)
+        for résultat in résultats:
+            invalide = lignes[résultat['ligne'] - 1].strip() in LIGNES_INVALIDES
+            self.assertEqual('erreur' in résultat, invalide, résultat)
+            if not invalide:
+                self.assertIn('coup', résultat)
+
+    def test_lignes_invalides(self):
+        lignes = lignes_mêlées()
+        self.vérifier(list(analyser_flux(lignes, processus=1, taille_paquet=4)), lignes)
+
+    def test_processus(self):
+        lignes = lignes_mêlées()
+        série = list(analyser_flux(lignes, processus=1, taille_paquet=4))
+        self.assertEqual(list(analyser_flux(lignes, processus=2, taille_paquet=4)), série)
+
+
+if __name__ == '__main__':
+    unittest.main()
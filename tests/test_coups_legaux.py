@@ -0,0 +1,106 @@
+"""
+Vérifie les règles de coups_légaux et des structures tenues à jour coup par coup contre des
+versions de référence, sur des positions tirées au hasard avec une graine fixe.
+
+Utilisation, depuis la racine du dépôt:
+
+    python -m unittest discover tests
+"""
+import copy
+import random
+import unittest
+
+from quoridor import (
+    Quoridor, QuoridorError, ajouter_objectifs, construire_damier, construire_graphe,
+    encoder_coup, plus_court_chemin,
+)
+
+# (taille du damier, nombre total de murs, nombre de parties, demi-coups par partie)
+CONFIGURATIONS = ((9, 20, 12, 40), (5, 6, 12, 20))
+
+
+def coups_par_force_brute(partie, joueur):
+    """
+    Énumère les déplacements de construire_graphe, sauts compris, et les murs que placer_mur
+    accepte, chacun étant annulé aussitôt. déplacer_jeton ne sert pas de référence: il
+    accepte tout déplacement d'au plus deux cases que rien ne bloque.
+
+    :returns: l'ensemble des codes des coups (voir encoder_coup).
+    """
+    taille = partie.taille
+    positions = [joueur['pos'] for joueur in partie.etat['joueurs']]
+    murs = partie.etat['murs']
+    graphe = construire_graphe(positions, murs['horizontaux'], murs['verticaux'], taille)
+    coups = {encoder_coup('D', case, taille)
+             for case in graphe.successors(tuple(positions[joueur - 1]))
+             if case not in ('B1', 'B2')}
+
+    for orientation, type_coup in (('horizontal', 'MH'), ('vertical', 'MV')):
+        for x in range(1, taille + 1):
+            for y in range(1, taille + 1):
+                try:
+                    partie.placer_mur(joueur, (x, y), orientation)
+                except QuoridorError:
+                    continue
+                partie.annuler()
+                coups.add(encoder_coup(type_coup, (x, y), taille))
+    return coups
+
+
+def parties_au_hasard(graine):
+    """Produit des parties où chaque position visitée est rendue avant le coup suivant."""
+    hasard = random.Random(graine)
+    for taille, nb_murs, nb_parties, nb_coups in CONFIGURATIONS:
+        for _ in range(nb_parties):
+            partie = Quoridor(['1', '2'], taille=taille, nb_murs=nb_murs)
+            # le graphe est construit dès le départ pour être tenu à jour coup par coup
+            partie.graphe()
+            joueur = 1
+            for _ in range(nb_coups):
+                if partie.partie_terminée():
+                    break
+                yield partie, joueur
+                partie.jouer(hasard.choice(partie.coups_légaux(joueur)), joueur)
+                joueur = 3 - joueur
+
+
+class TestCoupsLégaux(unittest.TestCase):
+
+    def test_force_brute(self):
+        for partie, joueur in parties_au_hasard(1):
+            self.assertEqual(set(partie.coups_légaux(joueur)),
+                             coups_par_force_brute(partie, joueur), partie.état_partie())
+
+    def test_graphe_incrémental(self):
+        for partie, _ in parties_au_hasard(2):
+            murs = partie.etat['murs']
+            référence = construire_graphe([joueur['pos'] for joueur in partie.etat['joueurs']],
+                                          murs['horizontaux'], murs['verticaux'], partie.taille)
+            self.assertEqual(set(partie.graphe().edges), set(référence.edges))
+
+    def test_distances(self):
+        for partie, _ in parties_au_hasard(3):
+            murs = partie.etat['murs']
+            # sans liens de saut, le jeton adverse n'est pas pris en compte, comme dans distance
+            damier = construire_damier(murs['horizontaux'], murs['verticaux'], partie.taille)
+            ajouter_objectifs(damier, partie.taille)
+            for joueur in (1, 2):
+                départ = tuple(partie.etat['joueurs'][joueur - 1]['pos'])
+                chemin = plus_court_chemin(damier, départ, f'B{joueur}')
+                self.assertEqual(partie.distance(joueur), len(chemin) - 2)
+
+    def test_annuler(self):
+        hasard = random.Random(4)
+        for partie, joueur in parties_au_hasard(4):
+            # état_partie retourne l'état vivant de la partie: il faut en garder une copie
+            avant = (partie.sérialiser(), partie.empreinte(), copy.deepcopy(partie.état_partie()),
+                     set(partie.graphe().edges), partie.distance(1), partie.distance(2))
+            partie.jouer(hasard.choice(partie.coups_légaux(joueur)), joueur)
+            partie.annuler()
+            après = (partie.sérialiser(), partie.empreinte(), partie.état_partie(),
+                     set(partie.graphe().edges), partie.distance(1), partie.distance(2))
+            self.assertEqual(après, avant)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Vérifie que LotQuoridor suit les règles de la classe Quoridor coup pour coup: les plateaux
+d'un lot et autant de parties sont joués au même pas, sur des coups tirés au hasard avec une
+graine fixe.
+
+Utilisation, depuis la racine du dépôt:
+
+    python -m unittest discover tests
+"""
+import random
+import unittest
+
+import numpy as np
+
+from lot import LotQuoridor
+from quoridor import (
+    NB_CANDIDATS, NB_CASES, TAILLE, Quoridor, QuoridorError, décoder_coup, encoder_coup,
+)
+
+# nombre de plateaux du lot et nombre maximal de demi-coups joués
+PLATEAUX = 24
+DEMI_COUPS = 120
+
+
+def choisir_coup(hasard, partie, joueur, coups):
+    """
+    Tire un coup au hasard, ou une fois sur deux le déplacement qui rapproche le plus le
+    jeton de son arrivée, pour que les parties se terminent. LotQuoridor.jouer vérifie les
+    déplacements comme déplacer_jeton, qui refuse certains sauts en diagonale que
+    coups_légaux propose: seuls les déplacements qu'il accepte sont tirés.
+    """
+    coups = [coup for coup in coups
+             if coup >= NB_CASES or déplacement_accepté(partie, joueur, coup)]
+    if hasard.random() < 0.5:
+        carte = partie.carte_distances(joueur)
+        return min((coup for coup in coups if coup < NB_CASES), key=carte.__getitem__)
+    return hasard.choice(coups)
+
+
+def déplacement_accepté(partie, joueur, case):
+    """Retourne True si déplacer_jeton accepte le déplacement, qui est aussitôt annulé."""
+    try:
+        partie.déplacer_jeton(joueur, décoder_coup(case)[1])
+    except QuoridorError:
+        return False
+    partie.annuler()
+    return True
+
+
+def case_proche(hasard, partie, joueur):
+    """Tire une case à au plus deux pas du jeton du joueur, ou n'importe où sur le damier."""
+    x, y = partie.etat['joueurs'][joueur - 1]['pos']
+    x, y = x + hasard.randint(-2, 2), y + hasard.randint(-2, 2)
+    if 1 <= x <= TAILLE and 1 <= y <= TAILLE:
+        return encoder_coup('D', (x, y))
+    return hasard.randrange(NB_CASES)
+
+
+def mur_accepté(partie, joueur, coup):
+    """Retourne True si placer_mur accepte le mur, qui est aussitôt annulé."""
+    type_coup, position = décoder_coup(coup)
+    try:
+        partie.placer_mur(joueur, position, 'horizontal' if type_coup == 'MH' else 'vertical')
+    except QuoridorError:
+        return False
+    partie.annuler()
+    return True
+
+
+class TestLot(unittest.TestCase):
+
+    def test_même_pas(self):
+        hasard = random.Random(5)
+        lot = LotQuoridor(PLATEAUX)
+        parties = [Quoridor(['1', '2']) for _ in range(PLATEAUX)]
+        joueur = 1
+
+        for _ in range(DEMI_COUPS):
+            self.assertEqual(lot.sérialiser(), b''.join(partie.sérialiser() for partie in parties))
+            gagnants = lot.gagnants()
+            for partie, gagnant in zip(parties, gagnants):
+                self.assertEqual(gagnant, int(partie.partie_terminée() or 0))
+            actifs = gagnants == 0
+            if not actifs.any():
+                break
+
+            for j in (1, 2):
+                distances = lot.distances(j)
+                for indice, partie in enumerate(parties):
+                    self.assertEqual(distances[indice].tolist(), partie.carte_distances(j))
+
+            légaux = lot.coups_légaux(joueur)
+            murs = [NB_CASES + hasard.randrange(NB_CANDIDATS) for _ in parties]
+            murs_valides = lot.murs_valides(joueur, murs)
+            cases = [case_proche(hasard, partie, joueur) for partie in parties]
+            déplacements_valides = lot.déplacements_valides(
+                joueur, [décoder_coup(case)[1] for case in cases])
+            coups = np.zeros(PLATEAUX, dtype=np.intp)
+            for indice, partie in enumerate(parties):
+                if not actifs[indice]:
+                    continue
+                attendus = partie.coups_légaux(joueur)
+                self.assertEqual(np.nonzero(légaux[indice])[0].tolist(), sorted(attendus))
+                self.assertEqual(murs_valides[indice], mur_accepté(partie, joueur, murs[indice]))
+                self.assertEqual(déplacements_valides[indice],
+                                 déplacement_accepté(partie, joueur, cases[indice]))
+                coups[indice] = choisir_coup(hasard, partie, joueur, attendus)
+                partie.jouer(int(coups[indice]), joueur)
+
+            lot.jouer(joueur, coups, actifs)
+            joueur = 3 - joueur
+
+
+if __name__ == '__main__':
+    unittest.main()